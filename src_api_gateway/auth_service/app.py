@@ -1,10 +1,16 @@
 import json
 import os
+import time
 import uuid
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
+import config
+import passwords
 import redis
+import session_tokens
+import users
 from flask import Flask, Response, jsonify, request
+from session_refresher import SessionRefresher
 
 # * create the Flask app
 app = Flask(__name__)
@@ -16,27 +22,65 @@ app.config["SESSION_PERMANENT"] = False
 app.config["SESSION_USE_SIGNER"] = True
 app.config["SESSION_KEY_PREFIX"] = "auth_session:"
 
-# * connect to redis
-try:
-    redis_host = os.environ["REDIS_HOST"]
-    redis_port = int(os.getenv("REDIS_PORT", "6379"))
-    print(f"connecting to redis at {redis_host}:{redis_port}")
-
-    session_store = redis.Redis(
-        host=redis_host,
-        port=redis_port,
-        decode_responses=False,
-        socket_timeout=5,
-        ssl=(os.getenv("REDIS_SSL", "false") == "true"),
-    )
-except Exception as e:
-    print(f"error connecting to redis: {e}")
-
-# * simulated user database
-users: Dict[str, Dict[str, str]] = {
-    "programmingwithalex3@gmail.com": {"password": "password123"},
-    "test_user": {"password": "passwordtest"},
-}
+# * connect to redis (connections are opened lazily by the pool)
+session_store = config.create_redis_client()
+
+# * sliding session expiry - refreshes are batched by a background thread per worker
+session_refresher = SessionRefresher(
+    session_store,
+    config.SESSION_EXPIRE_TIME_SECONDS,
+    flush_interval=config.SESSION_REFRESH_FLUSH_INTERVAL_SECONDS,
+)
+
+user_repository = users.create_user_repository(
+    config.USER_REPOSITORY_BACKEND, session_store, cache_size=config.USER_CACHE_SIZE, cache_ttl=config.USER_CACHE_TTL_SECONDS
+)
+password_hasher = passwords.PasswordHasher(config.PASSWORD_HASH_WORKERS, config.PASSWORD_HASH_MAX_PENDING)
+
+token_codec = session_tokens.SessionTokenCodec.from_env()
+if config.SESSION_TOKEN_MODE == "signed" and token_codec is None:
+    raise RuntimeError("SESSION_TOKEN_MODE=signed requires SESSION_TOKEN_SECRETS")
+token_revocations = session_tokens.RevocationFilter(
+    refresh_interval=config.SESSION_TOKEN_REVOCATION_REFRESH_SECONDS,
+    max_token_ttl=config.SESSION_EXPIRE_TIME_SECONDS,
+)
+
+
+def create_session(session_data: Dict[str, str]) -> str:
+    """
+    create a session for the user and return its ID - a signed token or a redis-backed random ID
+    """
+    if config.SESSION_TOKEN_MODE == "signed" and token_codec is not None:
+        return token_codec.issue(session_data["email"], session_data["name"], session_data["source"])
+
+    session_id = str(uuid.uuid4())
+    session_store.setex(f"session:{session_id}", config.SESSION_EXPIRE_TIME_SECONDS, json.dumps(session_data))
+    return session_id
+
+
+def verify_signed_token(token: str) -> Optional[session_tokens.Claims]:
+    """
+    return the claims of a valid, unrevoked signed token
+    """
+    if token_codec is None:
+        return None
+    claims = token_codec.verify(token)
+    if claims is None or session_tokens.is_revoked(claims, token_revocations, session_store):
+        return None
+    return claims
+
+
+@app.route("/ready", methods=["GET"])
+def ready() -> Tuple[Response, int]:
+    """
+    readiness check - 200 when redis answers a PING through the connection pool, 503 otherwise
+    """
+    started = time.perf_counter()
+    try:
+        session_store.ping()
+    except redis.RedisError as e:
+        return jsonify({"status": "unavailable", "redis": str(e)}), 503
+    return jsonify({"status": "ready", "redis_ping_ms": round((time.perf_counter() - started) * 1000, 2)}), 200
 
 
 @app.route("/login", methods=["POST"])
@@ -50,14 +94,17 @@ def login() -> Tuple[Response, int]:
     username = data.get("username")
     password = data.get("password")
 
-    if username in users and users[username]["password"] == password:
-        # print(f"user {username} authenticated successfully")
-        session_id = str(uuid.uuid4())
-        session_store.setex(
-            f"session:{session_id}",
-            int(os.getenv("SESSION_EXPIRE_TIME_SECONDS", "3600")),
-            json.dumps({"email": username, "name": username, "source": "manual"}),
+    user = user_repository.find(username) if isinstance(username, str) and username else None
+    try:
+        authenticated = password_hasher.verify(
+            password if isinstance(password, str) else "", user["password_hash"] if user else None
         )
+    except passwords.PasswordHasherBusy:
+        return jsonify({"message": "too many logins in progress, retry shortly"}), 503
+
+    if user and authenticated:
+        # print(f"user {username} authenticated successfully")
+        session_id = create_session({"email": user["email"], "name": user["name"], "source": "manual"})
         # print(f"session created for {username}: {session_id}")
         return jsonify({"message": "login successful", "session_id": session_id}), 200
 
@@ -75,14 +122,8 @@ def store_google_user_info() -> Tuple[Response, int]:
         email = data["email"]
         name = data["name"]
 
-        session_id = str(uuid.uuid4())
         session_data = {"email": email, "name": name, "source": "google"}
-
-        session_store.setex(
-            f"session:{session_id}",
-            int(os.getenv("SESSION_EXPIRE_TIME_SECONDS", "3600")),
-            json.dumps(session_data),
-        )
+        session_id = create_session(session_data)
 
         return jsonify({"session_id": session_id}), 200
     except Exception as e:
@@ -92,7 +133,8 @@ def store_google_user_info() -> Tuple[Response, int]:
 @app.route("/verify", methods=["POST"])
 def verify() -> Tuple[Response, int]:
     """
-    verify session by checking redis for the given session_id
+    verify session by checking redis for the given session_id (signed tokens are verified locally)
+    and slide its expiry once it is past the refresh threshold
     """
     print("verifying session...")
     data: Dict[str, str] = request.json or {}
@@ -103,10 +145,24 @@ def verify() -> Tuple[Response, int]:
     if not session_id:
         return jsonify({"message": "session ID required"}), 400
 
-    username: Optional[bytes] = session_store.get(f"session:{session_id}")  # type: ignore
+    if session_tokens.is_signed_token(session_id):
+        claims = verify_signed_token(session_id)
+        if claims:
+            return jsonify({"message": "valid session", "user": session_tokens.user_from_claims(claims)}), 200
+        return jsonify({"message": "invalid session"}), 401
+
+    session_key = f"session:{session_id}"
+    username: Optional[bytes]
+    ttl: int
+    with session_store.pipeline(transaction=False) as pipe:  # one round trip for the session and its remaining TTL
+        pipe.get(session_key)
+        pipe.ttl(session_key)
+        username, ttl = pipe.execute()
     # print(f"username: {username}")
 
     if username:
+        if 0 <= ttl < config.SESSION_REFRESH_THRESHOLD_SECONDS:
+            session_refresher.schedule(session_key)
         decoded = username.decode("utf-8")
         # print(f"decoded username: {decoded}")
         return jsonify({"message": "valid session", "user": json.loads(decoded)}), 200
@@ -114,14 +170,55 @@ def verify() -> Tuple[Response, int]:
     return jsonify({"message": "invalid session"}), 401
 
 
+@app.route("/verify/batch", methods=["POST"])
+def verify_batch() -> Tuple[Response, int]:
+    """
+    verify many sessions at once - opaque session IDs are resolved with a single redis MGET,
+    signed tokens locally. returns {"sessions": {session_id: user or null}}
+    """
+    data: Dict[str, Any] = request.json or {}
+    session_ids = data.get("session_ids")
+
+    if not isinstance(session_ids, list) or not all(isinstance(session_id, str) for session_id in session_ids):
+        return jsonify({"message": "session_ids must be a list of strings"}), 400
+    if len(session_ids) > config.MAX_VERIFY_BATCH_SIZE:
+        return jsonify({"message": f"at most {config.MAX_VERIFY_BATCH_SIZE} session IDs per request"}), 400
+
+    unique_ids = list(dict.fromkeys(session_id for session_id in session_ids if session_id))
+    sessions: Dict[str, Optional[Dict[str, str]]] = {}
+
+    opaque_ids = []
+    for session_id in unique_ids:
+        if session_tokens.is_signed_token(session_id):
+            claims = verify_signed_token(session_id)
+            sessions[session_id] = session_tokens.user_from_claims(claims) if claims else None
+        else:
+            opaque_ids.append(session_id)
+
+    if opaque_ids:
+        values: List[Optional[bytes]] = session_store.mget(  # type: ignore
+            [f"session:{session_id}" for session_id in opaque_ids]
+        )
+        for session_id, value in zip(opaque_ids, values):
+            sessions[session_id] = json.loads(value.decode("utf-8")) if value else None
+
+    return jsonify({"sessions": sessions}), 200
+
+
 @app.route("/logout", methods=["POST"])
 def logout() -> Tuple[Response, int]:
     """
-    logout route to delete the session from redis
+    logout route to delete the session from redis (or revoke a signed token until it expires)
     """
     data: Dict[str, str] = request.json or {}
     session_id = data.get("session_id")
 
+    if session_id and session_tokens.is_signed_token(session_id):
+        claims = token_codec.verify(session_id) if token_codec is not None else None
+        if claims:
+            session_tokens.revoke(claims, session_store)
+        return jsonify({"message": "logged out successfully"}), 200
+
     if session_id:
         session_store.delete(f"session:{session_id}")
         return jsonify({"message": "logged out successfully"}), 200
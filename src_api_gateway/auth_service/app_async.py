@@ -0,0 +1,286 @@
+import asyncio
+import json
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import config
+import passwords
+import redis.asyncio as redis
+import session_tokens
+import users
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+
+# * async variant of app.py - same routes and responses, built on FastAPI and redis.asyncio so one worker keeps
+# * many /verify calls in flight while they wait on redis. run with:
+# *     uvicorn app_async:app --host 0.0.0.0 --port 5000 --workers 4
+# * every worker process gets its own connection pool (created in lifespan, after the fork)
+
+
+def create_session_store() -> redis.Redis:
+    """
+    create the asyncio redis client on an explicitly sized, blocking connection pool (see config.redis_pool_kwargs)
+
+    - transient connection errors / timeouts are retried with exponential backoff
+    """
+    pool = redis.BlockingConnectionPool(
+        connection_class=redis.SSLConnection if config.redis_ssl() else redis.Connection,
+        retry=Retry(
+            ExponentialBackoff(cap=config.REDIS_RETRY_BACKOFF_CAP, base=config.REDIS_RETRY_BACKOFF_BASE), config.REDIS_RETRIES
+        ),
+        retry_on_error=[redis.ConnectionError, redis.TimeoutError],
+        **config.redis_pool_kwargs(),
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+# * the user directory is sync (shared with app.py) - redis lookups run on a thread so they don't block the loop
+user_repository = users.create_user_repository(
+    config.USER_REPOSITORY_BACKEND,
+    config.create_redis_client() if config.USER_REPOSITORY_BACKEND == "redis" else None,
+    cache_size=config.USER_CACHE_SIZE,
+    cache_ttl=config.USER_CACHE_TTL_SECONDS,
+)
+password_hasher = passwords.PasswordHasher(config.PASSWORD_HASH_WORKERS, config.PASSWORD_HASH_MAX_PENDING)
+
+token_codec = session_tokens.SessionTokenCodec.from_env()
+if config.SESSION_TOKEN_MODE == "signed" and token_codec is None:
+    raise RuntimeError("SESSION_TOKEN_MODE=signed requires SESSION_TOKEN_SECRETS")
+token_revocations = session_tokens.RevocationFilter(
+    refresh_interval=config.SESSION_TOKEN_REVOCATION_REFRESH_SECONDS,
+    max_token_ttl=config.SESSION_EXPIRE_TIME_SECONDS,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    open the worker's redis connection pool on startup and close it on shutdown
+    """
+    app.state.session_store = create_session_store()
+    yield
+    await app.state.session_store.aclose(close_connection_pool=True)  # the pool was passed in explicitly
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+def get_session_store() -> redis.Redis:
+    """
+    the worker's redis client, opened by lifespan
+    """
+    return app.state.session_store
+
+
+async def read_json(request: Request) -> Dict[str, Any]:
+    """
+    request body as a dict - {} for a missing or malformed body (same as `request.json or {}` in app.py)
+    """
+    try:
+        data = await request.json()
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+async def create_session(session_data: Dict[str, str]) -> str:
+    """
+    create a session for the user and return its ID - a signed token or a redis-backed random ID
+    """
+    if config.SESSION_TOKEN_MODE == "signed" and token_codec is not None:
+        return token_codec.issue(session_data["email"], session_data["name"], session_data["source"])
+
+    session_id = str(uuid.uuid4())
+    await get_session_store().setex(f"session:{session_id}", config.SESSION_EXPIRE_TIME_SECONDS, json.dumps(session_data))
+    return session_id
+
+
+async def is_revoked(claims: session_tokens.Claims) -> bool:
+    """
+    async session_tokens.is_revoked - bloom filter check, confirmed against redis on a hit
+    """
+    if token_revocations.needs_refresh():
+        token_revocations.refreshed_at = time.monotonic()  # one refresh at a time
+        windows = token_revocations.windows()
+        try:
+            token_revocations.load(windows, await get_session_store().mget([session_tokens.bloom_key(w) for w in windows]))
+        except redis.RedisError as e:
+            print(f"could not refresh session revocation filter: {e}")
+    if not token_revocations.might_be_revoked(claims):
+        return False
+    return bool(await get_session_store().exists(f"{session_tokens.REVOKED_KEY_PREFIX}{claims['jti']}"))
+
+
+async def revoke(claims: session_tokens.Claims) -> None:
+    """
+    async session_tokens.revoke - exact key until the token expires, plus its bits in the window's bloom filter
+    """
+    window = int(claims["exp"]) // session_tokens.BLOOM_WINDOW_SECONDS
+    key = session_tokens.bloom_key(window)
+    async with get_session_store().pipeline(transaction=True) as pipe:
+        pipe.set(f"{session_tokens.REVOKED_KEY_PREFIX}{claims['jti']}", 1, ex=max(1, int(claims["exp"] - time.time())))
+        for position in session_tokens.bloom_positions(claims["jti"]):
+            pipe.setbit(key, position, 1)
+        pipe.expireat(key, (window + 1) * session_tokens.BLOOM_WINDOW_SECONDS + 60)
+        await pipe.execute()
+
+
+async def verify_signed_token(token: str) -> Optional[session_tokens.Claims]:
+    """
+    return the claims of a valid, unrevoked signed token
+    """
+    if token_codec is None:
+        return None
+    claims = token_codec.verify(token)
+    if claims is None or await is_revoked(claims):
+        return None
+    return claims
+
+
+@app.get("/ready")
+async def ready() -> JSONResponse:
+    """
+    readiness check - 200 when redis answers a PING through the connection pool, 503 otherwise
+    """
+    started = time.perf_counter()
+    try:
+        await get_session_store().ping()
+    except redis.RedisError as e:
+        return JSONResponse({"status": "unavailable", "redis": str(e)}, status_code=503)
+    return JSONResponse({"status": "ready", "redis_ping_ms": round((time.perf_counter() - started) * 1000, 2)})
+
+
+@app.post("/login")
+async def login(request: Request) -> JSONResponse:
+    """
+    login route to authenticate a user and create a session in redis
+    """
+    data = await read_json(request)
+
+    username = data.get("username")
+    password = data.get("password")
+
+    user = None
+    if isinstance(username, str) and username:
+        if user_repository.blocking_lookups:
+            user = await asyncio.to_thread(user_repository.find, username)
+        else:
+            user = user_repository.find(username)
+    try:
+        authenticated = await password_hasher.verify_async(
+            password if isinstance(password, str) else "", user["password_hash"] if user else None
+        )
+    except passwords.PasswordHasherBusy:
+        return JSONResponse({"message": "too many logins in progress, retry shortly"}, status_code=503)
+
+    if user and authenticated:
+        session_id = await create_session({"email": user["email"], "name": user["name"], "source": "manual"})
+        return JSONResponse({"message": "login successful", "session_id": session_id})
+
+    return JSONResponse({"message": "invalid credentials"}, status_code=401)
+
+
+@app.post("/store_google_user_info")
+async def store_google_user_info(request: Request) -> JSONResponse:
+    """
+    create a session using google auth user info
+    """
+    try:
+        data = await read_json(request)
+        session_id = await create_session({"email": data["email"], "name": data["name"], "source": "google"})
+        return JSONResponse({"session_id": session_id})
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+
+@app.post("/verify")
+async def verify(request: Request) -> JSONResponse:
+    """
+    verify session by checking redis for the given session_id (signed tokens are verified locally)
+    and slide its expiry once it is past the refresh threshold
+    """
+    data = await read_json(request)
+    session_id = data.get("session_id")
+
+    if not session_id:
+        return JSONResponse({"message": "session ID required"}, status_code=400)
+
+    if session_tokens.is_signed_token(session_id):
+        claims = await verify_signed_token(session_id)
+        if claims:
+            return JSONResponse({"message": "valid session", "user": session_tokens.user_from_claims(claims)})
+        return JSONResponse({"message": "invalid session"}, status_code=401)
+
+    session_key = f"session:{session_id}"
+    async with get_session_store().pipeline(transaction=False) as pipe:  # one round trip for the session and its remaining TTL
+        pipe.get(session_key)
+        pipe.ttl(session_key)
+        username, ttl = await pipe.execute()
+
+    if username:
+        if 0 <= ttl < config.SESSION_REFRESH_THRESHOLD_SECONDS:
+            # * at most once per (TTL - threshold) seconds per session, so no batching thread as in app.py
+            await get_session_store().expire(session_key, config.SESSION_EXPIRE_TIME_SECONDS)
+        return JSONResponse({"message": "valid session", "user": json.loads(username.decode("utf-8"))})
+
+    return JSONResponse({"message": "invalid session"}, status_code=401)
+
+
+@app.post("/verify/batch")
+async def verify_batch(request: Request) -> JSONResponse:
+    """
+    verify many sessions at once - opaque session IDs are resolved with a single redis MGET,
+    signed tokens locally. returns {"sessions": {session_id: user or null}}
+    """
+    data = await read_json(request)
+    session_ids = data.get("session_ids")
+
+    if not isinstance(session_ids, list) or not all(isinstance(session_id, str) for session_id in session_ids):
+        return JSONResponse({"message": "session_ids must be a list of strings"}, status_code=400)
+    if len(session_ids) > config.MAX_VERIFY_BATCH_SIZE:
+        return JSONResponse({"message": f"at most {config.MAX_VERIFY_BATCH_SIZE} session IDs per request"}, status_code=400)
+
+    unique_ids = list(dict.fromkeys(session_id for session_id in session_ids if session_id))
+    sessions: Dict[str, Optional[Dict[str, str]]] = {}
+
+    opaque_ids = []
+    for session_id in unique_ids:
+        if session_tokens.is_signed_token(session_id):
+            claims = await verify_signed_token(session_id)
+            sessions[session_id] = session_tokens.user_from_claims(claims) if claims else None
+        else:
+            opaque_ids.append(session_id)
+
+    if opaque_ids:
+        values: List[Optional[bytes]] = await get_session_store().mget(  # type: ignore
+            [f"session:{session_id}" for session_id in opaque_ids]
+        )
+        for session_id, value in zip(opaque_ids, values):
+            sessions[session_id] = json.loads(value.decode("utf-8")) if value else None
+
+    return JSONResponse({"sessions": sessions})
+
+
+@app.post("/logout")
+async def logout(request: Request) -> JSONResponse:
+    """
+    logout route to delete the session from redis (or revoke a signed token until it expires)
+    """
+    data = await read_json(request)
+    session_id = data.get("session_id")
+
+    if session_id and session_tokens.is_signed_token(session_id):
+        claims = token_codec.verify(session_id) if token_codec is not None else None
+        if claims:
+            await revoke(claims)
+        return JSONResponse({"message": "logged out successfully"})
+
+    if session_id:
+        await get_session_store().delete(f"session:{session_id}")
+        return JSONResponse({"message": "logged out successfully"})
+
+    return JSONResponse({"message": "invalid session ID"}, status_code=400)
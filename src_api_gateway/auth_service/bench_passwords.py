@@ -0,0 +1,70 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+import passwords
+
+# * login cost benchmark - password verifications per second at each scrypt cost, on one core and on a pool of
+# * PASSWORD_HASH_WORKERS-style threads, to pick PASSWORD_SCRYPT_LOG2_N / PASSWORD_HASH_WORKERS for a task size
+# *     python bench_passwords.py --log2-n 13 14 15 16 --workers 2
+# * not part of the service image
+
+
+def bench(log2_n: int, workers: int, duration: float) -> Dict[str, float]:
+    """
+    verify one password back to back for `duration` seconds, single threaded and on `workers` threads
+    """
+    password_hash = passwords.hash_password("benchmark-password", log2_n)
+
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < duration:
+        passwords.verify_password("benchmark-password", password_hash)
+        count += 1
+    single = count / (time.perf_counter() - started)
+
+    def run(_: int) -> int:
+        done = 0
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            passwords.verify_password("benchmark-password", password_hash)
+            done += 1
+        return done
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        total = sum(executor.map(run, range(workers)))
+    pooled = total / (time.perf_counter() - started)
+
+    return {
+        "ms_per_login": round(1000 / single, 1),
+        "logins_per_second_per_core": round(single, 1),
+        "logins_per_second_pool": round(pooled, 1),
+        "memory_mib": round(128 * passwords.PASSWORD_SCRYPT_R * (1 << log2_n) / (1024 * 1024), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="benchmark password verification cost")
+    parser.add_argument("--log2-n", type=int, nargs="+", default=[12, 13, 14, 15, 16])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--duration", type=float, default=2)
+    args = parser.parse_args()
+
+    print(
+        f"cpus: {os.cpu_count()}, pool workers: {args.workers}, "
+        f"r={passwords.PASSWORD_SCRYPT_R}, p={passwords.PASSWORD_SCRYPT_P}"
+    )
+    print(f"{'log2 n':>6} {'memory MiB':>11} {'ms/login':>9} {'logins/s/core':>14} {'logins/s pool':>14}")
+    for log2_n in args.log2_n:
+        result = bench(log2_n, args.workers, args.duration)
+        print(
+            f"{log2_n:>6} {result['memory_mib']:>11} {result['ms_per_login']:>9} "
+            f"{result['logins_per_second_per_core']:>14} {result['logins_per_second_pool']:>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
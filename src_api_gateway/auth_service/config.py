@@ -0,0 +1,82 @@
+import os
+from typing import Any, Dict
+
+import redis
+from redis.backoff import ExponentialBackoff
+from redis.retry import Retry
+
+# * settings shared by the Flask (app.py) and the async (app_async.py) auth_service
+
+# * session lifetime and sliding expiry - /verify extends a session once less than SESSION_REFRESH_THRESHOLD_SECONDS are left
+SESSION_EXPIRE_TIME_SECONDS = int(os.getenv("SESSION_EXPIRE_TIME_SECONDS", "3600"))
+SESSION_REFRESH_THRESHOLD_SECONDS = int(os.getenv("SESSION_REFRESH_THRESHOLD_SECONDS", str(SESSION_EXPIRE_TIME_SECONDS // 2)))
+SESSION_REFRESH_FLUSH_INTERVAL_SECONDS = float(os.getenv("SESSION_REFRESH_FLUSH_INTERVAL_SECONDS", "1"))
+
+# * max session IDs accepted by /verify/batch in one request
+MAX_VERIFY_BATCH_SIZE = int(os.getenv("MAX_VERIFY_BATCH_SIZE", "500"))
+
+# * session tokens - `opaque`: random session ID stored in redis (default), `signed`: stateless signed token
+# * that other services verify locally (SESSION_TOKEN_SECRETS must be shared with them)
+SESSION_TOKEN_MODE = os.getenv("SESSION_TOKEN_MODE", "opaque")
+SESSION_TOKEN_REVOCATION_REFRESH_SECONDS = float(os.getenv("SESSION_TOKEN_REVOCATION_REFRESH_SECONDS", "5"))
+
+# * password verification pool per worker - hashing threads, and verifications accepted before /login answers 503
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
+# * user directory - `memory` (demo users in users.py) or `redis` (load with `python users.py import users.csv`),
+# * redis lookups are cached per worker for USER_CACHE_TTL_SECONDS
+USER_REPOSITORY_BACKEND = os.getenv("USER_REPOSITORY_BACKEND", "memory")
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+
+# * redis retries - attempts after the first one, backoff doubles from RETRY_BACKOFF_BASE up to RETRY_BACKOFF_CAP seconds
+REDIS_RETRIES = int(os.getenv("REDIS_RETRIES", "2"))
+REDIS_RETRY_BACKOFF_BASE = 0.05
+REDIS_RETRY_BACKOFF_CAP = 0.5
+
+
+def redis_pool_kwargs() -> Dict[str, Any]:
+    """
+    connection pool settings for the session store, used for both the sync and the asyncio BlockingConnectionPool
+
+    - requests wait at most REDIS_POOL_TIMEOUT_SECONDS for a free connection instead of opening unbounded ones
+    - idle connections are checked before reuse (health_check_interval) and kept alive at the TCP level
+    - the retry policy (exponential backoff) is added by the caller, the sync and asyncio clients use different classes
+    """
+    redis_host = os.environ["REDIS_HOST"]
+    redis_port = int(os.getenv("REDIS_PORT", "6379"))
+    print(f"connecting to redis at {redis_host}:{redis_port}")
+
+    return {
+        "host": redis_host,
+        "port": redis_port,
+        "max_connections": int(os.getenv("REDIS_MAX_CONNECTIONS", "20")),  # per worker process
+        "timeout": float(os.getenv("REDIS_POOL_TIMEOUT_SECONDS", "1")),
+        "socket_timeout": float(os.getenv("REDIS_SOCKET_TIMEOUT_SECONDS", "1")),
+        "socket_connect_timeout": float(os.getenv("REDIS_CONNECT_TIMEOUT_SECONDS", "1")),
+        "socket_keepalive": True,
+        "health_check_interval": int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL_SECONDS", "15")),
+    }
+
+
+def redis_ssl() -> bool:
+    """
+    True if the session store must be reached over TLS (AWS ElastiCache)
+    """
+    return os.getenv("REDIS_SSL", "false") == "true"
+
+
+def create_redis_client() -> redis.Redis:
+    """
+    create a sync redis client on an explicitly sized, blocking connection pool (see redis_pool_kwargs)
+
+    - transient connection errors / timeouts are retried with exponential backoff
+    """
+    pool = redis.BlockingConnectionPool(
+        connection_class=redis.SSLConnection if redis_ssl() else redis.Connection,
+        retry=Retry(ExponentialBackoff(cap=REDIS_RETRY_BACKOFF_CAP, base=REDIS_RETRY_BACKOFF_BASE), REDIS_RETRIES),
+        retry_on_error=[redis.ConnectionError, redis.TimeoutError],
+        **redis_pool_kwargs(),
+    )
+    return redis.Redis(connection_pool=pool)
@@ -0,0 +1,93 @@
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+# * load test for auth_service /verify - compare the Flask (gunicorn) and the async (uvicorn) variants, e.g.
+# *     docker compose --profile async up auth_service auth_service_async redis
+# *     python load_test.py --url http://localhost:5000 --url http://localhost:5004 --concurrency 100 --duration 20
+# * not part of the service image - needs `pip install httpx`
+
+
+async def login(client: httpx.AsyncClient, url: str, username: str, password: str) -> str:
+    """
+    create a session to verify during the test
+    """
+    response = await client.post(f"{url}/login", json={"username": username, "password": password})
+    response.raise_for_status()
+    return response.json()["session_id"]
+
+
+async def worker(
+    client: httpx.AsyncClient, url: str, session_id: str, deadline: float, latencies: List[float], errors: List[int]
+) -> None:
+    """
+    call /verify back to back until `deadline`
+    """
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.post(f"{url}/verify", json={"session_id": session_id})
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError:
+            errors.append(0)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(url: str, concurrency: int, duration: float, username: str, password: str) -> Dict[str, float]:
+    """
+    run `concurrency` clients against `url` for `duration` seconds and summarize throughput and latency
+    """
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=10) as client:
+        session_id = await login(client, url, username, password)
+        await client.post(f"{url}/verify", json={"session_id": session_id})  # warm up connections
+
+        latencies: List[float] = []
+        errors: List[int] = []
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(worker(client, url, session_id, deadline, latencies, errors) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2) if latencies else 0.0
+
+    return {
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "requests": len(latencies),
+        "errors": len(errors),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="load test auth_service /verify")
+    parser.add_argument("--url", action="append", required=True, help="auth_service base URL, repeat to compare")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--username", default="test_user")
+    parser.add_argument("--password", default="passwordtest")
+    args = parser.parse_args()
+
+    print(f"{'url':<32} {'req/s':>10} {'requests':>10} {'errors':>8} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for url in args.url:
+        result = asyncio.run(run(url.rstrip("/"), args.concurrency, args.duration, args.username, args.password))
+        print(
+            f"{url:<32} {result['requests_per_second']:>10} {result['requests']:>10} {result['errors']:>8} "
+            f"{result['mean_ms']:>9} {result['p50_ms']:>9} {result['p99_ms']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
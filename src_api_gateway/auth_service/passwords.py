@@ -0,0 +1,128 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+# * password hashes are stored as `scrypt$<log2 n>$<r>$<p>$<base64 salt>$<base64 key>` - the cost is stored with
+# * every hash, so raising PASSWORD_SCRYPT_LOG2_N only affects newly hashed passwords
+# * 2^14 with r=8: 16 MiB and tens of ms per hash, see bench_passwords.py
+PASSWORD_SCRYPT_LOG2_N = int(os.getenv("PASSWORD_SCRYPT_LOG2_N", "14"))
+PASSWORD_SCRYPT_MAX_LOG2_N = 20  # 1 GiB per hash - costs read from a stored hash are never trusted beyond this
+PASSWORD_SCRYPT_R = 8
+PASSWORD_SCRYPT_P = 1
+PASSWORD_SALT_BYTES = 16
+PASSWORD_KEY_BYTES = 32
+
+
+class PasswordHasherBusy(Exception):
+    """
+    raised when the hashing pool already has `max_pending` verifications queued
+    """
+
+
+def _scrypt(password: str, salt: bytes, log2_n: int, r: int, p: int) -> bytes:
+    """
+    scrypt key for `password` - hashlib releases the GIL while hashing, so a thread pool uses several cores
+    """
+    n = 1 << log2_n
+    return hashlib.scrypt(
+        password.encode("utf-8"),
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=128 * r * (n + p + 2) + 1024 * 1024,
+        dklen=PASSWORD_KEY_BYTES,
+    )
+
+
+def hash_password(password: str, log2_n: Optional[int] = None) -> str:
+    """
+    hash `password` with a random salt at cost 2^log2_n (PASSWORD_SCRYPT_LOG2_N by default)
+    """
+    log2_n = PASSWORD_SCRYPT_LOG2_N if log2_n is None else log2_n
+    salt = secrets.token_bytes(PASSWORD_SALT_BYTES)
+    key = _scrypt(password, salt, log2_n, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P)
+    encoded_salt = base64.b64encode(salt).decode("ascii")
+    encoded_key = base64.b64encode(key).decode("ascii")
+    return f"scrypt${log2_n}${PASSWORD_SCRYPT_R}${PASSWORD_SCRYPT_P}${encoded_salt}${encoded_key}"
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """
+    True if `password` matches `password_hash` - keys are compared in constant time
+    """
+    try:
+        algorithm, log2_n, r, p, encoded_salt, encoded_key = password_hash.split("$")
+        if algorithm != "scrypt" or not 0 < int(log2_n) <= PASSWORD_SCRYPT_MAX_LOG2_N:
+            return False
+        salt = base64.b64decode(encoded_salt)
+        expected = base64.b64decode(encoded_key)
+        key = _scrypt(password, salt, int(log2_n), int(r), int(p))
+    except (ValueError, OverflowError):
+        return False
+    return hmac.compare_digest(key, expected)
+
+
+# * verified against (and never matched) when the user does not exist, so unknown usernames take as long as wrong passwords
+_DUMMY_PASSWORD_HASH = hash_password(secrets.token_urlsafe(16))
+
+
+class PasswordHasher:
+    """
+    verifies passwords on a bounded thread pool
+
+    - at most `max_workers` hashes run at once per process, so a burst of logins can't take every core from /verify
+    - at most `max_pending` verifications are accepted (running or queued), beyond that PasswordHasherBusy is raised
+      instead of letting the queue - and the login latency - grow without bound
+    - the async app awaits the pool, so its event loop keeps serving other requests while a password is hashed
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32) -> None:
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        self.__max_workers = max_workers
+        self.__slots = threading.BoundedSemaphore(max_pending)
+        self.__lock = threading.Lock()
+
+        # * metrics
+        self.submitted = 0
+        self.rejected = 0
+
+    def _submit(self, password: str, password_hash: Optional[str]) -> "Future[bool]":
+        """
+        queue a verification, raising PasswordHasherBusy when the pool is full
+        """
+        if not self.__slots.acquire(blocking=False):
+            self.rejected += 1
+            raise PasswordHasherBusy("too many logins in progress")
+        with self.__lock:
+            if self.__executor is None:  # created on first use (after the gunicorn / uvicorn worker fork)
+                self.__executor = ThreadPoolExecutor(max_workers=self.__max_workers, thread_name_prefix="password-hasher")
+        future = self.__executor.submit(verify_password, password, password_hash or _DUMMY_PASSWORD_HASH)
+        future.add_done_callback(lambda _: self.__slots.release())
+        self.submitted += 1
+        return future
+
+    def verify(self, password: str, password_hash: Optional[str]) -> bool:
+        """
+        check `password` against `password_hash` (None for unknown users, still hashed to keep the timing uniform)
+        """
+        return self._submit(password, password_hash).result()
+
+    async def verify_async(self, password: str, password_hash: Optional[str]) -> bool:
+        """
+        verify() without blocking the event loop
+        """
+        return await asyncio.wrap_future(self._submit(password, password_hash))
+
+
+if __name__ == "__main__":
+    # * python passwords.py - hash a password for users.py
+    import getpass
+
+    print(hash_password(getpass.getpass("password: ")))
@@ -0,0 +1,67 @@
+import threading
+import time
+from typing import Optional, Set
+
+import redis
+
+
+class SessionRefresher:
+    """
+    sliding session expiry without a redis write per /verify
+
+    /verify only schedules a refresh once a session's remaining TTL drops below the refresh threshold, so each
+    session is written at most once per (TTL - threshold) seconds. scheduled keys are de-duplicated and a
+    background thread per worker resets their TTL with one pipelined EXPIRE batch every `flush_interval` seconds.
+    """
+
+    def __init__(self, store: redis.Redis, ttl: int, flush_interval: float = 1.0) -> None:
+        self.__store = store
+        self.__ttl = ttl
+        self.__flush_interval = flush_interval
+        self.__pending: Set[str] = set()
+        self.__lock = threading.Lock()
+        self.__thread: Optional[threading.Thread] = None
+
+        # * metrics
+        self.scheduled = 0
+        self.refreshed = 0
+        self.flushes = 0
+
+    def schedule(self, session_key: str) -> None:
+        """
+        queue a TTL refresh for `session_key`; starts the flusher on first use (after the gunicorn worker fork)
+        """
+        with self.__lock:
+            if session_key not in self.__pending:
+                self.__pending.add(session_key)
+                self.scheduled += 1
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self._run, name="session-refresher", daemon=True)
+                self.__thread.start()
+
+    def flush(self) -> int:
+        """
+        reset the TTL of every queued session in one pipeline; returns the number of sessions refreshed
+        """
+        with self.__lock:
+            keys, self.__pending = self.__pending, set()
+        if not keys:
+            return 0
+        with self.__store.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.expire(key, self.__ttl)  # no-op for sessions deleted (logout) in the meantime
+            refreshed = sum(bool(result) for result in pipe.execute())
+        self.refreshed += refreshed
+        self.flushes += 1
+        return refreshed
+
+    def _run(self) -> None:
+        """
+        flush queued refreshes every `flush_interval` seconds
+        """
+        while True:
+            time.sleep(self.__flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"error refreshing session TTLs: {e}")
@@ -0,0 +1,219 @@
+"""
+Signed, stateless session tokens shared by auth_service, web_service, order_service and the lambda authorizer.
+
+Token: `v1.<base64url(JSON claims)>.<base64url(HMAC-SHA256)>`, claims = email, name, source, iat, exp, jti.
+Signature and expiry are checked locally. Revoked tokens (logout) are recorded in Redis as
+`revoked_session:<jti>` plus a bloom filter bitmap per expiry hour; verifiers keep a local copy of the bitmaps
+and only ask Redis about a token when the bloom filter says it might be revoked.
+
+Also signs the internal identity header web_service forwards to order_service for an already verified user.
+
+Every service image is built from its own directory, so this module is copied into each of them. The canonical
+copy is auth_service/session_tokens.py - edit it, then copy it to web_service, order_service_fastapi/core and
+lambda_authorizer. auth_service/tests/test_session_tokens.py fails while any copy differs.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import logging
+import os
+import struct
+import time
+import uuid
+from typing import Any, Optional
+
+TOKEN_PREFIX = "v1."
+REVOKED_KEY_PREFIX = "revoked_session:"
+BLOOM_KEY_PREFIX = "revoked_sessions:bloom:"
+BLOOM_WINDOW_SECONDS = 3600  # one bloom filter per hour of token expiry, dropped once those tokens expired
+BLOOM_BITS = 1 << 17  # 16 KiB per window, ~1% false positives at 13k revocations
+BLOOM_HASHES = 7
+INTERNAL_AUTH_HEADER = "X-Internal-Auth"
+
+Claims = dict[str, Any]
+
+
+def _b64encode(raw: bytes) -> str:
+    """URL-safe base64 without padding."""
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    """Decode URL-safe base64 without padding."""
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def is_signed_token(token: str) -> bool:
+    """True for signed tokens, False for opaque (Redis-backed) session IDs."""
+    return token.startswith(TOKEN_PREFIX)
+
+
+def user_from_claims(claims: Claims) -> dict[str, str]:
+    """The user as stored in Redis-backed sessions: {'email', 'name', 'source'}."""
+    return {"email": claims["email"], "name": claims["name"], "source": claims["source"]}
+
+
+class SessionTokenCodec:
+    """
+    Issues and verifies signed session tokens.
+
+    The first secret signs; every secret verifies, so secrets can be rotated by prepending a new one.
+    """
+
+    def __init__(self, secrets: list[str], ttl: int = 3600) -> None:
+        if not secrets:
+            raise ValueError("at least one session token secret is required")
+        self.__keys = [secret.encode("utf-8") for secret in secrets]
+        self.ttl = ttl
+
+    @classmethod
+    def from_env(cls) -> Optional["SessionTokenCodec"]:
+        """Build from SESSION_TOKEN_SECRETS (comma separated) and SESSION_EXPIRE_TIME_SECONDS; None if unset."""
+        secrets = [secret.strip() for secret in os.getenv("SESSION_TOKEN_SECRETS", "").split(",") if secret.strip()]
+        if not secrets:
+            return None
+        return cls(secrets, int(os.getenv("SESSION_EXPIRE_TIME_SECONDS", "3600")))
+
+    @staticmethod
+    def _sign(key: bytes, signing_input: str) -> str:
+        """HMAC-SHA256 signature of `signing_input`."""
+        return _b64encode(hmac.new(key, signing_input.encode("ascii"), hashlib.sha256).digest())
+
+    def issue(self, email: str, name: str, source: str) -> str:
+        """Issue a token for the user, valid for `ttl` seconds."""
+        now = int(time.time())
+        claims = {
+            "email": email,
+            "name": name,
+            "source": source,
+            "iat": now,
+            "exp": now + self.ttl,
+            "jti": uuid.uuid4().hex,
+        }
+        signing_input = TOKEN_PREFIX + _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+        return f"{signing_input}.{self._sign(self.__keys[0], signing_input)}"
+
+    def verify(self, token: str) -> Optional[Claims]:
+        """Return the claims of a correctly signed, unexpired token (revocation is checked separately), else None."""
+        if not token.isascii() or not is_signed_token(token):  # signatures are ASCII - anything else is malformed
+            return None
+        signing_input, _, signature = token.rpartition(".")
+        if not signing_input or not any(hmac.compare_digest(self._sign(key, signing_input), signature) for key in self.__keys):
+            return None
+        try:
+            claims = json.loads(_b64decode(signing_input.removeprefix(TOKEN_PREFIX)))
+        except (ValueError, binascii.Error):
+            return None
+        if not isinstance(claims, dict) or claims.get("exp", 0) <= time.time():
+            return None
+        return claims
+
+
+def bloom_key(window: int) -> str:
+    """Redis bitmap holding the bloom filter for tokens expiring in `window`."""
+    return f"{BLOOM_KEY_PREFIX}{window}"
+
+
+def bloom_positions(jti: str) -> list[int]:
+    """Bit offsets of `jti` in a bloom filter."""
+    digest = hashlib.sha256(jti.encode("utf-8")).digest()
+    return [value % BLOOM_BITS for value in struct.unpack_from(f">{BLOOM_HASHES}I", digest)]  # big-endian 32-bit words
+
+
+class RevocationFilter:
+    """
+    Local copy of the revocation bloom filters for tokens that can still be valid.
+
+    `might_be_revoked()` is False for almost every valid token; True means "ask Redis". Windows that were not
+    loaded (no refresh yet, or tokens living longer than `max_token_ttl`) always answer True.
+    """
+
+    def __init__(self, refresh_interval: float = 5.0, max_token_ttl: int = 3600) -> None:
+        self.refresh_interval = refresh_interval
+        self.max_token_ttl = max_token_ttl
+        self.refreshed_at = float("-inf")  # monotonic time of the last refresh attempt
+        self.__blooms: dict[int, bytes] = {}
+
+    def windows(self) -> list[int]:
+        """Expiry windows of tokens that can currently be valid."""
+        first = int(time.time()) // BLOOM_WINDOW_SECONDS
+        return list(range(first, first + self.max_token_ttl // BLOOM_WINDOW_SECONDS + 2))
+
+    def needs_refresh(self) -> bool:
+        """True once `refresh_interval` has passed since the last refresh attempt."""
+        return time.monotonic() - self.refreshed_at >= self.refresh_interval
+
+    def load(self, windows: list[int], bitmaps: list[Optional[bytes]]) -> None:
+        """Replace the local bloom filters with bitmaps read from Redis (None = nothing revoked in that window)."""
+        self.__blooms = {window: bitmap or b"" for window, bitmap in zip(windows, bitmaps)}
+
+    def might_be_revoked(self, claims: Claims) -> bool:
+        """Bloom filter check for the token's jti."""
+        bitmap = self.__blooms.get(int(claims["exp"]) // BLOOM_WINDOW_SECONDS)
+        if bitmap is None:
+            return True
+        for position in bloom_positions(claims["jti"]):
+            byte_index = position >> 3
+            if byte_index >= len(bitmap) or not bitmap[byte_index] & (0x80 >> (position & 7)):  # Redis bit order
+                return False
+        return True
+
+
+def refresh_revocations(revocations: RevocationFilter, redis_client: Any) -> None:
+    """Reload the bloom filters with one MGET (sync redis client with decode_responses=False)."""
+    revocations.refreshed_at = time.monotonic()
+    windows = revocations.windows()
+    revocations.load(windows, redis_client.mget([bloom_key(window) for window in windows]))
+
+
+def is_revoked(claims: Claims, revocations: RevocationFilter, redis_client: Any) -> bool:
+    """
+    True if the token was revoked. Only touches Redis to refresh the bloom filters (every `refresh_interval`)
+    and to confirm a bloom filter hit.
+    """
+    if revocations.needs_refresh():
+        try:
+            refresh_revocations(revocations, redis_client)
+        except Exception as e:
+            logging.warning("Could not refresh session revocation filter: %s", e)
+    if not revocations.might_be_revoked(claims):
+        return False
+    return bool(redis_client.exists(f"{REVOKED_KEY_PREFIX}{claims['jti']}"))
+
+
+def revoke(claims: Claims, redis_client: Any) -> None:
+    """Record a revoked token: exact key until the token expires, plus its bits in the window's bloom filter."""
+    window = int(claims["exp"]) // BLOOM_WINDOW_SECONDS
+    key = bloom_key(window)
+    with redis_client.pipeline(transaction=True) as pipe:
+        pipe.set(f"{REVOKED_KEY_PREFIX}{claims['jti']}", 1, ex=max(1, int(claims["exp"] - time.time())))
+        for position in bloom_positions(claims["jti"]):
+            pipe.setbit(key, position, 1)
+        pipe.expireat(key, (window + 1) * BLOOM_WINDOW_SECONDS + 60)
+        pipe.execute()
+
+
+def sign_internal_identity(secret: str, email: str, issued_at: Optional[int] = None) -> str:
+    """Internal identity header value for a verified user: `<base64url(email)>.<unix time>.<base64url(HMAC-SHA256)>`."""
+    signing_input = f"{_b64encode(email.encode('utf-8'))}.{int(time.time()) if issued_at is None else issued_at}"
+    return f"{signing_input}.{SessionTokenCodec._sign(secret.encode('utf-8'), signing_input)}"
+
+
+def verify_internal_identity(secrets: list[str], value: str, max_age: int = 60) -> Optional[str]:
+    """Email from a correctly signed internal identity header issued at most `max_age` seconds ago, else None."""
+    if not value.isascii():  # timestamps and signatures are ASCII - anything else is malformed
+        return None
+    signing_input, _, signature = value.rpartition(".")
+    encoded_email, _, issued_at = signing_input.partition(".")
+    if not encoded_email or not issued_at.isdigit() or abs(time.time() - int(issued_at)) > max_age:
+        return None
+    keys = [secret.encode("utf-8") for secret in secrets]
+    if not any(hmac.compare_digest(SessionTokenCodec._sign(key, signing_input), signature) for key in keys):
+        return None
+    try:
+        return _b64decode(encoded_email).decode("utf-8")
+    except (ValueError, binascii.Error):
+        return None
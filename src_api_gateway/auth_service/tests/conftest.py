@@ -0,0 +1,43 @@
+import os
+from typing import Iterator
+
+import fakeredis
+import pytest
+from flask.testing import FlaskClient
+from pytest import MonkeyPatch
+
+# * settings are read when the app modules are imported - redis connections are opened lazily, so no server is needed
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("REDIS_HOST", "localhost")
+
+import app as flask_app  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    """Run `pytest.mark.anyio` tests on asyncio only."""
+    return "asyncio"
+
+
+@pytest.fixture
+def redis_server() -> fakeredis.FakeServer:
+    """In-process fake redis server, fresh per test."""
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def session_store(redis_server: fakeredis.FakeServer, monkeypatch: MonkeyPatch) -> fakeredis.FakeRedis:
+    """Fake session store used by the Flask app, with a refresher that never flushes on its own."""
+    store = fakeredis.FakeRedis(server=redis_server)
+    monkeypatch.setattr(flask_app, "session_store", store)
+    monkeypatch.setattr(
+        flask_app, "session_refresher", flask_app.SessionRefresher(store, flask_app.config.SESSION_EXPIRE_TIME_SECONDS, 3600)
+    )
+    return store
+
+
+@pytest.fixture
+def client(session_store: fakeredis.FakeRedis) -> Iterator[FlaskClient]:
+    """Flask test client on the fake session store."""
+    with flask_app.app.test_client() as test_client:
+        yield test_client
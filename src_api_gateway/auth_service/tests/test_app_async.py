@@ -0,0 +1,126 @@
+import json
+import threading
+from typing import AsyncGenerator, Iterable, List, Optional
+
+import app_async
+import fakeredis
+import httpx
+import pytest
+import redis.asyncio
+import users
+from pytest import MonkeyPatch
+
+pytestmark = pytest.mark.anyio
+
+USER = {"email": "u@x", "name": "Test", "source": "manual"}
+
+
+class RecordingRepository(users.UserRepository):
+    """Repository without users that records the thread each lookup runs on."""
+
+    def __init__(self, blocking_lookups: bool) -> None:
+        self.blocking_lookups = blocking_lookups
+        self.threads: List[int] = []
+
+    def get_by_username(self, username: str) -> Optional[users.User]:
+        """Record the calling thread; nobody is found."""
+        self.threads.append(threading.get_ident())
+        return None
+
+    def get_by_email(self, email: str) -> Optional[users.User]:
+        """Nobody is found."""
+        return None
+
+    def add_users(self, users: Iterable[users.User]) -> int:
+        """Nothing is stored."""
+        return 0
+
+
+@pytest.fixture
+async def session_store(redis_server: fakeredis.FakeServer) -> AsyncGenerator[fakeredis.FakeAsyncRedis, None]:
+    """Fake asyncio session store put where lifespan would put the worker's pool."""
+    store = fakeredis.FakeAsyncRedis(server=redis_server)
+    app_async.app.state.session_store = store
+    yield store
+    await store.aclose()
+
+
+@pytest.fixture
+async def client(session_store: fakeredis.FakeAsyncRedis) -> AsyncGenerator[httpx.AsyncClient, None]:
+    """Client for the async app, without running its lifespan."""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app_async.app), base_url="http://auth") as client:
+        yield client
+
+
+def test_create_session_store_uses_a_bounded_blocking_pool(monkeypatch: MonkeyPatch) -> None:
+    """The asyncio pool takes the same REDIS_* settings as the Flask app's."""
+    monkeypatch.setenv("REDIS_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("REDIS_POOL_TIMEOUT_SECONDS", "0.25")
+    monkeypatch.setenv("REDIS_SSL", "true")
+
+    pool = app_async.create_session_store().connection_pool
+
+    assert isinstance(pool, redis.asyncio.BlockingConnectionPool)
+    assert pool.max_connections == 7
+    assert pool.timeout == 0.25
+    assert pool.connection_class is redis.asyncio.SSLConnection
+    assert pool.connection_kwargs["socket_keepalive"] is True
+
+
+async def test_lifespan_closes_the_connection_pool(monkeypatch: MonkeyPatch, redis_server: fakeredis.FakeServer) -> None:
+    """The explicitly created pool is disconnected on shutdown, not just the client."""
+    store = fakeredis.FakeAsyncRedis(server=redis_server)
+    disconnects: List[bool] = []
+
+    async def disconnect(inuse_connections: bool = True) -> None:
+        disconnects.append(inuse_connections)
+
+    monkeypatch.setattr(app_async, "create_session_store", lambda: store)
+    monkeypatch.setattr(store.connection_pool, "disconnect", disconnect)
+
+    async with app_async.lifespan(app_async.app):
+        assert app_async.get_session_store() is store
+        assert disconnects == []
+    assert disconnects == [True]
+
+
+@pytest.mark.parametrize("blocking_lookups", [True, False])
+async def test_login_runs_blocking_lookups_in_a_worker_thread(
+    client: httpx.AsyncClient, monkeypatch: MonkeyPatch, blocking_lookups: bool
+) -> None:
+    """Only repositories that declare blocking lookups are moved off the event loop."""
+    repository = RecordingRepository(blocking_lookups)
+    monkeypatch.setattr(app_async, "user_repository", repository)
+
+    response = await client.post("/login", json={"username": "alice", "password": "secret"})
+
+    assert response.status_code == 401
+    assert (repository.threads[0] != threading.get_ident()) is blocking_lookups
+
+
+async def test_ready_pings_redis(client: httpx.AsyncClient, redis_server: fakeredis.FakeServer) -> None:
+    """/ready answers 200 while redis is reachable and 503 once it is not."""
+    assert (await client.get("/ready")).status_code == 200
+
+    redis_server.connected = False
+    response = await client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "unavailable"
+
+
+async def test_verify_and_logout_use_the_worker_session_store(
+    client: httpx.AsyncClient, session_store: fakeredis.FakeAsyncRedis
+) -> None:
+    """Sessions are read from and deleted in the store opened by lifespan."""
+    await session_store.set("session:a", json.dumps(USER), ex=3600)
+
+    response = await client.post("/verify", json={"session_id": "a"})
+    assert response.status_code == 200
+    assert response.json()["user"] == USER
+    assert (await client.post("/verify/batch", json={"session_ids": ["a", "b"]})).json() == {
+        "sessions": {"a": USER, "b": None}
+    }
+
+    assert (await client.post("/logout", json={"session_id": "a"})).status_code == 200
+    assert (await client.post("/verify", json={"session_id": "a"})).status_code == 401
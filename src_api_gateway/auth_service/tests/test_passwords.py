@@ -0,0 +1,72 @@
+import threading
+
+import app as flask_app
+import passwords
+import pytest
+from flask.testing import FlaskClient
+from pytest import MonkeyPatch
+
+PASSWORD = "correct horse"
+PASSWORD_HASH = passwords.hash_password(PASSWORD, log2_n=4)  # cheap cost, the format is what's under test
+
+
+def test_verify_password_matches_only_the_hashed_password() -> None:
+    """The stored cost is used to verify, and a wrong password does not match."""
+    assert PASSWORD_HASH.startswith("scrypt$4$8$1$")
+    assert passwords.verify_password(PASSWORD, PASSWORD_HASH)
+    assert not passwords.verify_password("wrong", PASSWORD_HASH)
+
+
+@pytest.mark.parametrize(
+    "password_hash",
+    [
+        "",
+        "plaintext",
+        PASSWORD_HASH.replace("scrypt$", "bcrypt$", 1),
+        PASSWORD_HASH + "$extra",
+        PASSWORD_HASH.replace("$4$", "$x$", 1),
+        PASSWORD_HASH.replace("$4$", "$-1$", 1),
+        PASSWORD_HASH.replace("$4$", "$64$", 1),
+        PASSWORD_HASH.replace("$4$", "$30$", 1),
+        PASSWORD_HASH.replace("$8$", "$0$", 1),
+        PASSWORD_HASH.replace("$1$", "$99999999999999999999$", 1),
+        PASSWORD_HASH[:-4] + "!!!!",
+    ],
+)
+def test_verify_password_rejects_malformed_hashes(password_hash: str) -> None:
+    """Unknown algorithms, bad or out-of-range fields and undecodable salts or keys fail closed instead of raising."""
+    assert not passwords.verify_password(PASSWORD, password_hash)
+
+
+def test_hasher_rejects_verifications_beyond_max_pending(monkeypatch: MonkeyPatch) -> None:
+    """Once max_pending verifications are in flight, new ones raise PasswordHasherBusy until a slot frees up."""
+    release = threading.Event()
+
+    def blocked_verify(password: str, password_hash: str) -> bool:
+        release.wait(5)
+        return True
+
+    monkeypatch.setattr(passwords, "verify_password", blocked_verify)
+    hasher = passwords.PasswordHasher(max_workers=1, max_pending=2)
+    pending = [hasher._submit(PASSWORD, PASSWORD_HASH) for _ in range(2)]
+
+    with pytest.raises(passwords.PasswordHasherBusy):
+        hasher.verify(PASSWORD, PASSWORD_HASH)
+    assert (hasher.submitted, hasher.rejected) == (2, 1)
+
+    release.set()
+    assert all(future.result(5) for future in pending)
+    assert hasher.verify(PASSWORD, PASSWORD_HASH)
+
+
+def test_login_answers_503_while_the_hasher_is_busy(client: FlaskClient, monkeypatch: MonkeyPatch) -> None:
+    """/login turns back-pressure from the hashing pool into a retryable 503."""
+
+    def busy(password: str, password_hash: str) -> bool:
+        raise passwords.PasswordHasherBusy("too many logins in progress")
+
+    monkeypatch.setattr(flask_app.password_hasher, "verify", busy)
+
+    response = client.post("/login", json={"username": "test_user", "password": "x"})
+
+    assert response.status_code == 503
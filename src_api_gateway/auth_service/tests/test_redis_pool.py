@@ -0,0 +1,53 @@
+import config
+import fakeredis
+import redis
+from flask.testing import FlaskClient
+from pytest import MonkeyPatch
+
+
+def test_create_redis_client_uses_a_bounded_blocking_pool(monkeypatch: MonkeyPatch) -> None:
+    """Pool size, timeouts and keepalive come from the REDIS_* settings."""
+    monkeypatch.setenv("REDIS_HOST", "redis.internal")
+    monkeypatch.setenv("REDIS_PORT", "6380")
+    monkeypatch.setenv("REDIS_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("REDIS_POOL_TIMEOUT_SECONDS", "0.25")
+    monkeypatch.setenv("REDIS_SOCKET_TIMEOUT_SECONDS", "0.5")
+    monkeypatch.setenv("REDIS_SSL", "false")
+
+    pool = config.create_redis_client().connection_pool
+
+    assert isinstance(pool, redis.BlockingConnectionPool)
+    assert pool.max_connections == 7
+    assert pool.timeout == 0.25
+    assert pool.connection_class is redis.Connection
+    kwargs = pool.connection_kwargs
+    assert (kwargs["host"], kwargs["port"]) == ("redis.internal", 6380)
+    assert kwargs["socket_timeout"] == 0.5
+    assert kwargs["socket_keepalive"] is True
+    assert kwargs["retry"].get_retries() == config.REDIS_RETRIES
+
+
+def test_create_redis_client_connects_over_tls_when_configured(monkeypatch: MonkeyPatch) -> None:
+    """REDIS_SSL=true (ElastiCache in-transit encryption) switches the pool to SSL connections."""
+    monkeypatch.setenv("REDIS_SSL", "true")
+
+    assert config.create_redis_client().connection_pool.connection_class is redis.SSLConnection
+
+
+def test_ready_pings_redis(client: FlaskClient) -> None:
+    """/ready answers 200 with the PING latency while redis is reachable."""
+    response = client.get("/ready")
+
+    assert response.status_code == 200
+    assert response.json["status"] == "ready"  # type: ignore
+    assert response.json["redis_ping_ms"] >= 0  # type: ignore
+
+
+def test_ready_is_unavailable_without_redis(client: FlaskClient, redis_server: fakeredis.FakeServer) -> None:
+    """/ready answers 503 when redis cannot be reached, so the load balancer stops routing to the task."""
+    redis_server.connected = False
+
+    response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json["status"] == "unavailable"  # type: ignore
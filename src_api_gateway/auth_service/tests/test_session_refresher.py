@@ -0,0 +1,66 @@
+import json
+import time
+
+import app as flask_app
+import fakeredis
+from flask.testing import FlaskClient
+from session_refresher import SessionRefresher
+
+USER = json.dumps({"email": "u@x", "name": "Test", "source": "manual"})
+
+
+def test_flush_resets_the_ttl_of_every_scheduled_session_once(session_store: fakeredis.FakeRedis) -> None:
+    """Repeated schedules of a session are de-duplicated into one EXPIRE in the next flush."""
+    refresher = SessionRefresher(session_store, ttl=3600, flush_interval=3600)
+    session_store.set("session:a", USER, ex=10)
+    session_store.set("session:b", USER, ex=10)
+
+    for key in ("session:a", "session:a", "session:b"):
+        refresher.schedule(key)
+
+    assert refresher.flush() == 2
+    assert session_store.ttl("session:a") > 3500
+    assert session_store.ttl("session:b") > 3500
+    assert (refresher.scheduled, refresher.refreshed, refresher.flushes) == (2, 2, 1)
+    assert refresher.flush() == 0  # nothing left queued
+    assert refresher.flushes == 1
+
+
+def test_flush_does_not_revive_sessions_logged_out_meanwhile(session_store: fakeredis.FakeRedis) -> None:
+    """A session deleted between schedule and flush stays deleted and is not counted as refreshed."""
+    refresher = SessionRefresher(session_store, ttl=3600, flush_interval=3600)
+    session_store.set("session:a", USER, ex=10)
+    refresher.schedule("session:a")
+    session_store.delete("session:a")
+
+    assert refresher.flush() == 0
+    assert not session_store.exists("session:a")
+
+
+def test_background_thread_flushes_scheduled_sessions(session_store: fakeredis.FakeRedis) -> None:
+    """The flusher started by the first schedule refreshes the TTL without an explicit flush."""
+    refresher = SessionRefresher(session_store, ttl=3600, flush_interval=0.01)
+    session_store.set("session:a", USER, ex=10)
+    refresher.schedule("session:a")
+
+    deadline = time.monotonic() + 2
+    while refresher.refreshed == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert refresher.refreshed == 1
+    assert session_store.ttl("session:a") > 3500
+
+
+def test_verify_schedules_a_refresh_only_past_the_threshold(client: FlaskClient, session_store: fakeredis.FakeRedis) -> None:
+    """/verify queues sessions whose remaining TTL is below the threshold and leaves fresher ones alone."""
+    threshold = flask_app.config.SESSION_REFRESH_THRESHOLD_SECONDS
+    session_store.set("session:old", USER, ex=threshold - 10)
+    session_store.set("session:new", USER, ex=threshold + 10)
+
+    for session_id in ("new", "old"):
+        response = client.post("/verify", json={"session_id": session_id})
+        assert response.status_code == 200
+        assert response.json["user"]["email"] == "u@x"  # type: ignore
+
+    assert flask_app.session_refresher.scheduled == 1
+    assert flask_app.session_refresher.flush() == 1
+    assert session_store.ttl("session:old") > threshold
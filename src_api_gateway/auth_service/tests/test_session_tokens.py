@@ -0,0 +1,19 @@
+from pathlib import Path
+
+import pytest
+
+SERVICES_DIR = Path(__file__).resolve().parents[2]
+CANONICAL = SERVICES_DIR / "auth_service" / "session_tokens.py"
+COPIES = [
+    "web_service/session_tokens.py",
+    "order_service_fastapi/core/session_tokens.py",
+    "lambda_authorizer/session_tokens.py",
+]
+
+
+@pytest.mark.parametrize("copy", COPIES)
+def test_session_token_copies_match_auth_service(copy: str) -> None:
+    """Every service must verify tokens exactly as auth_service issues them - the copies may not drift."""
+    assert (SERVICES_DIR / copy).read_bytes() == CANONICAL.read_bytes(), (
+        f"{copy} differs from auth_service/session_tokens.py - copy the canonical module over it"
+    )
@@ -0,0 +1,145 @@
+import time
+from typing import Any, List
+
+import fakeredis
+import pytest
+import users
+from pytest import MonkeyPatch
+
+
+def user(username: str, email: str, name: str = "Test") -> users.User:
+    """Stored user with a placeholder password hash."""
+    return {"username": username, "email": email, "name": name, "password_hash": "scrypt$4$8$1$c2FsdA==$a2V5"}
+
+
+@pytest.fixture
+def commands(session_store: fakeredis.FakeRedis, monkeypatch: MonkeyPatch) -> List[str]:
+    """Names of the redis commands sent outside pipelines from now on."""
+    sent: List[str] = []
+    execute_command = session_store.execute_command
+
+    def record(*args: Any, **options: Any) -> Any:
+        sent.append(args[0])
+        return execute_command(*args, **options)
+
+    monkeypatch.setattr(session_store, "execute_command", record)
+    return sent
+
+
+@pytest.fixture
+def repository(session_store: fakeredis.FakeRedis) -> users.RedisUserRepository:
+    """RedisUserRepository on the fake session store."""
+    return users.RedisUserRepository(session_store, cache_size=2, cache_ttl=60)
+
+
+def test_users_are_found_by_username_or_email(repository: users.RedisUserRepository) -> None:
+    """add_users writes the user HASH and the email index; find accepts either login name."""
+    assert repository.add_users([user("alice", "alice@x"), user("bob", "bob@x")]) == 2
+
+    assert repository.get_by_username("alice") == user("alice", "alice@x")
+    assert repository.get_by_email("bob@x") == user("bob", "bob@x")
+    assert repository.find("alice@x") == repository.find("alice") == user("alice", "alice@x")
+    assert repository.find("carol") is None
+
+
+def test_changing_an_email_drops_the_old_index_entry(
+    repository: users.RedisUserRepository, session_store: fakeredis.FakeRedis
+) -> None:
+    """A user re-imported with a new email can no longer log in with the old one."""
+    repository.add_users([user("alice", "old@x")])
+    repository.add_users([user("alice", "new@x")])
+
+    assert repository.get_by_email("new@x") == user("alice", "new@x")
+    assert repository.get_by_email("old@x") is None
+    assert not session_store.exists(f"{users.USER_EMAIL_KEY_PREFIX}old@x")
+
+
+@pytest.mark.parametrize("batch_size", [1, 1000])
+def test_swapped_emails_keep_both_index_entries(repository: users.RedisUserRepository, batch_size: int) -> None:
+    """An email taken over by another user is not deleted when its previous owner moves on, in or across batches."""
+    repository.add_users([user("alice", "a@x"), user("bob", "b@x")])
+
+    repository.add_users([user("alice", "b@x"), user("bob", "a@x")], batch_size=batch_size)
+
+    assert repository.get_by_email("b@x") == user("alice", "b@x")
+    assert repository.get_by_email("a@x") == user("bob", "a@x")
+
+
+def test_lookups_are_cached_until_the_ttl_expires(
+    repository: users.RedisUserRepository, session_store: fakeredis.FakeRedis, monkeypatch: MonkeyPatch
+) -> None:
+    """Repeated lookups skip redis for cache_ttl seconds, so a deleted user is gone after at most that long."""
+    repository.add_users([user("alice", "alice@x")])
+    repository.get_by_username("alice")
+    session_store.delete(f"{users.USER_KEY_PREFIX}alice")
+
+    assert repository.get_by_username("alice") == user("alice", "alice@x")
+    assert (repository.cache_hits, repository.cache_misses) == (1, 1)
+
+    later = time.monotonic() + 61
+    monkeypatch.setattr(users.time, "monotonic", lambda: later)
+    assert repository.get_by_username("alice") is None
+
+
+def test_repeated_email_logins_skip_redis(session_store: fakeredis.FakeRedis, commands: List[str]) -> None:
+    """The username miss, the email index and the user HASH are all cached, so only the first find goes to redis."""
+    repository = users.RedisUserRepository(session_store)
+    repository.add_users([user("alice", "alice@x")])
+    commands.clear()
+
+    assert repository.find("alice@x") == user("alice", "alice@x")
+    assert commands == ["HGETALL", "GET", "HGETALL"]
+
+    commands.clear()
+    assert repository.find("alice@x") == user("alice", "alice@x")
+    assert commands == []
+
+
+def test_unknown_logins_are_cached_until_the_ttl_expires(
+    session_store: fakeredis.FakeRedis, commands: List[str], monkeypatch: MonkeyPatch
+) -> None:
+    """A miss is remembered for cache_ttl seconds, so a user created by another worker shows up after at most that."""
+    repository = users.RedisUserRepository(session_store, cache_ttl=60)
+    assert repository.find("carol@x") is None
+    users.RedisUserRepository(session_store).add_users([user("carol", "carol@x")])
+    commands.clear()
+
+    assert repository.find("carol@x") is None
+    assert commands == []
+
+    later = time.monotonic() + 61
+    monkeypatch.setattr(users.time, "monotonic", lambda: later)
+    assert repository.find("carol@x") == user("carol", "carol@x")
+
+
+def test_cache_evicts_least_recently_used_users(repository: users.RedisUserRepository) -> None:
+    """Past cache_size entries, the least recently used user is dropped first."""
+    repository.add_users([user("alice", "alice@x"), user("bob", "bob@x"), user("carol", "carol@x")])
+    for username in ("alice", "bob", "alice", "carol"):
+        repository.get_by_username(username)
+
+    assert repository.stats()["cache_size"] == 2
+    misses = repository.cache_misses
+    repository.get_by_username("alice")
+    repository.get_by_username("bob")  # evicted by carol
+    assert repository.cache_misses == misses + 1
+
+
+def test_add_users_invalidates_the_cache(repository: users.RedisUserRepository) -> None:
+    """A re-imported user (e.g. a new password hash) is read from redis on the next lookup."""
+    repository.add_users([user("alice", "alice@x", name="Old")])
+    repository.get_by_username("alice")
+
+    repository.add_users([user("alice", "alice@x", name="New")])
+
+    assert repository.get_by_username("alice")["name"] == "New"  # type: ignore
+
+
+def test_create_user_repository_selects_the_backend(session_store: fakeredis.FakeRedis) -> None:
+    """`memory` serves the demo users, `redis` needs a client, anything else is rejected."""
+    assert users.create_user_repository("memory").find("test_user") is not None
+    assert isinstance(users.create_user_repository("REDIS", session_store), users.RedisUserRepository)
+    with pytest.raises(ValueError):
+        users.create_user_repository("redis")
+    with pytest.raises(ValueError):
+        users.create_user_repository("ldap")
@@ -0,0 +1,47 @@
+import json
+
+import app as flask_app
+import fakeredis
+import session_tokens
+from flask.testing import FlaskClient
+from pytest import MonkeyPatch
+
+USER = {"email": "u@x", "name": "Test", "source": "manual"}
+
+
+def test_verify_batch_resolves_opaque_sessions_with_one_mget(client: FlaskClient, session_store: fakeredis.FakeRedis) -> None:
+    """Known sessions map to their user, unknown ones to null; duplicates and empty IDs are dropped."""
+    session_store.set("session:a", json.dumps(USER), ex=3600)
+
+    response = client.post("/verify/batch", json={"session_ids": ["a", "missing", "a", ""]})
+
+    assert response.status_code == 200
+    assert response.json == {"sessions": {"a": USER, "missing": None}}
+
+
+def test_verify_batch_verifies_signed_tokens_locally(
+    client: FlaskClient, session_store: fakeredis.FakeRedis, monkeypatch: MonkeyPatch
+) -> None:
+    """Signed tokens are checked with the codec and the revocation list, next to opaque IDs."""
+    codec = session_tokens.SessionTokenCodec(["test-secret"])
+    monkeypatch.setattr(flask_app, "token_codec", codec)
+    monkeypatch.setattr(flask_app, "token_revocations", session_tokens.RevocationFilter())
+    valid = codec.issue("s@x", "Signed", "google")
+    revoked = codec.issue("r@x", "Revoked", "google")
+    session_tokens.revoke(codec.verify(revoked), session_store)  # type: ignore
+
+    response = client.post("/verify/batch", json={"session_ids": [valid, revoked, f"{valid}x"]})
+
+    assert response.status_code == 200
+    assert response.json == {
+        "sessions": {valid: {"email": "s@x", "name": "Signed", "source": "google"}, revoked: None, f"{valid}x": None}
+    }
+
+
+def test_verify_batch_rejects_malformed_and_oversized_requests(client: FlaskClient, monkeypatch: MonkeyPatch) -> None:
+    """session_ids must be a list of strings of at most MAX_VERIFY_BATCH_SIZE entries."""
+    monkeypatch.setattr(flask_app.config, "MAX_VERIFY_BATCH_SIZE", 2)
+
+    for body in ({}, {"session_ids": "a"}, {"session_ids": ["a", 1]}, {"session_ids": ["a", "b", "c"]}):
+        assert client.post("/verify/batch", json=body).status_code == 400
+    assert client.post("/verify/batch", json={"session_ids": ["a", "b"]}).status_code == 200
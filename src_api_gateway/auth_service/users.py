@@ -0,0 +1,256 @@
+import csv
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+# * stored user shape: {"username": str, "email": str, "name": str, "password_hash": str (see passwords.py)}
+User = Dict[str, str]
+
+USER_KEY_PREFIX = "user:"  # HASH per user, keyed by username
+USER_EMAIL_KEY_PREFIX = "user_email:"  # email -> username index
+
+# * demo users for the in-memory repository - `python passwords.py` hashes a new password
+DEFAULT_USERS: List[User] = [
+    {
+        "username": "programmingwithalex3@gmail.com",
+        "email": "programmingwithalex3@gmail.com",
+        "name": "programmingwithalex3@gmail.com",
+        "password_hash": "scrypt$14$8$1$CUw+JEwI6/UEspC5FTGD7w==$/YIVHJGX5hCpAC8/BG+iaej2l+1rbtTqcZNncfN5Lqw=",
+    },
+    {
+        "username": "test_user",
+        "email": "test_user",
+        "name": "test_user",
+        "password_hash": "scrypt$14$8$1$OV+l5/ZNkYcd1SJYThpYDQ==$xtwi+r7admc2wvCPkME6F7MHbAYHNiTmDo4aJSO/W+c=",
+    },
+]
+
+
+class UserRepository(ABC):
+    """
+    user directory used by /login - lookups by username or email are O(1) in every backend
+    """
+
+    blocking_lookups = True  # lookups may do network I/O - async callers run them in a worker thread
+
+    @abstractmethod
+    def get_by_username(self, username: str) -> Optional[User]:
+        """
+        return the user with this username, None if there is none
+        """
+
+    @abstractmethod
+    def get_by_email(self, email: str) -> Optional[User]:
+        """
+        return the user with this email, None if there is none
+        """
+
+    @abstractmethod
+    def add_users(self, users: Iterable[User]) -> int:
+        """
+        insert or replace users, returns the number written
+        """
+
+    def find(self, login: str) -> Optional[User]:
+        """
+        user for a login name - a username or an email address
+        """
+        return self.get_by_username(login) or self.get_by_email(login)
+
+
+class InMemoryUserRepository(UserRepository):
+    """
+    users held in two dicts (by username and by email) - for local runs and small, static directories
+    """
+
+    blocking_lookups = False
+
+    def __init__(self, users: Iterable[User] = ()) -> None:
+        self.__by_username: Dict[str, User] = {}
+        self.__by_email: Dict[str, User] = {}
+        self.add_users(users)
+
+    def get_by_username(self, username: str) -> Optional[User]:
+        """
+        return the user with this username, None if there is none
+        """
+        return self.__by_username.get(username)
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        """
+        return the user with this email, None if there is none
+        """
+        return self.__by_email.get(email)
+
+    def add_users(self, users: Iterable[User]) -> int:
+        """
+        insert or replace users in both dicts, dropping the old email of a user whose email changed
+        """
+        count = 0
+        for user in users:
+            previous = self.__by_username.get(user["username"])
+            if previous is not None:
+                self.__by_email.pop(previous["email"], None)
+            self.__by_username[user["username"]] = user
+            self.__by_email[user["email"]] = user
+            count += 1
+        return count
+
+
+class RedisUserRepository(UserRepository):
+    """
+    users stored in redis - a HASH per username plus an email -> username index, so the directory can hold
+    hundreds of thousands of users without loading them into every worker
+
+    lookups by username and by email - found or not - are kept in a small per-process LRU cache for `cache_ttl`
+    seconds, so repeated logins skip redis (an email login would otherwise cost three round trips: the username
+    miss, the index and the HASH) - a changed password, new or deleted user is picked up after at most `cache_ttl`
+    seconds
+    """
+
+    def __init__(self, redis_client: Any, cache_size: int = 10000, cache_ttl: float = 60.0) -> None:
+        self.__redis = redis_client  # sync client with decode_responses=False (the session store)
+        self.__cache_size = cache_size
+        self.__cache_ttl = cache_ttl
+        # * redis key of the lookup (user:<username> or user_email:<email>) -> (user or None, monotonic expiry)
+        self.__cache: "OrderedDict[str, tuple[Optional[User], float]]" = OrderedDict()
+        self.__lock = threading.Lock()
+
+        # * metrics
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _cached(self, key: str) -> "tuple[bool, Optional[User]]":
+        """
+        return (True, cached user - None for a cached miss) if `key` is cached and not expired, else (False, None)
+        """
+        with self.__lock:
+            entry = self.__cache.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                self.__cache.pop(key, None)
+                self.cache_misses += 1
+                return False, None
+            self.__cache.move_to_end(key)
+            self.cache_hits += 1
+            return True, entry[0]
+
+    def _cache(self, key: str, user: Optional[User]) -> None:
+        """
+        cache the result of the `key` lookup for `cache_ttl` seconds, evicting the least recently used entries
+        """
+        with self.__lock:
+            self.__cache[key] = (user, time.monotonic() + self.__cache_ttl)
+            self.__cache.move_to_end(key)
+            while len(self.__cache) > self.__cache_size:
+                self.__cache.popitem(last=False)
+
+    def get_by_username(self, username: str) -> Optional[User]:
+        """
+        return the user with this username, None if there is none - one HGETALL unless cached
+        """
+        key = f"{USER_KEY_PREFIX}{username}"
+        found, user = self._cached(key)
+        if found:
+            return user
+        raw = self.__redis.hgetall(key)
+        user = {field.decode("utf-8"): value.decode("utf-8") for field, value in raw.items()} if raw else None
+        self._cache(key, user)
+        return user
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        """
+        return the user with this email, None if there is none - the index GET plus `get_by_username` unless cached
+        """
+        key = f"{USER_EMAIL_KEY_PREFIX}{email}"
+        found, user = self._cached(key)
+        if found:
+            return user
+        username = self.__redis.get(key)
+        user = self.get_by_username(username.decode("utf-8")) if username else None
+        self._cache(key, user)
+        return user
+
+    def add_users(self, users: Iterable[User], batch_size: int = 1000) -> int:
+        """
+        write users in pipelines of `batch_size` and clear this worker's cache - other workers catch up within
+        `cache_ttl` seconds
+        """
+        count = 0
+        batch: List[User] = []
+        for user in users:
+            batch.append(user)
+            if len(batch) == batch_size:
+                count += self._write_batch(batch)
+                batch = []
+        count += self._write_batch(batch)
+        with self.__lock:
+            self.__cache.clear()
+        return count
+
+    def _write_batch(self, batch: List[User]) -> int:
+        """
+        write `batch` in one pipeline, dropping the email index entries left behind by users whose email changed
+        (only while they still point to that user - another user may have taken the email since)
+        """
+        if not batch:
+            return 0
+        with self.__redis.pipeline(transaction=False) as pipe:
+            for user in batch:
+                pipe.hget(f"{USER_KEY_PREFIX}{user['username']}", "email")
+            previous_emails: List[Optional[bytes]] = pipe.execute()
+
+        stale = {  # previous email -> username
+            previous.decode("utf-8"): user["username"]
+            for user, previous in zip(batch, previous_emails)
+            if previous is not None and previous.decode("utf-8") != user["email"]
+        }
+        for user in batch:
+            stale.pop(user["email"], None)  # re-assigned in this batch
+        owners = self.__redis.mget([f"{USER_EMAIL_KEY_PREFIX}{email}" for email in stale]) if stale else []
+
+        with self.__redis.pipeline(transaction=False) as pipe:
+            for (email, username), owner in zip(stale.items(), owners):
+                if owner is not None and owner.decode("utf-8") == username:
+                    pipe.delete(f"{USER_EMAIL_KEY_PREFIX}{email}")
+            for user in batch:
+                pipe.hset(f"{USER_KEY_PREFIX}{user['username']}", mapping=user)
+                pipe.set(f"{USER_EMAIL_KEY_PREFIX}{user['email']}", user["username"])
+            pipe.execute()
+        return len(batch)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        return cache counters for this worker
+        """
+        return {"cache_hits": self.cache_hits, "cache_misses": self.cache_misses, "cache_size": len(self.__cache)}
+
+
+def create_user_repository(
+    backend: str, redis_client: Any = None, cache_size: int = 10000, cache_ttl: float = 60.0
+) -> UserRepository:
+    """
+    build the user repository selected by USER_REPOSITORY_BACKEND - `memory` (demo users) or `redis`
+    """
+    backend = backend.lower()
+    if backend == "memory":
+        return InMemoryUserRepository(DEFAULT_USERS)
+    if backend == "redis":
+        if redis_client is None:
+            raise ValueError("USER_REPOSITORY_BACKEND=redis requires a redis client")
+        return RedisUserRepository(redis_client, cache_size=cache_size, cache_ttl=cache_ttl)
+    raise ValueError(f"unknown USER_REPOSITORY_BACKEND: {backend}")
+
+
+if __name__ == "__main__":
+    # * python users.py import users.csv - bulk load a CSV with username,email,name,password_hash columns into redis
+    # * (REDIS_HOST / REDIS_PORT / REDIS_SSL as for the service)
+    import config
+
+    if len(sys.argv) != 3 or sys.argv[1] != "import":
+        sys.exit("usage: python users.py import <users.csv>")
+    with open(sys.argv[2], newline="", encoding="utf-8") as file:
+        imported = RedisUserRepository(config.create_redis_client()).add_users(csv.DictReader(file))
+    print(f"imported {imported} users")
@@ -1,52 +1,219 @@
+import json
+import logging
 import os
+import time
+from collections import OrderedDict
+from http.cookies import CookieError, SimpleCookie
+from typing import Optional
 
 import redis
+import session_tokens
 from werkzeug.exceptions import Unauthorized
 
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# * warm-container session cache - a logout/expiry is picked up after at most SESSION_CACHE_TTL seconds
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "10"))
+SESSION_CACHE_MAX_SIZE = int(os.getenv("SESSION_CACHE_MAX_SIZE", "1000"))
+
+# * token -> (principal, monotonic expiry), least recently used first; survives across warm invocations
+session_cache: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+
 # REDIS_HOST = "sandbox-alex-elasticache-redis-pvt-sbnt-m6dcul.serverless.use1.cache.amazonaws.com"
 # r = redis.Redis(host=REDIS_HOST, port=6379, decode_responses=False, )
-redis_connection = redis.Redis(
-    host=os.environ["REDIS_HOST"],
-    port=int(os.getenv("REDIS_PORT", "6379")),
-    # decode_responses=True,  # Redis responses returned as Python strings instead of raw bytes - for debugging
-    decode_responses=False,  # Redis responses returned as raw bytes - must be False if trying to read session data
-    socket_timeout=5,
-    ssl=True,  # must be enabled if connecting to Redis in AWS ElastiCache
+redis_connection: Optional[redis.Redis] = None  # created on first cache miss, reused by later invocations
+
+# * resources (relative to the API stage, `<HTTP method>/<path>`) allowed for any valid session - the policy must
+# * cover every route sharing the authorizer cache, as API Gateway reuses it for the session's later requests
+ALLOWED_RESOURCE_PATTERNS = [
+    pattern.strip().lstrip("/")
+    for pattern in os.getenv("ALLOWED_RESOURCE_PATTERNS", "*/orders,*/orders/*").split(",")
+    if pattern.strip()
+]
+
+SESSION_COOKIE_NAME = os.getenv("SESSION_COOKIE_NAME", "session_id")
+
+# * signed session tokens (auth_service SESSION_TOKEN_MODE=signed) are verified locally when SESSION_TOKEN_SECRETS is set
+token_codec = session_tokens.SessionTokenCodec.from_env()
+token_revocations = session_tokens.RevocationFilter(
+    refresh_interval=float(os.getenv("SESSION_TOKEN_REVOCATION_REFRESH_SECONDS", "5")),
+    max_token_ttl=int(os.getenv("SESSION_EXPIRE_TIME_SECONDS", "3600")),
 )
 
+invocations = 0  # invocations served by this container (1 == cold start)
+redis_connects = 0  # Redis clients created by this container
+
+
+def get_redis_connection() -> redis.Redis:
+    """Return the container's Redis client, creating it on first use."""
+    global redis_connection, redis_connects
+    if redis_connection is None:
+        redis_connection = redis.Redis(
+            host=os.environ["REDIS_HOST"],
+            port=int(os.getenv("REDIS_PORT", "6379")),
+            # decode_responses=True,  # Redis responses returned as Python strings instead of raw bytes - for debugging
+            decode_responses=False,  # Redis responses returned as raw bytes - must be False if trying to read session data
+            socket_timeout=5,
+            socket_connect_timeout=2,
+            socket_keepalive=True,
+            health_check_interval=30,  # PING idle connections before reuse - containers can sit frozen for minutes
+            retry_on_timeout=True,
+            ssl=True,  # must be enabled if connecting to Redis in AWS ElastiCache
+        )
+        redis_connects += 1
+    return redis_connection
+
+
+def get_cached_principal(token: str) -> Optional[str]:
+    """Return the cached principal for `token` if present and not expired."""
+    entry = session_cache.get(token)
+    if entry is None:
+        return None
+    principal, expires_at = entry
+    if expires_at <= time.monotonic():
+        del session_cache[token]
+        return None
+    session_cache.move_to_end(token)
+    return principal
+
+
+def cache_principal(token: str, principal: str, ttl: float) -> None:
+    """Cache `principal` for `token` for `ttl` seconds, evicting the least recently used entries."""
+    session_cache[token] = (principal, time.monotonic() + ttl)
+    session_cache.move_to_end(token)
+    while len(session_cache) > SESSION_CACHE_MAX_SIZE:
+        session_cache.popitem(last=False)
+
+
+def lookup_principal(token: str) -> Optional[str]:
+    """
+    Read the session's user and remaining lifetime from Redis in one round trip and cache a hit.
+
+    The cache entry never outlives the session key itself.
+    """
+    session_key = f"session:{token}"
+    with get_redis_connection().pipeline(transaction=False) as pipe:
+        pipe.get(session_key)
+        pipe.pttl(session_key)
+        user, pttl = pipe.execute()
+
+    if not user:
+        session_cache.pop(token, None)
+        return None
+
+    principal = user.decode("utf-8")
+    ttl = SESSION_CACHE_TTL if pttl is None or pttl < 0 else min(SESSION_CACHE_TTL, pttl / 1000)
+    if ttl > 0:
+        cache_principal(token, principal, ttl)
+    return principal
+
+
+def verify_signed_token(token: str) -> Optional[str]:
+    """
+    Verify a signed session token locally; Redis is only read to refresh the revocation filter or on a filter hit.
+
+    Returns the principal in the same form as Redis-backed sessions (the user JSON).
+    """
+    claims = token_codec.verify(token) if token_codec is not None else None
+    if claims is None or session_tokens.is_revoked(claims, token_revocations, get_redis_connection()):
+        return None
+    return json.dumps(session_tokens.user_from_claims(claims))
+
+
+def build_policy(principal: str, method_arn: str) -> dict:
+    """
+    Build an Allow policy covering `ALLOWED_RESOURCE_PATTERNS` on the stage of `method_arn`.
+
+    methodArn: arn:aws:execute-api:{region}:{account}:{api_id}/{stage}/{http_method}/{resource_path}
+    The principal and context depend only on the session, so a cached result is valid for every allowed route.
+    """
+    arn_prefix, _, api_path = method_arn.partition("/")
+    stage = api_path.split("/", 1)[0]
+    if stage:
+        resources = [f"{arn_prefix}/{stage}/{pattern}" for pattern in ALLOWED_RESOURCE_PATTERNS]
+    else:
+        resources = [method_arn]  # unexpected ARN format - fall back to the invoked method only
+
+    return {
+        "principalId": principal,
+        "policyDocument": {
+            "Version": "2012-10-17",
+            "Statement": [
+                {
+                    "Action": "execute-api:Invoke",
+                    "Effect": "Allow",
+                    "Resource": resources,
+                }
+            ],
+        },
+        "context": {"user": principal},
+    }
+
+
+def get_session_cookie(event: dict) -> str:
+    """Return the session cookie from a REQUEST authorizer event (REST `headers` or HTTP API `cookies`)."""
+    cookies = event.get("cookies") or []  # HTTP API payload v2: ["session_id=...", ...]
+    headers = event.get("headers") or {}
+    cookie_header = "; ".join(cookies) or next((v for k, v in headers.items() if k.lower() == "cookie"), "")
+    try:
+        morsel = SimpleCookie(cookie_header).get(SESSION_COOKIE_NAME)
+    except CookieError:
+        return ""
+    return morsel.value if morsel else ""
+
+
+def get_token(event: dict) -> str:
+    """
+    Return the session ID the request was made with.
+
+    - TOKEN authorizer: `authorizationToken` (`Bearer <session_id>`)
+    - REQUEST authorizer: the `session_id` cookie; configure `method.request.header.Cookie` (REST API) or
+      `$request.header.Cookie` (HTTP API) as identity source so API Gateway caches results per session
+    """
+    if event.get("type") == "REQUEST":
+        return get_session_cookie(event)
+    return event.get("authorizationToken", "").replace("Bearer ", "")
+
 
 def lambda_handler(event: dict = {}, context: dict = {}) -> dict:
     """AWS Lambda function to authorize API Gateway requests using Redis session data"""
-    print(f"event: {event}")
-    print(f"context: {context}")
-    token = event.get("authorizationToken", "").replace("Bearer ", "")
-    print(f"Auth token: {token}")
+    global invocations
+    invocations += 1
+    started = time.perf_counter()
+    token = get_token(event)
 
     if not token:
-        raise Unauthorized("Missing authorizationToken")
+        raise Unauthorized("Missing session token")
 
-    session_key = f"session:{token}"
-    print(f"session_key: {session_key}")
-    user = redis_connection.get(session_key)
-
-    if user:
-        user_str = user.decode("utf-8")  # type: ignore
-        print(f"user: {user_str}")
-
-        return {
-            "principalId": user_str,
-            "policyDocument": {
-                "Version": "2012-10-17",
-                "Statement": [
-                    {
-                        "Action": "execute-api:Invoke",
-                        "Effect": "Allow",
-                        "Resource": event["methodArn"],
-                    }
-                ],
-            },
-            "context": {"user": user_str},
-        }
+    redis_ms = None
+    signed = token_codec is not None and session_tokens.is_signed_token(token)
+    user_str = verify_signed_token(token) if signed else get_cached_principal(token)
+    cache_hit = signed or user_str is not None
+    if not cache_hit:
+        redis_started = time.perf_counter()
+        user_str = lookup_principal(token)
+        redis_ms = round((time.perf_counter() - redis_started) * 1000, 2)
+
+    logger.info(
+        json.dumps(
+            {
+                "message": "authorize",
+                "mode": event.get("type", "TOKEN"),
+                "cache": "signed" if signed else ("hit" if cache_hit else "miss"),
+                "authorized": user_str is not None,
+                "redis_ms": redis_ms,
+                "total_ms": round((time.perf_counter() - started) * 1000, 2),
+                "cold_start": invocations == 1,
+                "container_invocations": invocations,
+                "redis_connects": redis_connects,
+                "cache_size": len(session_cache),
+            }
+        )
+    )
+
+    if user_str:
+        return build_policy(user_str, event["methodArn"])
 
     raise Unauthorized("User not found for session_key")
 
@@ -0,0 +1,26 @@
+from typing import Any
+
+import fakeredis
+import pytest
+from pytest import MonkeyPatch
+
+
+@pytest.fixture
+def redis_client(monkeypatch: MonkeyPatch) -> fakeredis.FakeRedis:
+    """Fake session redis used by lambda_function, with an empty warm-container cache."""
+    import lambda_function  # type: ignore
+
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(lambda_function, "redis_connection", client)
+    lambda_function.session_cache.clear()
+    return client
+
+
+@pytest.fixture
+def token_event() -> dict[str, Any]:
+    """TOKEN authorizer event for session `abc` on GET /orders."""
+    return {
+        "type": "TOKEN",
+        "authorizationToken": "Bearer abc",
+        "methodArn": "arn:aws:execute-api:us-east-1:123456789012:api123/dev/GET/orders",
+    }
@@ -0,0 +1,146 @@
+import json
+import time
+from typing import Any
+
+import fakeredis
+import lambda_function  # type: ignore
+import pytest
+from pytest import MonkeyPatch
+from werkzeug.exceptions import Unauthorized
+
+USER = json.dumps({"email": "u@x", "name": "Test"})
+
+
+def test_cache_miss_reads_redis_then_hits_serve_warm_invocations(
+    redis_client: fakeredis.FakeRedis, token_event: dict[str, Any]
+) -> None:
+    """The first invocation reads the session from redis; later ones are answered from the container cache."""
+    redis_client.set("session:abc", USER, ex=3600)
+
+    assert lambda_function.lambda_handler(token_event)["principalId"] == USER
+    assert "abc" in lambda_function.session_cache
+
+    redis_client.delete("session:abc")  # a hit must not go back to redis
+    assert lambda_function.lambda_handler(token_event)["principalId"] == USER
+
+
+def test_cached_session_expires_and_is_checked_again(
+    redis_client: fakeredis.FakeRedis, token_event: dict[str, Any], monkeypatch: MonkeyPatch
+) -> None:
+    """After SESSION_CACHE_TTL the session is read from redis again, so a logout is honored."""
+    redis_client.set("session:abc", USER, ex=3600)
+    lambda_function.lambda_handler(token_event)
+
+    redis_client.delete("session:abc")  # logout
+    later = time.monotonic() + lambda_function.SESSION_CACHE_TTL + 1
+    monkeypatch.setattr(lambda_function.time, "monotonic", lambda: later)
+    with pytest.raises(Unauthorized):
+        lambda_function.lambda_handler(token_event)
+    assert "abc" not in lambda_function.session_cache
+
+
+def test_cache_entry_never_outlives_the_session_key(redis_client: fakeredis.FakeRedis) -> None:
+    """A session about to expire is cached only for its remaining lifetime."""
+    redis_client.set("session:abc", USER, px=2000)
+
+    assert lambda_function.lookup_principal("abc") == USER
+    _, expires_at = lambda_function.session_cache["abc"]
+    assert expires_at - time.monotonic() <= 2
+
+
+def test_unknown_sessions_are_rejected_and_not_cached(redis_client: fakeredis.FakeRedis, token_event: dict[str, Any]) -> None:
+    """A session missing from redis raises Unauthorized and leaves nothing in the cache."""
+    with pytest.raises(Unauthorized):
+        lambda_function.lambda_handler(token_event)
+    assert len(lambda_function.session_cache) == 0
+
+
+def test_cache_evicts_least_recently_used_sessions(monkeypatch: MonkeyPatch) -> None:
+    """Past SESSION_CACHE_MAX_SIZE entries, the least recently used session is dropped first."""
+    monkeypatch.setattr(lambda_function, "SESSION_CACHE_MAX_SIZE", 2)
+    lambda_function.session_cache.clear()
+
+    lambda_function.cache_principal("a", "user-a", 60)
+    lambda_function.cache_principal("b", "user-b", 60)
+    assert lambda_function.get_cached_principal("a") == "user-a"  # `b` is now least recently used
+    lambda_function.cache_principal("c", "user-c", 60)
+
+    assert list(lambda_function.session_cache) == ["a", "c"]
+
+
+def test_policy_allows_the_configured_patterns_on_the_invoked_stage(monkeypatch: MonkeyPatch) -> None:
+    """Resources are ALLOWED_RESOURCE_PATTERNS under the stage of methodArn, so one cached result covers every route."""
+    monkeypatch.setattr(lambda_function, "ALLOWED_RESOURCE_PATTERNS", ["*/orders", "*/orders/*", "GET/health"])
+
+    policy = lambda_function.build_policy(USER, "arn:aws:execute-api:us-east-1:123456789012:api123/dev/PUT/orders/order-1")
+
+    assert policy["principalId"] == USER
+    assert policy["context"] == {"user": USER}
+    statement = policy["policyDocument"]["Statement"][0]
+    assert statement["Effect"] == "Allow"
+    assert statement["Resource"] == [
+        "arn:aws:execute-api:us-east-1:123456789012:api123/dev/*/orders",
+        "arn:aws:execute-api:us-east-1:123456789012:api123/dev/*/orders/*",
+        "arn:aws:execute-api:us-east-1:123456789012:api123/dev/GET/health",
+    ]
+
+
+def test_policy_falls_back_to_the_invoked_method_for_unexpected_arns() -> None:
+    """Without a stage in methodArn the policy only allows the invoked method."""
+    method_arn = "arn:aws:execute-api:us-east-1:123456789012:api123"
+    assert lambda_function.build_policy(USER, method_arn)["policyDocument"]["Statement"][0]["Resource"] == [method_arn]
+
+
+def test_default_patterns_cover_order_routes() -> None:
+    """By default every order route of the stage is allowed, and nothing else."""
+    assert lambda_function.ALLOWED_RESOURCE_PATTERNS == ["*/orders", "*/orders/*"]
+
+
+def request_event(**fields: Any) -> dict[str, Any]:
+    """REQUEST authorizer event with the given `headers` / `cookies`."""
+    return {"type": "REQUEST", "methodArn": "arn:aws:execute-api:us-east-1:123456789012:api123/dev/GET/orders", **fields}
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {"headers": {"Cookie": "theme=dark; session_id=abc"}},  # REST API
+        {"headers": {"cookie": "session_id=abc"}},  # HTTP API lower-cases header names
+        {"cookies": ["theme=dark", "session_id=abc"], "headers": {}},  # HTTP API payload v2
+    ],
+)
+def test_request_mode_reads_the_session_cookie(redis_client: fakeredis.FakeRedis, fields: dict[str, Any]) -> None:
+    """REQUEST events are authorized by the session cookie, from the Cookie header or the v2 `cookies` list."""
+    redis_client.set("session:abc", USER, ex=3600)
+    assert lambda_function.lambda_handler(request_event(**fields))["principalId"] == USER
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {},
+        {"headers": None, "cookies": None},
+        {"headers": {"Cookie": "theme=dark"}},
+        {"headers": {"Cookie": "session_id="}},
+        {"headers": {"Cookie": "session_id"}},
+        {"headers": {"Cookie": '"session_id=abc'}},
+        {"headers": {"Cookie": "\x00\x01;;=="}},
+    ],
+)
+def test_request_mode_rejects_missing_or_malformed_cookies(redis_client: fakeredis.FakeRedis, fields: dict[str, Any]) -> None:
+    """Without a usable session cookie the request is rejected before redis is read."""
+    redis_client.set("session:abc", USER, ex=3600)
+    with pytest.raises(Unauthorized, match="Missing session token"):
+        lambda_function.lambda_handler(request_event(**fields))
+
+
+@pytest.mark.parametrize("token", ["v1.abc.é", "v1.é.x", "v1."])
+def test_malformed_signed_tokens_are_unauthorized(
+    redis_client: fakeredis.FakeRedis, token_event: dict[str, Any], monkeypatch: MonkeyPatch, token: str
+) -> None:
+    """Malformed or non-ASCII signed tokens are rejected as Unauthorized instead of crashing the authorizer."""
+    import session_tokens  # type: ignore
+
+    monkeypatch.setattr(lambda_function, "token_codec", session_tokens.SessionTokenCodec(["test-secret"]))
+    with pytest.raises(Unauthorized):
+        lambda_function.lambda_handler({**token_event, "authorizationToken": f"Bearer {token}"})
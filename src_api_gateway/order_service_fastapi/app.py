@@ -1,16 +1,19 @@
 import uvicorn
 from core.config import get_settings
+from core.lifespan import lifespan
 from core.logging_config import setup_logging
 from fastapi import FastAPI
 from middleware.cors import configure_cors
 from routers.health import router as health_router
+from routers.metrics import router as metrics_router
 from routers.orders import router as orders_router
+from routers.sessions import router as sessions_router
 
 setup_logging()  # will setup logging across all files in the app - just need to import logging
 
 settings = get_settings()  # load config settings from .env
 
-app: FastAPI = FastAPI(title="OrderService", debug=settings.debug)
+app: FastAPI = FastAPI(title="OrderService", debug=settings.debug, lifespan=lifespan)
 
 # * attach middleware
 # configure_cors(app, settings.cors_origins)  # if passing in list of allowed origins for making requests to API
@@ -18,7 +21,9 @@ configure_cors(app)
 
 # * include routers
 app.include_router(health_router)
+app.include_router(metrics_router)
 app.include_router(orders_router, prefix="/orders", tags=["orders"])
+app.include_router(sessions_router, prefix="/sessions", tags=["sessions"])
 
 
 if __name__ == "__main__":
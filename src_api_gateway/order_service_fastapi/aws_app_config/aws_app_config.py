@@ -1,15 +1,27 @@
+import asyncio
 import json
 import logging
 import time
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 import boto3
+from aws_app_config.flag_providers import FlagProvider, parse_flags
 
 logging.basicConfig(level=logging.INFO)
 
+RETRY_INTERVAL_SECONDS = 5  # poll interval after a failed refresh, until AppConfig answers again
 
-class AWSAppConfig:
-    """AWS AppConfig client with caching."""
+
+class AWSAppConfig(FlagProvider):
+    """
+    AWS AppConfig client with caching.
+
+    Once `start()` has been awaited (from `core.lifespan`), a background task polls AppConfig no more often than
+    `NextPollIntervalInSeconds` allows and swaps in a new immutable flags snapshot when the configuration changes.
+    `get_flags()` then only returns the current snapshot - the last good flags keep being served while a refresh
+    is in flight or failing (stale-while-revalidate). Without the poller it falls back to fetching on TTL expiry.
+    """
 
     def __init__(self, app_id: str, env_id: str, config_profile_id: str, ttl: int = 60):
         """
@@ -17,18 +29,24 @@ class AWSAppConfig:
         :param app_id: AWS AppConfig Application ID.
         :param env_id: AWS AppConfig Environment ID.
         :param config_profile_id: AWS AppConfig Configuration Profile ID.
-        :param ttl: Time-to-live for cache in seconds.
+        :param ttl: Time-to-live for cache in seconds (minimum poll interval of the background refresher).
         """
         self.app_id = app_id
         self.env_id = env_id
         self.config_profile_id = config_profile_id
         self.ttl = ttl
-        self.last_fetched = 0
+        self.last_fetched = 0.0
         self.client = boto3.client("appconfigdata")  # type: ignore
-        self.configuration_token = None
+        self.configuration_token: Optional[str] = None
+        self.next_poll_interval = ttl
+        self.__poller: asyncio.Task | None = None
 
-        # * {'api_gateway_authorizer_ecs_auth_service': {'enabled': False}, '...': {'enabled': True}, ...}
-        self.flags: Dict[str, Dict[str, bool]] = {}
+        # * {'api_gateway_authorizer_ecs_auth_service': False, '...': True, ...} - replaced, never mutated
+        self.flags: Mapping[str, bool] = MappingProxyType({})
+
+        # * metrics
+        self.refreshes = 0
+        self.refresh_errors = 0
 
     def _start_configuration_session(self) -> Optional[str]:
         """
@@ -39,6 +57,7 @@ class AWSAppConfig:
             ApplicationIdentifier=self.app_id,
             EnvironmentIdentifier=self.env_id,
             ConfigurationProfileIdentifier=self.config_profile_id,
+            RequiredMinimumPollIntervalInSeconds=max(15, self.ttl),  # AppConfig rejects intervals below 15s
         )
         self.configuration_token = response.get("InitialConfigurationToken")
         return self.configuration_token
@@ -47,37 +66,88 @@ class AWSAppConfig:
         """
         Uses the configuration token to fetch the latest configuration.
         Updates the internal cache if new configuration is retrieved.
+
+        AppConfig returns an empty body when nothing changed since the previous token, so the current
+        snapshot is kept as is. Every response carries the token and minimum interval for the next poll.
         """
         # Ensure we have a valid token
         if not self.configuration_token:
             self._start_configuration_session()
 
-        print("Fetching latest AppConfig configuration")
-        response = self.client.get_latest_configuration(ConfigurationToken=self.configuration_token)
+        try:
+            response = self.client.get_latest_configuration(ConfigurationToken=self.configuration_token)
+        except Exception:
+            self.configuration_token = None  # token may have expired (24h) - start a new session next time
+            raise
+
+        self.configuration_token = response.get("NextPollConfigurationToken")
+        self.next_poll_interval = response.get("NextPollIntervalInSeconds", self.ttl)
+        self.last_fetched = time.time()
+        self.refreshes += 1
 
         # 'Configuration' is a streaming body that needs to be read.
         config_data = response.get("Configuration").read()
         if config_data:
             try:
-                # * {'api_gateway_authorizer_ecs_auth_service': {'enabled': False}, '...': {'enabled': True}, ...}
-                config_json = json.loads(config_data)
-
-                # * {'api_gateway_authorizer_ecs_auth_service': False, '...': True, ...}
-                self.flags = {k: v["enabled"] for k, v in config_json.items()}
-
-                self.last_fetched = time.time()  # type: ignore
-                # print("AppConfig configuration updated: %s", self.flags)
+                self.flags = parse_flags(config_data)
+                logging.info("AppConfig configuration updated: %s", dict(self.flags))
             except json.JSONDecodeError as e:
                 logging.error("Error decoding AppConfig configuration: %s", e)
-        else:
-            # print("No new configuration data received.")
+
+    async def start(self) -> None:
+        """
+        Load the initial flags and start the background poller.
+
+        A failed initial load is logged rather than raised; the poller keeps retrying and flags stay empty until then.
+        """
+        if self.__poller is not None:
+            return
+        try:
+            await asyncio.to_thread(self._fetch_configuration)
+        except Exception as e:
+            self.refresh_errors += 1
+            logging.error("Initial AppConfig fetch failed: %s", e)
+        self.__poller = asyncio.create_task(self._run_poller(), name="aws-app-config-poller")
+
+    async def stop(self) -> None:
+        """Stop the background poller."""
+        if self.__poller is None:
+            return
+        self.__poller.cancel()
+        try:
+            await self.__poller
+        except asyncio.CancelledError:
             pass
+        self.__poller = None
 
-    def get_flags(self) -> dict:
+    async def _run_poller(self) -> None:
+        """Poll AppConfig every max(`ttl`, `NextPollIntervalInSeconds`), backing off to a short retry after errors."""
+        delay = max(self.ttl, self.next_poll_interval) if self.refresh_errors == 0 else RETRY_INTERVAL_SECONDS
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await asyncio.to_thread(self._fetch_configuration)
+                delay = max(self.ttl, self.next_poll_interval)
+            except Exception as e:
+                self.refresh_errors += 1
+                logging.warning("AppConfig refresh failed, serving last known flags: %s", e)
+                delay = RETRY_INTERVAL_SECONDS
+
+    def get_flags(self) -> Mapping[str, bool]:
         """
         Returns the cached feature flags, fetching from AppConfig if needed.
+
+        With the background poller running this never does I/O.
         """
-        current_time = time.time()
-        if (current_time - self.last_fetched) > self.ttl:
+        if self.__poller is None and (time.time() - self.last_fetched) > self.ttl:
             self._fetch_configuration()
         return self.flags
+
+    def stats(self) -> dict[str, int | float]:
+        """Return refresh counters and the age of the current flags snapshot."""
+        return {
+            "flags": len(self.flags),
+            "age_seconds": round(time.time() - self.last_fetched, 1) if self.last_fetched else -1,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
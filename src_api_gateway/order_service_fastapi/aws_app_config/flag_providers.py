@@ -0,0 +1,198 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from core.config import Settings
+
+logging.basicConfig(level=logging.INFO)
+
+
+def parse_flags(config_data: bytes) -> Mapping[str, bool]:
+    """
+    Turn an AppConfig feature-flag document into a read-only flags snapshot.
+
+    {'api_gateway_authorizer_ecs_auth_service': {'enabled': False}, ...}
+    -> {'api_gateway_authorizer_ecs_auth_service': False, ...}
+    """
+    config_json = json.loads(config_data)
+    return MappingProxyType({k: v["enabled"] for k, v in config_json.items()})
+
+
+class FlagProvider(ABC):
+    """Source of feature flags. `get_flags()` is called on the request path and must be cheap."""
+
+    @abstractmethod
+    def get_flags(self) -> Mapping[str, bool]:
+        """Return the current flags snapshot."""
+
+    async def start(self) -> None:
+        """Start background refreshing, if the provider needs it."""
+
+    async def stop(self) -> None:
+        """Stop background refreshing."""
+
+    @abstractmethod
+    def stats(self) -> dict[str, int | float]:
+        """Return refresh counters and the age of the current snapshot."""
+
+
+class LocalFlagProvider(FlagProvider):
+    """
+    Flag provider backed by a local source, re-read every `poll_interval` seconds by a background task.
+
+    Subclasses implement `_load()`, returning the raw document or None when it has not changed.
+    The parsed flags are kept as an immutable in-memory snapshot, so reads never do I/O once started.
+    """
+
+    def __init__(self, poll_interval: float) -> None:
+        self.poll_interval = poll_interval
+        self.last_fetched = 0.0
+        self.flags: Mapping[str, bool] = MappingProxyType({})
+        self.__poller: asyncio.Task | None = None
+
+        # * metrics
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    @abstractmethod
+    def _load(self) -> Optional[bytes]:
+        """Read the raw flags document; None if unchanged since the last read."""
+
+    def _refresh(self) -> None:
+        """Reload and swap the snapshot if the source changed. Keeps the last good flags on errors."""
+        try:
+            config_data = self._load()
+            if config_data is not None:
+                self.flags = parse_flags(config_data)
+                logging.info("Feature flags updated: %s", dict(self.flags))
+            self.refreshes += 1
+        except Exception as e:
+            self.refresh_errors += 1
+            logging.warning("Feature flags refresh failed, serving last known flags: %s", e)
+        self.last_fetched = time.time()
+
+    async def start(self) -> None:
+        """Load the initial flags and start the background poller."""
+        if self.__poller is None:
+            await asyncio.to_thread(self._refresh)
+            self.__poller = asyncio.create_task(self._run_poller(), name=f"{type(self).__name__}-poller")
+
+    async def stop(self) -> None:
+        """Stop the background poller."""
+        if self.__poller is None:
+            return
+        self.__poller.cancel()
+        try:
+            await self.__poller
+        except asyncio.CancelledError:
+            pass
+        self.__poller = None
+
+    async def _run_poller(self) -> None:
+        """Re-read the source every `poll_interval` seconds."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            await asyncio.to_thread(self._refresh)
+
+    def get_flags(self) -> Mapping[str, bool]:
+        """Return the current snapshot (re-reading the source on expiry if the poller is not running)."""
+        if self.__poller is None and (time.time() - self.last_fetched) > self.poll_interval:
+            self._refresh()
+        return self.flags
+
+    def stats(self) -> dict[str, int | float]:
+        """Return refresh counters and the age of the current snapshot."""
+        return {
+            "flags": len(self.flags),
+            "age_seconds": round(time.time() - self.last_fetched, 1) if self.last_fetched else -1,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
+
+
+class FileFlagProvider(LocalFlagProvider):
+    """Flags read from a JSON file in AppConfig feature-flag format, reloaded when its mtime or size changes."""
+
+    def __init__(self, path: str, poll_interval: float = 1.0) -> None:
+        super().__init__(poll_interval)
+        self.path = path
+        self.__signature: tuple[int, int] | None = None
+
+    def _load(self) -> Optional[bytes]:
+        """Read the file if it changed since the last read."""
+        stat = os.stat(self.path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self.__signature:
+            return None
+        with open(self.path, "rb") as f:
+            config_data = f.read()
+        self.__signature = signature
+        return config_data
+
+
+class AgentFlagProvider(LocalFlagProvider):
+    """
+    Flags served by the AWS AppConfig agent (ECS sidecar / Lambda extension) on localhost.
+
+    The agent polls AppConfig itself and caches the configuration, so each read here is a loopback call.
+    """
+
+    def __init__(
+        self,
+        agent_url: str,
+        app_id: str,
+        env_id: str,
+        config_profile_id: str,
+        poll_interval: float = 1.0,
+        timeout: float = 1.0,
+    ) -> None:
+        super().__init__(poll_interval)
+        self.url = f"{agent_url.rstrip('/')}/applications/{app_id}/environments/{env_id}/configurations/{config_profile_id}"
+        self.timeout = timeout
+        self.__last_config: bytes | None = None
+
+    def _load(self) -> Optional[bytes]:
+        """Fetch the configuration from the agent; None if identical to the previous response."""
+        with urllib.request.urlopen(self.url, timeout=self.timeout) as response:  # nosec B310 - fixed localhost URL
+            config_data = response.read()
+        if config_data == self.__last_config:
+            return None
+        self.__last_config = config_data
+        return config_data
+
+
+def create_flag_provider(settings: Settings) -> FlagProvider:
+    """
+    Build the flag provider selected by `aws_app_config_provider`.
+
+    - `appconfigdata`: poll the AppConfig data API directly (default)
+    - `agent`: read from the AppConfig agent on localhost
+    - `file`: read a local JSON file (offline development and tests)
+    """
+    provider = settings.aws_app_config_provider.lower()
+    if provider == "file":
+        return FileFlagProvider(settings.aws_app_config_flags_file, settings.aws_app_config_local_poll_interval)
+    if provider == "agent":
+        return AgentFlagProvider(
+            settings.aws_app_config_agent_url,
+            settings.aws_app_config_app_id,
+            settings.aws_app_config_env_id,
+            settings.aws_app_config_config_profile_id,
+            settings.aws_app_config_local_poll_interval,
+        )
+    if provider == "appconfigdata":
+        from aws_app_config.aws_app_config import AWSAppConfig
+
+        return AWSAppConfig(
+            app_id=settings.aws_app_config_app_id,
+            env_id=settings.aws_app_config_env_id,
+            config_profile_id=settings.aws_app_config_config_profile_id,
+            ttl=settings.aws_app_config_cache_ttl,
+        )
+    raise ValueError(f"Unknown AWS_APP_CONFIG_PROVIDER: {settings.aws_app_config_provider!r}")
@@ -1,5 +1,11 @@
-import requests
+import asyncio
+import logging
+
+import httpx
 from core.config import get_settings
+from core.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)  # pulling logging config from the main app.py file
 
 
 class AuthClient:
@@ -7,7 +13,76 @@ class AuthClient:
 
     def __init__(self) -> None:
         settings = get_settings()
-        self.__auth_service_url = settings.auth_service_url
+        self.__auth_service_url = str(settings.auth_service_url).rstrip("/")
+        self.__limits = httpx.Limits(
+            max_connections=settings.auth_client_max_connections,  # client only talks to auth_service, so per-host limit
+            max_keepalive_connections=settings.auth_client_max_keepalive_connections,
+            keepalive_expiry=settings.auth_client_keepalive_expiry,
+        )
+        self.__timeout = httpx.Timeout(
+            settings.auth_client_timeout,
+            connect=settings.auth_client_connect_timeout,
+            pool=settings.auth_client_pool_timeout,  # max wait for a free pooled connection
+        )
+        self.__verify_batch_max_size = settings.auth_client_verify_batch_max_size
+        self.__client: httpx.AsyncClient | None = None
+        # * concurrent verifications of the same session_id share one upstream /verify call
+        self.verify_flight: SingleFlight[str, str | None] = SingleFlight()
+
+    async def start(self) -> None:
+        """Create the shared keep-alive connection pool. Called once from `core.lifespan`."""
+        if self.__client is None:
+            self.__client = httpx.AsyncClient(
+                base_url=self.__auth_service_url,
+                limits=self.__limits,
+                timeout=self.__timeout,
+                headers={"Content-Type": "application/json"},
+            )
+            logger.info("AuthClient connection pool started", extra={"auth_service_url": self.__auth_service_url})
+
+    async def close(self) -> None:
+        """Close the shared connection pool. Called once from `core.lifespan` on shutdown."""
+        if self.__client is not None:
+            await self.__client.aclose()
+            self.__client = None
+            logger.info("AuthClient connection pool closed")
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled client, lazily starting it if the lifespan hook has not run (e.g. in tests)."""
+        if self.__client is None:
+            await self.start()
+        return self.__client  # type: ignore
+
+    async def fetch_session_user(self, session_id: str) -> str | None:
+        """
+        Ask the authentication service who owns `session_id`.
+
+        Concurrent calls for the same `session_id` are coalesced into a single upstream request.
+        Unlike `verify_session`, transport errors are raised so callers can tell
+        "auth_service rejected the session" apart from "auth_service unreachable".
+
+        Args:
+            session_id (str): Session ID retrieved from cookies.
+
+        Raises:
+            httpx.HTTPError: If the request to auth_service fails or it answers with a 5xx.
+
+        Returns:
+            Optional[str]: User ID (email) if session is valid, None otherwise.
+        """
+        return await self.verify_flight.do(session_id, lambda: self._post_verify(session_id))
+
+    async def _post_verify(self, session_id: str) -> str | None:
+        """Issue the actual `/verify` call to auth_service (see `fetch_session_user`)."""
+        client = await self._get_client()
+        headers = {"Authorization": f"Bearer {session_id}"}
+        response = await client.post("/verify", json={"session_id": session_id}, headers=headers)
+
+        if response.status_code == 200:
+            return response.json().get("user", {}).get("email")
+        if response.status_code >= 500:
+            response.raise_for_status()  # auth_service failure, not a verdict on the session
+        return None
 
     async def verify_session(self, session_id: str | None) -> str | None:
         """
@@ -22,13 +97,62 @@ class AuthClient:
         if not session_id:
             return None
         try:
-            headers = {"Authorization": f"Bearer {session_id}", "Content-Type": "application/json"}
-            response = requests.post(
-                f"{self.__auth_service_url}/verify", json={"session_id": session_id}, headers=headers, timeout=3
-            )
-
-            if response.status_code == 200:
-                return response.json().get("user", {}).get("email")
-        except requests.RequestException:
-            pass
+            return await self.fetch_session_user(session_id)
+        except httpx.HTTPError as e:
+            logger.warning("Session verification request failed", exc_info=e)
         return None
+
+    async def verify_sessions(self, session_ids: list[str]) -> dict[str, str | None]:
+        """
+        Verify many sessions with auth_service `/verify/batch` (one Redis MGET per request upstream).
+
+        IDs are de-duplicated and sent in chunks of `auth_client_verify_batch_max_size`, concurrently.
+
+        Args:
+            session_ids (list[str]): Session IDs to verify.
+
+        Raises:
+            httpx.HTTPError: If a request to auth_service fails or it answers with an error status.
+
+        Returns:
+            dict[str, Optional[str]]: Session ID -> user ID (email), None for invalid sessions.
+        """
+        unique_ids = list(dict.fromkeys(session_id for session_id in session_ids if session_id))
+        if not unique_ids:
+            return {}
+        chunks = []
+        for start in range(0, len(unique_ids), self.__verify_batch_max_size):
+            end = start + self.__verify_batch_max_size
+            chunks.append(unique_ids[start:end])
+        results: dict[str, str | None] = {}
+        for sessions in await asyncio.gather(*(self._post_verify_batch(chunk) for chunk in chunks)):
+            results.update(sessions)
+        return results
+
+    async def _post_verify_batch(self, session_ids: list[str]) -> dict[str, str | None]:
+        """Issue one `/verify/batch` call to auth_service (see `verify_sessions`)."""
+        client = await self._get_client()
+        response = await client.post("/verify/batch", json={"session_ids": session_ids})
+        response.raise_for_status()
+        sessions: dict[str, dict | None] = response.json().get("sessions", {})
+        return {session_id: (sessions.get(session_id) or {}).get("email") for session_id in session_ids}
+
+    async def logout(self, session_id: str | None) -> bool:
+        """
+        Delete the session in the authentication service.
+
+        Args:
+            session_id (Optional[str]): Session ID retrieved from cookies.
+
+        Returns:
+            bool: True if auth_service acknowledged the logout, False otherwise.
+        """
+        if not session_id:
+            return False
+        try:
+            client = await self._get_client()
+            response = await client.post("/logout", json={"session_id": session_id})
+            return response.status_code == 200
+        except httpx.HTTPError as e:
+            logger.warning("Session logout request failed", exc_info=e)
+        return False
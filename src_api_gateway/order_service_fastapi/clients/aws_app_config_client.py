@@ -1,18 +1,13 @@
-from aws_app_config.aws_app_config import AWSAppConfig
+from aws_app_config.flag_providers import create_flag_provider
 from core.config import get_settings
 
 
 class AWSAppConfigClient:
-    """Client for interacting with AWS AppConfig."""
+    """Client for reading feature flags from AWS AppConfig (or the provider selected by `AWS_APP_CONFIG_PROVIDER`)."""
 
     def __init__(self) -> None:
         settings = get_settings()
-        self.__client = AWSAppConfig(
-            app_id=settings.aws_app_config_app_id,  # replace with real IDs
-            env_id=settings.aws_app_config_env_id,
-            config_profile_id=settings.aws_app_config_config_profile_id,
-            ttl=settings.aws_app_config_cache_ttl,
-        )
+        self.__client = create_flag_provider(settings)  # AppConfig API, agent sidecar or local file
         self.__aws_app_config_feature_flag_key_api_gateway_authorizer_auth_service = (
             settings.aws_app_config_feature_flag_key_api_gateway_authorizer_auth_service
         )
@@ -20,9 +15,21 @@ class AWSAppConfigClient:
             settings.aws_app_config_feature_flag_key_api_gateway_authorizer_lambda_authorizer
         )
 
+    async def start(self) -> None:
+        """Load the flags and start the background refresher. Called once from `core.lifespan`."""
+        await self.__client.start()
+
+    async def stop(self) -> None:
+        """Stop the background refresher."""
+        await self.__client.stop()
+
+    def stats(self) -> dict[str, int | float]:
+        """Return refresh counters and the age of the cached flags."""
+        return self.__client.stats()
+
     def get_config_value_by_key(self, key: str) -> str | None:
         """
-        Retrieves a specific key's value from the configuration.
+        Retrieves a specific key's value from the cached configuration snapshot.
         :param config_name: Name of the configuration to retrieve.
         :param key: Key whose value is to be retrieved.
         :return: Value associated with the key in the configuration.
@@ -0,0 +1,92 @@
+import logging
+import time
+
+import redis.asyncio as redis
+from core import session_tokens
+from core.config import get_settings
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)  # pulling logging config from the main app.py file
+
+
+class SessionTokenVerifier:
+    """
+    Local verification of signed session tokens issued by auth_service (SESSION_TOKEN_MODE=signed).
+
+    Signature and expiry are checked in-process. Revocations are read from the auth_service Redis: the bloom
+    filters are refreshed every `session_token_revocation_refresh` seconds and a token is only looked up
+    individually when the filter reports a possible revocation. Disabled unless `session_token_secrets` is set.
+    """
+
+    def __init__(self) -> None:
+        settings = get_settings()
+        secrets = [secret.strip() for secret in settings.session_token_secrets.split(",") if secret.strip()]
+        self.__codec = session_tokens.SessionTokenCodec(secrets) if secrets else None
+        self.__revocations = session_tokens.RevocationFilter(
+            refresh_interval=settings.session_token_revocation_refresh,
+            max_token_ttl=settings.session_token_max_ttl,
+        )
+        self.__redis: redis.Redis | None = None
+        if self.__codec is not None:
+            self.__redis = redis.Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                db=settings.redis_db,
+                ssl=settings.redis_ssl,  # must be enabled if connecting to Redis in AWS ElastiCache
+                decode_responses=False,  # bloom filters are raw bitmaps
+                socket_timeout=settings.redis_socket_timeout,
+                socket_connect_timeout=settings.redis_socket_timeout,
+            )
+
+        # * metrics
+        self.verified = 0
+        self.rejected = 0
+        self.revocation_lookups = 0
+
+    def handles(self, session_id: str) -> bool:
+        """True if `session_id` is a signed token this verifier can check."""
+        return self.__codec is not None and session_tokens.is_signed_token(session_id)
+
+    async def verify(self, session_id: str) -> str | None:
+        """
+        Verify a signed token.
+
+        Raises:
+            RedisError: If a possible revocation could not be confirmed.
+
+        Returns:
+            str | None: User ID (email) if the token is valid and not revoked, None otherwise.
+        """
+        claims = self.__codec.verify(session_id) if self.__codec is not None else None
+        if claims is None or await self._is_revoked(claims):
+            self.rejected += 1
+            return None
+        self.verified += 1
+        return claims["email"]
+
+    async def _is_revoked(self, claims: session_tokens.Claims) -> bool:
+        """Bloom filter check, confirmed against Redis on a hit."""
+        if self.__redis is None:
+            return True
+        if self.__revocations.needs_refresh():
+            self.__revocations.refreshed_at = float("inf")  # one refresh at a time
+            windows = self.__revocations.windows()
+            try:
+                self.__revocations.load(windows, await self.__redis.mget([session_tokens.bloom_key(w) for w in windows]))
+            except RedisError as e:
+                logger.warning("Could not refresh session revocation filter", exc_info=e)
+            finally:
+                self.__revocations.refreshed_at = time.monotonic()
+        if not self.__revocations.might_be_revoked(claims):
+            return False
+        self.revocation_lookups += 1
+        return bool(await self.__redis.exists(f"{session_tokens.REVOKED_KEY_PREFIX}{claims['jti']}"))
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        if self.__redis is not None:
+            await self.__redis.aclose()
+
+    def stats(self) -> dict[str, int]:
+        """Return verification counters for this worker."""
+        return {"verified": self.verified, "rejected": self.rejected, "revocation_lookups": self.revocation_lookups}
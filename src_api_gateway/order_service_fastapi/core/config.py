@@ -6,16 +6,75 @@ class Settings(BaseSettings):
     """Settings for the application."""
 
     auth_service_url: AnyHttpUrl = Field(..., env="AUTH_SERVICE_URL")  # type: ignore
+    auth_client_max_connections: int = Field(100, env="AUTH_CLIENT_MAX_CONNECTIONS")  # type: ignore
+    auth_client_max_keepalive_connections: int = Field(20, env="AUTH_CLIENT_MAX_KEEPALIVE_CONNECTIONS")  # type: ignore
+    auth_client_keepalive_expiry: float = Field(30.0, env="AUTH_CLIENT_KEEPALIVE_EXPIRY")  # type: ignore
+    auth_client_timeout: float = Field(3.0, env="AUTH_CLIENT_TIMEOUT")  # type: ignore
+    auth_client_connect_timeout: float = Field(1.0, env="AUTH_CLIENT_CONNECT_TIMEOUT")  # type: ignore
+    auth_client_pool_timeout: float = Field(1.0, env="AUTH_CLIENT_POOL_TIMEOUT")  # type: ignore
+    # * keep at or below auth_service MAX_VERIFY_BATCH_SIZE, larger `/verify/batch` requests are rejected
+    auth_client_verify_batch_max_size: int = Field(500, env="AUTH_CLIENT_VERIFY_BATCH_MAX_SIZE", gt=0)  # type: ignore
+
+    # * signed session tokens (auth_service SESSION_TOKEN_MODE=signed) - verified locally when secrets are set
+    session_token_secrets: str = Field("", env="SESSION_TOKEN_SECRETS")  # type: ignore
+    session_token_max_ttl: int = Field(3600, env="SESSION_EXPIRE_TIME_SECONDS")  # type: ignore
+    session_token_revocation_refresh: float = Field(5.0, env="SESSION_TOKEN_REVOCATION_REFRESH_SECONDS")  # type: ignore
+
+    # * signed X-Internal-Auth header from web_service (user already verified there) - trusted when secrets are set
+    internal_auth_secrets: str = Field("", env="INTERNAL_AUTH_SECRETS")  # type: ignore
+    internal_auth_max_age: int = Field(60, env="INTERNAL_AUTH_MAX_AGE")  # type: ignore
+
+    # * verified session cache - positive TTL kept well under auth_service SESSION_EXPIRE_TIME_SECONDS
+    session_cache_max_size: int = Field(10_000, env="SESSION_CACHE_MAX_SIZE")  # type: ignore
+    session_cache_ttl: float = Field(30.0, env="SESSION_CACHE_TTL")  # type: ignore
+    session_cache_negative_ttl: float = Field(5.0, env="SESSION_CACHE_NEGATIVE_TTL")  # type: ignore
+
     aws_default_region: str = Field("us-east-1", env="AWS_DEFAULT_REGION")  # type: ignore
     aws_order_created_sns_topic_arn: str = Field(..., env="AWS_ORDER_CREATED_SNS_TOPIC_ARN")  # type: ignore
 
+    # * batched SNS publisher - flush when 10 events are queued or `sns_publish_flush_interval` seconds elapse
+    sns_publish_queue_max_size: int = Field(10_000, env="SNS_PUBLISH_QUEUE_MAX_SIZE")  # type: ignore
+    sns_publish_flush_interval: float = Field(0.5, env="SNS_PUBLISH_FLUSH_INTERVAL")  # type: ignore
+    sns_publish_max_retries: int = Field(3, env="SNS_PUBLISH_MAX_RETRIES")  # type: ignore
+    sns_publish_retry_backoff: float = Field(0.2, env="SNS_PUBLISH_RETRY_BACKOFF")  # type: ignore
+    sns_publish_drain_timeout: float = Field(10.0, env="SNS_PUBLISH_DRAIN_TIMEOUT")  # type: ignore
+
+    # * Cache-Control of order reads (sent with their ETags) - `private` keeps API Gateway / CDN caches from sharing them,
+    # * `no-cache` makes clients revalidate with If-None-Match (a 304 costs a header round trip, not the payload)
+    orders_cache_control: str = Field("private, no-cache", env="ORDERS_CACHE_CONTROL")  # type: ignore
+
+    # * order storage - `memory` (single worker only) or `redis` (shared across workers / ECS tasks)
+    order_store_backend: str = Field("memory", env="ORDER_STORE_BACKEND")  # type: ignore
+    order_store_key_prefix: str = Field("orders", env="ORDER_STORE_KEY_PREFIX")  # type: ignore
+    redis_host: str = Field("localhost", env="REDIS_HOST")  # type: ignore
+    redis_port: int = Field(6379, env="REDIS_PORT")  # type: ignore
+    redis_db: int = Field(0, env="REDIS_DB")  # type: ignore
+    redis_ssl: bool = Field(False, env="REDIS_SSL")  # type: ignore
+    redis_socket_timeout: float = Field(2.0, env="REDIS_SOCKET_TIMEOUT")  # type: ignore
+    redis_max_connections: int = Field(50, env="REDIS_MAX_CONNECTIONS")  # type: ignore
+
+    # * transactional outbox - order events are stored with the order and relayed to SNS by a background worker
+    order_events_outbox: bool = Field(True, env="ORDER_EVENTS_OUTBOX")  # type: ignore
+    outbox_relay_poll_interval: float = Field(0.5, env="OUTBOX_RELAY_POLL_INTERVAL")  # type: ignore
+    outbox_relay_lease_seconds: float = Field(30.0, env="OUTBOX_RELAY_LEASE_SECONDS")  # type: ignore
+    outbox_max_attempts: int = Field(10, env="OUTBOX_MAX_ATTEMPTS")  # type: ignore
+
+    # * bearer token required by GET /metrics when set - leave empty only if /metrics is not reachable from outside the VPC
+    metrics_token: str = Field("", env="METRICS_TOKEN")  # type: ignore
+
     env: str = Field("production", env="ENVIRONMENT")  # type: ignore
     debug: bool = Field(False, env="DEBUG")  # type: ignore
     port: int = Field(5003, env="PORT")  # type: ignore
 
-    aws_app_config_app_id: str = Field(..., env="AWS_APP_CONFIG_APP_ID")  # type: ignore
-    aws_app_config_env_id: str = Field(..., env="AWS_APP_CONFIG_ENV_ID")  # type: ignore
-    aws_app_config_config_profile_id: str = Field(..., env="AWS_APP_CONFIG_CONFIG_PROFILE_ID")  # type: ignore
+    # * feature flag source - `appconfigdata` (AppConfig API), `agent` (AppConfig agent sidecar) or `file` (local JSON)
+    aws_app_config_provider: str = Field("appconfigdata", env="AWS_APP_CONFIG_PROVIDER")  # type: ignore
+    aws_app_config_agent_url: str = Field("http://localhost:2772", env="AWS_APP_CONFIG_AGENT_URL")  # type: ignore
+    aws_app_config_flags_file: str = Field("feature_flags.json", env="AWS_APP_CONFIG_FLAGS_FILE")  # type: ignore
+    aws_app_config_local_poll_interval: float = Field(1.0, env="AWS_APP_CONFIG_LOCAL_POLL_INTERVAL")  # type: ignore
+    # * IDs are only used by the `appconfigdata` and `agent` providers
+    aws_app_config_app_id: str = Field("", env="AWS_APP_CONFIG_APP_ID")  # type: ignore
+    aws_app_config_env_id: str = Field("", env="AWS_APP_CONFIG_ENV_ID")  # type: ignore
+    aws_app_config_config_profile_id: str = Field("", env="AWS_APP_CONFIG_CONFIG_PROFILE_ID")  # type: ignore
     aws_app_config_cache_ttl: int = Field(60, env="AWS_APP_CONFIG_CACHE_TTL")  # type: ignore
 
     aws_app_config_feature_flag_key_api_gateway_authorizer_auth_service: str = Field(  # type: ignore
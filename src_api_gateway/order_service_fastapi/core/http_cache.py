@@ -0,0 +1,58 @@
+import hashlib
+
+from fastapi import Request, Response, status
+
+
+def strong_etag(*parts: object) -> str:
+    """
+    Build a strong ETag from the values that fully determine a response body.
+
+    INPUT:
+    - parts: values identifying the representation (e.g. user, collection version, query parameters).
+
+    RETURN:
+    - Quoted ETag, e.g. `"3f2a..."`.
+    """
+    digest = hashlib.sha256("\x1f".join(repr(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check an `If-None-Match` header against an ETag (weak comparison, as RFC 9110 requires for this header).
+
+    INPUT:
+    - if_none_match: raw header value - `*` or a comma-separated list of (possibly `W/`-prefixed) ETags.
+    - etag: current ETag of the resource.
+
+    RETURN:
+    - True if the client's copy is current and a 304 may be returned.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
+def not_modified_or_tag(request: Request, response: Response, etag: str, cache_control: str) -> Response | None:
+    """
+    Answer a conditional GET: a bodiless 304 if the client's copy is current, otherwise tag the full response.
+
+    Responses vary by the caller's identity (session cookie, authorizer `X-User`, web_service `X-Internal-Auth`),
+    so shared caches must not mix users - `Cache-Control` should stay `private`.
+
+    INPUT:
+    - request: incoming request, read for `If-None-Match`.
+    - response: response the route will return the body with, tagged when the body is sent.
+    - etag: current strong ETag of the representation.
+    - cache_control: `Cache-Control` header value.
+
+    RETURN:
+    - 304 Response to return as-is, or None when the route should return the full body.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Cookie, X-User, X-Internal-Auth"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
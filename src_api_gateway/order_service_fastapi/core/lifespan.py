@@ -3,7 +3,11 @@ from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from core.config import get_settings
+from dependencies import auth_client, aws_app_config_client, session_token_verifier
 from fastapi import FastAPI
+from services.notifications import notification_service
+from services.orders import order_store
+from services.outbox_relay import outbox_relay
 
 settings = get_settings()
 logger = logging.getLogger(__name__)  # pulling logging config from the main app.py file
@@ -17,15 +21,27 @@ async def lifespan(_: FastAPI) -> AsyncGenerator:
     Runs on startup and shutdown of the FastAPI app.
 
     Startup:
-      - Initialize external resources
+      - Initialize external resources (AppConfig flag refresher, pooled auth_service HTTP client, batched SNS publisher,
+        outbox relay)
       - Log startup events
 
     Shutdown:
-      - Close resources
+      - Stop the outbox relay and drain queued SNS notifications
+      - Close resources (AppConfig refresher, auth_service HTTP client, Redis and order store connections)
       - Log shutdown events
     """
     logger.info("Starting order_service")
+    await aws_app_config_client.start()
+    await auth_client.start()
+    await notification_service.start()
+    await outbox_relay.start()
     try:
         yield
     finally:
+        await outbox_relay.stop()
+        await notification_service.stop()
+        await auth_client.close()
+        await session_token_verifier.close()
+        await aws_app_config_client.stop()
+        await order_store.close()
         logger.info("Stopping order_service")
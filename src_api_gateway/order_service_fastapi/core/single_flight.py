@@ -0,0 +1,57 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[K, T]):
+    """
+    Coalesces concurrent async calls that share a key into one in-flight call.
+
+    The first caller for a key runs `fn`; callers arriving while it is still running await the same
+    future and receive its result (or its exception). The key is released as soon as the call
+    finishes, so nothing is cached beyond the lifetime of the in-flight call.
+    """
+
+    def __init__(self) -> None:
+        self.__in_flight: dict[K, asyncio.Future[T]] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `fn` for `key`, or join the call already in flight for `key`.
+
+        INPUT:
+        - key: identifies calls that may share a result.
+        - fn: zero-argument coroutine factory performing the real work.
+
+        RETURN:
+        - The result of the (possibly shared) call.
+        """
+        if (future := self.__in_flight.get(key)) is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)  # a cancelled follower must not cancel the leader's call
+
+        future = asyncio.get_running_loop().create_future()
+        self.__in_flight[key] = future
+        self.calls += 1
+        try:
+            result = await fn()
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved so an unawaited failure doesn't log "exception never retrieved"
+            raise
+        except BaseException:  # leader cancelled - followers are cancelled too rather than left waiting
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self.__in_flight[key]
+
+    def stats(self) -> dict[str, int]:
+        """Return counters for upstream calls made, callers coalesced and calls currently in flight."""
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self.__in_flight)}
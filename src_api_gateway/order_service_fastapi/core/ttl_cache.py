@@ -0,0 +1,102 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded in-process LRU cache where each entry carries its own time-to-live.
+
+    Used to cache verified sessions so repeated requests with the same cookie skip the auth_service round trip.
+    Entries are evicted least-recently-used once `max_size` is reached, and lazily on read once expired.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.__max_size = max_size
+        self.__entries: OrderedDict[K, tuple[float, V]] = OrderedDict()  # key -> (expires_at, value)
+        self.__lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """
+        Return the cached value for `key`, or `default` if missing or expired.
+
+        INPUT:
+        - key: cache key.
+        - default: value returned on a miss.
+        """
+        value = self.lookup(key)
+        return default if value is _MISSING else value  # type: ignore
+
+    def lookup(self, key: K) -> V | object:
+        """
+        Return the cached value for `key`, or the `_MISSING` sentinel on a miss.
+
+        Lets callers cache `None` (negative caching) and still tell it apart from a miss.
+        """
+        now = time.monotonic()
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= now:
+                del self.__entries[key]
+                self.misses += 1
+                return _MISSING
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V, ttl: float) -> None:
+        """
+        Store `value` under `key` for `ttl` seconds, evicting the least recently used entry if full.
+
+        INPUT:
+        - key: cache key.
+        - value: value to cache (may be None for negative caching).
+        - ttl: time-to-live in seconds; non-positive values skip caching.
+        """
+        if ttl <= 0 or self.__max_size <= 0:
+            return
+        with self.__lock:
+            self.__entries[key] = (time.monotonic() + ttl, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """Remove `key` from the cache if present."""
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss/eviction counters and the current size."""
+        with self.__lock:
+            return {
+                "size": len(self.__entries),
+                "max_size": self.__max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def is_missing(value: object) -> bool:
+    """Return True if `value` is the sentinel returned by `TTLCache.lookup` on a miss."""
+    return value is _MISSING
@@ -1,9 +1,82 @@
+import logging
+
+import httpx
 from clients.auth_client import AuthClient
 from clients.aws_app_config_client import AWSAppConfigClient
+from clients.session_token_verifier import SessionTokenVerifier
+from core import session_tokens
+from core.config import get_settings
+from core.ttl_cache import TTLCache, is_missing
 from fastapi import Cookie, Header, HTTPException, Request, status
+from redis.exceptions import RedisError
+
+settings = get_settings()
+logger = logging.getLogger(__name__)  # pulling logging config from the main app.py file
 
 aws_app_config_client = AWSAppConfigClient()
 auth_client = AuthClient()
+session_token_verifier = SessionTokenVerifier()
+
+internal_auth_secrets = [secret.strip() for secret in settings.internal_auth_secrets.split(",") if secret.strip()]
+
+# * session_id -> user_id (email), or None for sessions auth_service rejected (negative cache)
+session_cache: TTLCache[str, str | None] = TTLCache(settings.session_cache_max_size)
+
+
+async def verify_session_cached(session_id: str | None) -> str | None:
+    """
+    Verify a session ID, consulting the local session cache before calling auth_service.
+
+    Signed session tokens are verified locally when `session_token_secrets` is set (falling back to
+    auth_service if the revocation list cannot be read). Valid sessions are cached for `session_cache_ttl`
+    seconds and rejected ones for `session_cache_negative_ttl` seconds. Transport failures are not cached.
+
+    Args:
+        session_id (Optional[str]): Session ID retrieved from cookies.
+
+    Returns:
+        Optional[str]: User ID (email) if session is valid, None otherwise.
+    """
+    if not session_id:
+        return None
+
+    if session_token_verifier.handles(session_id):
+        try:
+            return await session_token_verifier.verify(session_id)
+        except RedisError as e:
+            logger.warning("Session token revocation check failed, verifying with auth_service", exc_info=e)
+
+    cached = session_cache.lookup(session_id)
+    if not is_missing(cached):
+        return cached  # type: ignore
+
+    try:
+        user_id = await auth_client.fetch_session_user(session_id)
+    except httpx.HTTPError as e:
+        logger.warning("Session verification request failed", exc_info=e)
+        return None
+
+    ttl = settings.session_cache_ttl if user_id else settings.session_cache_negative_ttl
+    session_cache.set(session_id, user_id, ttl)
+    return user_id
+
+
+def verify_internal_identity(request: Request) -> str | None:
+    """
+    User ID from a signed X-Internal-Auth header, set by web_service for a user it already verified.
+
+    Only trusted when `internal_auth_secrets` is set; the signature must be at most `internal_auth_max_age` seconds old.
+    """
+    value = request.headers.get(session_tokens.INTERNAL_AUTH_HEADER)
+    if not internal_auth_secrets or not value:
+        return None
+    return session_tokens.verify_internal_identity(internal_auth_secrets, value, settings.internal_auth_max_age)
+
+
+def invalidate_session(session_id: str | None) -> None:
+    """Drop a session from the local session cache (e.g. on logout)."""
+    if session_id:
+        session_cache.invalidate(session_id)
 
 
 async def get_current_user(
@@ -18,6 +91,7 @@ async def get_current_user(
     - If using ECS auth service, it validates session_id from cookies.
     - If using Lambda authorizer, it reads X-User from headers.
     - Falls back to cookie session verification if no config matches.
+    - Without the Lambda authorizer, a valid signed X-Internal-Auth header from web_service skips verification.
 
     Raises:
         HTTPException: If user authentication fails.
@@ -29,12 +103,12 @@ async def get_current_user(
 
     if aws_app_config_client.get_config_api_gateway_authorizer_ecs_auth_service():
         session_id = request.cookies.get("session_id")
-        user_id = await auth_client.verify_session(session_id)
+        user_id = verify_internal_identity(request) or await verify_session_cached(session_id)
     elif aws_app_config_client.get_config_api_gateway_authorizer_lambda_authorizer():
         user_id = x_user
     else:
         session_id = request.cookies.get("session_id")
-        user_id = await auth_client.verify_session(session_id)
+        user_id = verify_internal_identity(request) or await verify_session_cached(session_id)
 
     print(f"User ID: {user_id}")
 
@@ -0,0 +1,31 @@
+import hmac
+
+from core.config import get_settings
+from dependencies import auth_client, aws_app_config_client, session_cache, session_token_verifier
+from fastapi import APIRouter, Header, HTTPException, status
+from services.notifications import notification_service
+from services.outbox_relay import outbox_relay
+
+settings = get_settings()
+router = APIRouter()
+
+
+@router.get("/metrics", tags=["metrics"])
+async def metrics(authorization: str | None = Header(default=None)) -> dict[str, dict[str, int | float]]:
+    """
+    In-process counters for this worker (caches, queues) plus the shared outbox size.
+
+    Requires `Authorization: Bearer <METRICS_TOKEN>` when `metrics_token` is set. Without it the endpoint is open, so it
+    must only be reachable from inside the VPC (scrapers, ALB health checks), not routed through API Gateway.
+    """
+    expected = f"Bearer {settings.metrics_token}".encode()
+    if settings.metrics_token and not hmac.compare_digest((authorization or "").encode(), expected):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+    return {
+        "app_config": aws_app_config_client.stats(),
+        "session_cache": session_cache.stats(),
+        "auth_verify_single_flight": auth_client.verify_flight.stats(),
+        "session_tokens": session_token_verifier.stats(),
+        "sns_publisher": notification_service.stats(),
+        "outbox_relay": await outbox_relay.stats(),
+    }
@@ -1,79 +1,153 @@
+import json
+
+from core.config import get_settings
+from core.http_cache import not_modified_or_tag, strong_etag
 from dependencies import get_current_user
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
-from schemas.order import OrderCreate, OrderResponse
-from services.notifications import NotificationService
-from services.orders import create_order, delete_order, get_order, list_orders, update_order
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from schemas.order import BatchGetRequest, BatchGetResponse, BatchRequest, BatchResponse, OrderCreate, OrderPage, OrderResponse
+from services import orders as orders_service
 
 router = APIRouter()
-notification_service = NotificationService()
+settings = get_settings()
 
 
 @router.post("/", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
 async def create_user_order(
     order: OrderCreate,
-    background_tasks: BackgroundTasks,
     user_id: str = Depends(get_current_user),
 ) -> OrderResponse:
     """
     Create a new order for the authenticated user.
 
-    Schedules an SNS notification in the background once the order is created.
+    The order-created SNS notification is recorded with the order and delivered in the background.
 
     Args:
         order (OrderCreate): Payload containing items and total amount.
-        background_tasks (BackgroundTasks): FastAPI background task manager.
         user_id (str): Authenticated user's ID, injected by dependency.
 
     Returns:
         OrderResponse: The newly created order, including generated `order_id` and `timestamp`.
     """
-    result = create_order(order, user_id)
-    # * schedule publishing to sns in the background
-    background_tasks.add_task(
-        notification_service.publish_order_created,
-        result,
-        user_id,
-    )
-    return result
+    return await orders_service.create_order(order, user_id)
 
 
-@router.get("/", response_model=list[OrderResponse])
+@router.get("/", response_model=OrderPage, responses={304: {"description": "Not Modified"}})
 async def get_user_orders(
+    request: Request,
+    response: Response,
     user_id: str = Depends(get_current_user),
-) -> list[OrderResponse]:
+    limit: int = Query(orders_service.DEFAULT_PAGE_SIZE, ge=1, le=orders_service.MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
+    order_status: str | None = Query(None, alias="status"),
+    since: int | None = Query(None, description="Only orders with timestamp >= since (epoch seconds)"),
+    until: int | None = Query(None, description="Only orders with timestamp <= until (epoch seconds)"),
+) -> OrderPage | Response:
     """
-    Retrieve all orders belonging to the authenticated user.
+    Retrieve a page of orders belonging to the authenticated user, oldest first.
+
+    The page is tagged with a strong ETag derived from the user's collection version and the query, so a client
+    sending it back in `If-None-Match` gets a bodiless 304 until one of the user's orders changes.
+
+    Args:
+        request (Request): Incoming request, read for `If-None-Match`.
+        response (Response): Response the ETag and `Cache-Control` headers are set on.
+        user_id (str): Authenticated user's ID, injected by dependency.
+        limit (int): Maximum number of orders to return.
+        cursor (Optional[str]): `next_cursor` from the previous page.
+        order_status (Optional[str]): Only return orders with this status (`?status=`).
+        since (Optional[int]): Only return orders created at or after this epoch timestamp.
+        until (Optional[int]): Only return orders created at or before this epoch timestamp.
+
+    Raises:
+        HTTPException (400): If `cursor` is malformed.
+
+    Returns:
+        OrderPage | Response: The user's orders for this page and the cursor for the next one, or a 304.
+    """
+    version = await orders_service.get_orders_version(user_id)
+    etag = strong_etag("orders", user_id, version, limit, cursor, order_status, since, until)
+    not_modified = not_modified_or_tag(request, response, etag, settings.orders_cache_control)
+    if not_modified:
+        return not_modified
+    try:
+        return await orders_service.list_orders(
+            user_id, limit=limit, cursor=cursor, status=order_status, since=since, until=until
+        )
+    except ValueError as e:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(e)) from e
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def batch_user_orders(
+    batch: BatchRequest,
+    user_id: str = Depends(get_current_user),
+) -> BatchResponse:
+    """
+    Apply up to `MAX_BATCH_OPERATIONS` create/update/delete operations for the authenticated user.
+
+    The user is authenticated once, all operations are applied in one store round trip, and
+    order-created notifications for the whole batch are recorded in that same write.
 
     Args:
+        batch (BatchRequest): Operations to apply, in order.
         user_id (str): Authenticated user's ID, injected by dependency.
 
     Returns:
-        list[OrderResponse]: A list of the user's existing orders.
+        BatchResponse: Per-operation results (status code, order, error) in request order.
     """
-    return list_orders(user_id)
+    return BatchResponse(results=await orders_service.apply_order_batch(batch.operations, user_id))
 
 
-@router.get("/{order_id}", response_model=OrderResponse)
+@router.post("/batch-get", response_model=BatchGetResponse)
+async def batch_get_user_orders(
+    batch: BatchGetRequest,
+    user_id: str = Depends(get_current_user),
+) -> BatchGetResponse:
+    """
+    Retrieve up to `MAX_BATCH_OPERATIONS` orders by ID for the authenticated user in one store round trip.
+
+    Args:
+        batch (BatchGetRequest): IDs of the orders to fetch.
+        user_id (str): Authenticated user's ID, injected by dependency.
+
+    Returns:
+        BatchGetResponse: Orders found, plus the IDs that do not exist for this user.
+    """
+    orders, missing = await orders_service.get_orders_batch(batch.order_ids, user_id)
+    return BatchGetResponse(orders=orders, missing=missing)
+
+
+@router.get("/{order_id}", response_model=OrderResponse, responses={304: {"description": "Not Modified"}})
 async def get_user_order(
     order_id: str,
+    request: Request,
+    response: Response,
     user_id: str = Depends(get_current_user),
-) -> OrderResponse:
+) -> OrderResponse | Response:
     """
     Retrieve a single order by its ID for the authenticated user.
 
+    The order is tagged with a strong ETag of its content; a matching `If-None-Match` gets a bodiless 304.
+
     Args:
         order_id (str): The unique identifier of the order to fetch.
+        request (Request): Incoming request, read for `If-None-Match`.
+        response (Response): Response the ETag and `Cache-Control` headers are set on.
         user_id (str): Authenticated user's ID, injected by dependency.
 
     Raises:
         HTTPException (404): If no order with `order_id` exists for this user.
 
     Returns:
-        OrderResponse: The requested order details.
+        OrderResponse | Response: The requested order details, or a 304.
     """
-    order = get_order(order_id, user_id)
+    order = await orders_service.get_order(order_id, user_id)
     if not order:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Order not found")
+    etag = strong_etag("order", user_id, json.dumps(order.model_dump(), sort_keys=True))
+    not_modified = not_modified_or_tag(request, response, etag, settings.orders_cache_control)
+    if not_modified:
+        return not_modified
     return order
 
 
@@ -97,7 +171,7 @@ async def update_user_order(
     Returns:
         OrderResponse: The updated order details.
     """
-    updated = update_order(order_id, order, user_id)
+    updated = await orders_service.update_order(order_id, order, user_id)
     if not updated:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Order not found")
     return updated
@@ -121,6 +195,6 @@ async def delete_user_order(
     Returns:
         None: Returns HTTP 204 No Content on success.
     """
-    success = delete_order(order_id, user_id)
+    success = await orders_service.delete_order(order_id, user_id)
     if not success:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Order not found")
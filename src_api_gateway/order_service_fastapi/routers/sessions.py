@@ -0,0 +1,25 @@
+from dependencies import auth_client, invalidate_session
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+
+router = APIRouter()
+
+
+@router.post("/logout")
+async def logout(request: Request) -> JSONResponse:
+    """
+    Log the caller out of auth_service and drop their session from this worker's session cache.
+
+    Other workers stop honouring the session once their cached entry expires (`session_cache_ttl`).
+
+    Args:
+        request (Request): Incoming request carrying the `session_id` cookie.
+
+    Returns:
+        JSONResponse: 200 if auth_service deleted the session, 400 otherwise.
+    """
+    session_id = request.cookies.get("session_id")
+    invalidate_session(session_id)
+    if await auth_client.logout(session_id):
+        return JSONResponse({"message": "logged out successfully"}, status_code=status.HTTP_200_OK)
+    return JSONResponse({"message": "invalid session ID"}, status_code=status.HTTP_400_BAD_REQUEST)
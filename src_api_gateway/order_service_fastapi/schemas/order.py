@@ -1,6 +1,8 @@
-from typing import List
+from typing import List, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
+
+MAX_BATCH_OPERATIONS = 100  # per `POST /orders/batch` / `POST /orders/batch-get` request
 
 
 class OrderCreate(BaseModel):
@@ -15,3 +17,63 @@ class OrderResponse(OrderCreate):
 
     order_id: str
     status: str = "created"
+    timestamp: int | None = None
+
+
+class OrderPage(BaseModel):
+    """Page of orders returned by `GET /orders`, oldest first."""
+
+    orders: List[OrderResponse]
+    next_cursor: str | None = None  # pass back as `cursor` to fetch the next page; None on the last page
+
+
+class BatchOperation(BaseModel):
+    """Single operation inside a `POST /orders/batch` request."""
+
+    op: Literal["create", "update", "delete"]
+    order_id: str | None = None  # required for update / delete
+    order: OrderCreate | None = None  # required for create / update
+
+    @model_validator(mode="after")
+    def check_fields_for_op(self) -> "BatchOperation":
+        """Ensure each operation carries the fields it needs."""
+        if self.op in ("update", "delete") and not self.order_id:
+            raise ValueError(f"`order_id` is required for {self.op}")
+        if self.op in ("create", "update") and self.order is None:
+            raise ValueError(f"`order` is required for {self.op}")
+        return self
+
+
+class BatchRequest(BaseModel):
+    """Batch of create/update/delete operations, applied in order."""
+
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of one batch operation, mirroring the status code the single-order endpoint would return."""
+
+    op: str
+    order_id: str | None
+    status_code: int
+    order: OrderResponse | None = None
+    error: str | None = None
+
+
+class BatchResponse(BaseModel):
+    """Per-operation results of a `POST /orders/batch` request, in request order."""
+
+    results: List[BatchItemResult]
+
+
+class BatchGetRequest(BaseModel):
+    """Order IDs to fetch in one `POST /orders/batch-get` request."""
+
+    order_ids: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+
+class BatchGetResponse(BaseModel):
+    """Orders found for a `POST /orders/batch-get` request, plus IDs that do not exist for the user."""
+
+    orders: List[OrderResponse]
+    missing: List[str]
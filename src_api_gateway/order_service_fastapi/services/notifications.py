@@ -1,5 +1,7 @@
+import asyncio
 import json
 import logging
+import time
 
 import boto3
 from core.config import get_settings
@@ -7,48 +9,199 @@ from schemas.order import OrderResponse
 
 logger = logging.getLogger(__name__)  # pulling logging config from the main app.py file
 
+SNS_PUBLISH_BATCH_MAX_ENTRIES = 10  # SNS `publish_batch` limit per call
+
 
 class NotificationService:
-    """Service to publish notifications to AWS SNS."""
+    """
+    Service to publish notifications to AWS SNS.
+
+    Events are put on a bounded in-process queue and a background flusher (started in `core.lifespan`)
+    sends them with `publish_batch`, flushing when 10 events are waiting or `sns_publish_flush_interval`
+    seconds after the first one arrived. Partial failures are retried with exponential backoff, and the
+    queue is drained on shutdown.
+    """
 
     def __init__(self) -> None:
         settings = get_settings()
         self.__aws_sns_client = boto3.client("sns", region_name=settings.aws_default_region)
         self.__aws_order_created_sns_topic_arn = settings.aws_order_created_sns_topic_arn
+        self.__flush_interval = settings.sns_publish_flush_interval
+        self.__max_retries = settings.sns_publish_max_retries
+        self.__retry_backoff = settings.sns_publish_retry_backoff
+        self.__drain_timeout = settings.sns_publish_drain_timeout
+        self.__queue: asyncio.Queue[tuple[str, str]] = asyncio.Queue(maxsize=settings.sns_publish_queue_max_size)
+        self.__flusher: asyncio.Task | None = None
 
-    def publish_order_created(self, order: OrderResponse, user_id: str) -> None:
-        """
-        Publishes an order-created event to AWS SNS.
+        # * metrics
+        self.enqueued = 0
+        self.published = 0
+        self.failed = 0
+        self.dropped = 0
+        self.retries = 0
+        self.flushes = 0
+        self.flush_latency_ms_last = 0.0
+        self.flush_latency_ms_max = 0.0
+        self.flush_latency_ms_total = 0.0
 
-        INPUT:
-        - order: OrderResponse object containing order details.
-        - user_id: ID of the user who created the order.
-        """
+    async def start(self) -> None:
+        """Start the background flusher. Called once from `core.lifespan`."""
+        if self.__flusher is None:
+            self.__flusher = asyncio.create_task(self._run_flusher(), name="sns-order-created-flusher")
+            logger.info("SNS publisher started")
+
+    async def stop(self) -> None:
+        """Flush everything still queued (bounded by `sns_publish_drain_timeout`), then stop the flusher."""
+        if self.__flusher is None:
+            return
+        try:
+            await asyncio.wait_for(self.__queue.join(), timeout=self.__drain_timeout)
+        except asyncio.TimeoutError:
+            logger.error("SNS publisher drain timed out", extra={"queue_depth": self.__queue.qsize()})
+        self.__flusher.cancel()
+        try:
+            await self.__flusher
+        except asyncio.CancelledError:
+            pass
+        self.__flusher = None
+        logger.info("SNS publisher stopped")
+
+    @staticmethod
+    def order_created_message(order: OrderResponse, user_id: str) -> str:
+        """Serialize the order-created event payload."""
         message = {
             "order_id": order.order_id,
             "user_id": user_id,
             "items": order.items,
             "total": order.total,
         }
-        payload = json.dumps(message)
+        return json.dumps(message)
 
-        logger.info(
-            "Publishing order-created event",
-            extra={"order_id": order.order_id, "user_id": user_id},
-        )
+    def publish_order_created(self, order: OrderResponse, user_id: str) -> None:
+        """
+        Queues an order-created event for publishing to AWS SNS. Never blocks the request.
 
+        INPUT:
+        - order: OrderResponse object containing order details.
+        - user_id: ID of the user who created the order.
+        """
         try:
-            resp = self.__aws_sns_client.publish(
-                TopicArn=self.__aws_order_created_sns_topic_arn,
-                Message=payload,
-            )
-            logger.debug(
-                "SNS publish response",
-                extra={"message_id": resp.get("MessageId")},
-            )
-        except Exception as e:
+            self.__queue.put_nowait((order.order_id, self.order_created_message(order, user_id)))
+            self.enqueued += 1
+        except asyncio.QueueFull:
+            self.dropped += 1
             logger.error(
-                "Failed to publish SNS message",
-                exc_info=e,
+                "SNS publish queue full, dropping order-created event",
                 extra={"order_id": order.order_id, "user_id": user_id},
             )
+
+    def publish_orders_created(self, orders: list[OrderResponse], user_id: str) -> None:
+        """
+        Queues order-created events for several orders.
+
+        INPUT:
+        - orders: OrderResponse objects for the newly created orders.
+        - user_id: ID of the user who created the orders.
+        """
+        for order in orders:
+            self.publish_order_created(order, user_id)
+
+    async def _run_flusher(self) -> None:
+        """Collect up to 10 queued events (or whatever arrives within the flush interval) and publish them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.__queue.get()]
+            deadline = loop.time() + self.__flush_interval
+            while len(batch) < SNS_PUBLISH_BATCH_MAX_ENTRIES:
+                try:
+                    batch.append(self.__queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                if (remaining := deadline - loop.time()) <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.__queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self.publish_batch(batch)
+            except Exception as e:
+                logger.error("Unexpected error flushing SNS batch", exc_info=e)
+            finally:
+                for _ in batch:
+                    self.__queue.task_done()
+
+    async def publish_batch(self, messages: list[tuple[str, str]]) -> list[str]:
+        """
+        Publish up to 10 messages with one SNS `publish_batch` call, retrying failed entries with backoff.
+
+        INPUT:
+        - messages: (event_id, JSON payload) pairs; event_id is used for logging only.
+
+        RETURN:
+        - event_ids that could not be published after all retries.
+        """
+        started = time.perf_counter()
+        pending = dict(enumerate(messages))  # batch entry Id -> (event_id, payload)
+        undelivered: list[str] = []
+        attempt = 0
+        while pending:
+            entries = [{"Id": str(entry_id), "Message": payload} for entry_id, (_, payload) in pending.items()]
+            retryable: dict[int, tuple[str, str]] = {}
+            try:
+                resp = await asyncio.to_thread(
+                    self.__aws_sns_client.publish_batch,
+                    TopicArn=self.__aws_order_created_sns_topic_arn,
+                    PublishBatchRequestEntries=entries,
+                )
+                self.published += len(resp.get("Successful", []))
+                for failed in resp.get("Failed", []):
+                    entry_id = int(failed["Id"])
+                    if failed.get("SenderFault"):  # malformed entry - retrying won't help
+                        undelivered.append(self._record_failure(pending[entry_id][0], failed.get("Code")))
+                    else:
+                        retryable[entry_id] = pending[entry_id]
+            except Exception as e:
+                logger.warning("SNS publish_batch call failed", exc_info=e, extra={"attempt": attempt})
+                retryable = pending
+
+            if retryable and attempt < self.__max_retries:
+                attempt += 1
+                self.retries += len(retryable)
+                await asyncio.sleep(self.__retry_backoff * 2 ** (attempt - 1))
+                pending = retryable
+                continue
+            undelivered.extend(self._record_failure(event_id, "RetriesExhausted") for event_id, _ in retryable.values())
+            break
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.flushes += 1
+        self.flush_latency_ms_last = latency_ms
+        self.flush_latency_ms_max = max(self.flush_latency_ms_max, latency_ms)
+        self.flush_latency_ms_total += latency_ms
+        return undelivered
+
+    def _record_failure(self, event_id: str, code: str | None) -> str:
+        """Count and log an event that will not be delivered; returns `event_id`."""
+        self.failed += 1
+        logger.error("Failed to publish SNS message", extra={"event_id": event_id, "code": code})
+        return event_id
+
+    def stats(self) -> dict[str, int | float]:
+        """Return queue depth, delivery counters and flush latency for this worker."""
+        return {
+            "queue_depth": self.__queue.qsize(),
+            "enqueued": self.enqueued,
+            "published": self.published,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "retries": self.retries,
+            "flushes": self.flushes,
+            "flush_latency_ms_last": round(self.flush_latency_ms_last, 2),
+            "flush_latency_ms_max": round(self.flush_latency_ms_max, 2),
+            "flush_latency_ms_avg": round(self.flush_latency_ms_total / self.flushes, 2) if self.flushes else 0.0,
+        }
+
+
+notification_service = NotificationService()
@@ -1,33 +1,50 @@
+import base64
+import binascii
+import json
 import time
-from typing import Any
 from uuid import uuid4
 
-from schemas.order import OrderCreate, OrderResponse
-
-# * In-memory store: user_id -> {order_id -> order_data}
-ORDERS: dict[str, dict[str, dict[str, any]]] = {  # type: ignore
-    "programmingwithalex3@gmail.com": {
-        "order-001": {
-            "order_id": "order-001",
-            "items": ["apple", "banana"],
-            "status": "created",
-            "total": 12.5,
-            "timestamp": int(time.time()) - 3600,
-        },
-        "order-002": {
-            "order_id": "order-002",
-            "items": ["notebook", "pen"],
-            "status": "shipped",
-            "total": 23.0,
-            "timestamp": int(time.time()) - 1800,
-        },
+from core.config import get_settings
+from fastapi import status
+from schemas.order import BatchItemResult, BatchOperation, OrderCreate, OrderPage, OrderResponse
+from services.notifications import NotificationService, notification_service
+from stores.order_store import Order, OrderWrite, OutboxEvent, create_order_store, order_sort_key
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+settings = get_settings()
+
+# * backend selected by ORDER_STORE_BACKEND - in-memory dict (single worker) or Redis (multi-worker)
+order_store = create_order_store(settings)
+
+
+def _new_order(order: OrderCreate) -> Order:
+    """Build a stored order (with generated `order_id` and `timestamp`) from a creation payload."""
+    return {
+        "order_id": str(uuid4()),
+        "items": order.items,
+        "status": "created",
+        "total": order.total,
+        "timestamp": int(time.time()),
     }
-}
 
 
-def create_order(order: OrderCreate, user_id: str) -> OrderResponse:
+def _order_created_event(order: OrderResponse, user_id: str) -> OutboxEvent:
+    """Build the outbox event announcing a newly created order."""
+    return {
+        "event_id": str(uuid4()),
+        "type": "order_created",
+        "payload": NotificationService.order_created_message(order, user_id),
+    }
+
+
+async def create_order(order: OrderCreate, user_id: str) -> OrderResponse:
     """
-    Create a new order and store it in the in-memory database.
+    Create a new order and store it in the order store.
+
+    With `order_events_outbox` enabled the order-created event is written to the outbox in the same store
+    write and delivered by `outbox_relay`; otherwise it is handed to the in-process SNS publisher queue.
 
     INPUT:
     - order: OrderCreate object containing order details.
@@ -36,32 +53,74 @@ def create_order(order: OrderCreate, user_id: str) -> OrderResponse:
     RETURN:
     - OrderResponse object containing the created order details.
     """
-    order_id = str(uuid4())
-    new_order = {
-        "order_id": order_id,
-        "items": order.items,
-        "status": "created",
-        "total": order.total,
-        "timestamp": int(time.time()),
-    }
-    ORDERS.setdefault(user_id, {})[order_id] = new_order
-    return OrderResponse(**new_order)
+    new_order = _new_order(order)
+    result = OrderResponse(**new_order)
+    if settings.order_events_outbox:
+        await order_store.create_order(user_id, new_order, outbox=[_order_created_event(result, user_id)])
+    else:
+        await order_store.create_order(user_id, new_order)
+        notification_service.publish_order_created(result, user_id)
+    return result
 
 
-def list_orders(user_id: str) -> list[OrderResponse]:
+def _encode_cursor(order: Order) -> str:
+    """Encode an order's listing position as an opaque, URL-safe pagination cursor."""
+    return base64.urlsafe_b64encode(json.dumps(order_sort_key(order)).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[int, str]:
     """
-    List all orders for a given user.
+    Decode a pagination cursor produced by `_encode_cursor`.
+
+    RAISES:
+    - ValueError: if the cursor is malformed.
+    """
+    try:
+        timestamp, order_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(timestamp), str(order_id)
+    except (TypeError, ValueError, binascii.Error) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+async def list_orders(
+    user_id: str,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    status: str | None = None,
+    since: int | None = None,
+    until: int | None = None,
+) -> OrderPage:
+    """
+    List a page of orders for a given user, oldest first.
 
     INPUT:
     - user_id: ID of the user whose orders are to be listed.
+    - limit: maximum number of orders in the page.
+    - cursor: `next_cursor` from the previous page, or None for the first page.
+    - status: only include orders with this status.
+    - since / until: only include orders with timestamp in [since, until] (epoch seconds).
 
     RETURN:
-    - List of OrderResponse objects containing the details of each order.
+    - OrderPage with the orders and the cursor for the next page (None if this is the last page).
+
+    RAISES:
+    - ValueError: if `cursor` is malformed.
     """
-    return list(ORDERS.get(user_id, {}).values())
+    after = _decode_cursor(cursor) if cursor else None
+    # * ask for one extra order to learn whether another page exists
+    orders = await order_store.list_orders(user_id, limit=limit + 1, after=after, status=status, since=since, until=until)
+    next_cursor = None
+    if len(orders) > limit:
+        orders = orders[:limit]
+        next_cursor = _encode_cursor(orders[-1])
+    # * store data was validated on write - skip per-item re-validation
+    return OrderPage.model_construct(
+        orders=[OrderResponse.model_construct(**order) for order in orders],
+        next_cursor=next_cursor,
+    )
 
 
-def get_order(order_id: str, user_id: str) -> OrderResponse | None:
+async def get_order(order_id: str, user_id: str) -> OrderResponse | None:
     """
     Retrieve a specific order for a given user.
 
@@ -72,10 +131,26 @@ def get_order(order_id: str, user_id: str) -> OrderResponse | None:
     RETURN:
     - OrderResponse object containing the order details, or None if not found.
     """
-    return ORDERS.get(user_id, {}).get(order_id)
+    order = await order_store.get_order(user_id, order_id)
+    return OrderResponse(**order) if order else None
+
+
+async def get_orders_version(user_id: str) -> int:
+    """
+    Retrieve the version of a user's orders, used to tag order lists with an ETag.
+
+    Read it before the orders themselves, so the ETag never describes newer data than the body it is sent with.
+
+    INPUT:
+    - user_id: ID of the user whose orders are versioned.
+
+    RETURN:
+    - Version incremented by every write to the user's orders (0 if never written).
+    """
+    return await order_store.collection_version(user_id)
 
 
-def update_order(order_id: str, order_update: OrderCreate, user_id: str) -> OrderResponse | None:
+async def update_order(order_id: str, order_update: OrderCreate, user_id: str) -> OrderResponse | None:
     """
     Update an existing order for a given user.
 
@@ -87,15 +162,11 @@ def update_order(order_id: str, order_update: OrderCreate, user_id: str) -> Orde
     RETURN:
     - OrderResponse object containing the updated order details, or None if not found.
     """
-    if order_existing := ORDERS.get(user_id, {}).get(order_id):
-        order_final: dict = order_existing.copy()
-        order_final.update(order_update.model_dump())
-        ORDERS[user_id][order_id] = order_final
-        return order_final
-    return None
+    order_final = await order_store.update_order(user_id, order_id, order_update.model_dump())
+    return OrderResponse(**order_final) if order_final else None
 
 
-def delete_order(order_id: str, user_id: str) -> str | Any:
+async def delete_order(order_id: str, user_id: str) -> bool:
     """
     Delete an existing order for a given user.
 
@@ -104,6 +175,86 @@ def delete_order(order_id: str, user_id: str) -> str | Any:
     - user_id: ID of the user whose order is to be deleted.
 
     RETURN:
-    - The deleted order ID, or None if not found.
+    - True if the order was deleted, False if not found.
+    """
+    return await order_store.delete_order(user_id, order_id)
+
+
+async def get_orders_batch(order_ids: list[str], user_id: str) -> tuple[list[OrderResponse], list[str]]:
     """
-    return ORDERS.get(user_id, {}).pop(order_id)
+    Retrieve several orders for a given user in one store round trip.
+
+    INPUT:
+    - order_ids: IDs of the orders to retrieve.
+    - user_id: ID of the user whose orders are to be retrieved.
+
+    RETURN:
+    - (found orders in request order, IDs that were not found).
+    """
+    found: list[OrderResponse] = []
+    missing: list[str] = []
+    for order_id, order in zip(order_ids, await order_store.get_orders(user_id, order_ids)):
+        if order:
+            found.append(OrderResponse(**order))
+        else:
+            missing.append(order_id)
+    return found, missing
+
+
+async def apply_order_batch(operations: list[BatchOperation], user_id: str) -> list[BatchItemResult]:
+    """
+    Apply create/update/delete operations for a given user in one store round trip.
+
+    Order-created events for the batch go into the outbox in that same write (or to the SNS publisher
+    queue when `order_events_outbox` is disabled).
+
+    INPUT:
+    - operations: validated batch operations, applied in order.
+    - user_id: ID of the user whose orders are modified.
+
+    RETURN:
+    - Per-operation results with the status code the single-order endpoint would have returned.
+    """
+    writes: list[OrderWrite] = []
+    created: list[OrderResponse] = []
+    for operation in operations:
+        if operation.op == "create":
+            new_order = _new_order(operation.order)  # type: ignore
+            writes.append(OrderWrite("create", new_order["order_id"], new_order))
+            created.append(OrderResponse(**new_order))
+        elif operation.op == "update":
+            writes.append(OrderWrite("update", operation.order_id, operation.order.model_dump()))  # type: ignore
+        else:
+            writes.append(OrderWrite("delete", operation.order_id))  # type: ignore
+
+    if settings.order_events_outbox:
+        stored_orders = await order_store.apply_batch(
+            user_id, writes, outbox=[_order_created_event(order, user_id) for order in created]
+        )
+    else:
+        stored_orders = await order_store.apply_batch(user_id, writes)
+        notification_service.publish_orders_created(created, user_id)
+
+    results: list[BatchItemResult] = []
+    for write, stored in zip(writes, stored_orders):
+        if stored is None:
+            results.append(
+                BatchItemResult(
+                    op=write.op, order_id=write.order_id, status_code=status.HTTP_404_NOT_FOUND, error="Order not found"
+                )
+            )
+        elif write.op == "create":
+            results.append(
+                BatchItemResult(
+                    op="create", order_id=write.order_id, status_code=status.HTTP_201_CREATED, order=OrderResponse(**stored)
+                )
+            )
+        elif write.op == "update":
+            results.append(
+                BatchItemResult(
+                    op="update", order_id=write.order_id, status_code=status.HTTP_200_OK, order=OrderResponse(**stored)
+                )
+            )
+        else:
+            results.append(BatchItemResult(op="delete", order_id=write.order_id, status_code=status.HTTP_204_NO_CONTENT))
+    return results
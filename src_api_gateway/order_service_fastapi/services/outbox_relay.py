@@ -0,0 +1,114 @@
+import asyncio
+import logging
+
+from core.config import get_settings
+from services.notifications import SNS_PUBLISH_BATCH_MAX_ENTRIES, NotificationService, notification_service
+from services.orders import order_store
+from stores.order_store import OrderStore
+
+logger = logging.getLogger(__name__)  # pulling logging config from the main app.py file
+
+
+class OutboxRelay:
+    """
+    Background worker that delivers order events from the store's outbox to SNS.
+
+    Each pass claims up to 10 due events (one SNS `publish_batch`), publishes them and acknowledges the ones
+    SNS accepted. Unacknowledged events become due again once their lease expires, so delivery is at-least-once
+    even if the process dies mid-batch. Events claimed more than `outbox_max_attempts` times are dropped as
+    dead letters and logged. Every worker / ECS task can run a relay against the same Redis outbox.
+    """
+
+    def __init__(self, store: OrderStore, notifications: NotificationService) -> None:
+        settings = get_settings()
+        self.__store = store
+        self.__notifications = notifications
+        self.__poll_interval = settings.outbox_relay_poll_interval
+        self.__lease_seconds = settings.outbox_relay_lease_seconds
+        self.__max_attempts = settings.outbox_max_attempts
+        self.__drain_timeout = settings.sns_publish_drain_timeout
+        self.__task: asyncio.Task | None = None
+
+        # * metrics
+        self.relayed = 0
+        self.redelivery_pending = 0
+        self.dead_lettered = 0
+
+    async def start(self) -> None:
+        """Start the relay loop. Called once from `core.lifespan`."""
+        if self.__task is None:
+            self.__task = asyncio.create_task(self._run(), name="order-outbox-relay")
+            logger.info("Outbox relay started")
+
+    async def stop(self) -> None:
+        """Stop the relay loop, then make a bounded final pass over events that are already due."""
+        if self.__task is None:
+            return
+        self.__task.cancel()
+        try:
+            await self.__task
+        except asyncio.CancelledError:
+            pass
+        self.__task = None
+        try:
+            await asyncio.wait_for(self._drain(), timeout=self.__drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Outbox relay drain timed out - remaining events are delivered after restart")
+        logger.info("Outbox relay stopped")
+
+    async def _drain(self) -> None:
+        """Relay until no due events are left."""
+        while await self.relay_once():
+            pass
+
+    async def _run(self) -> None:
+        """Relay continuously, sleeping `outbox_relay_poll_interval` whenever the outbox has nothing due."""
+        while True:
+            try:
+                if await self.relay_once():
+                    continue
+            except Exception as e:
+                logger.error("Outbox relay pass failed", exc_info=e)
+            await asyncio.sleep(self.__poll_interval)
+
+    async def relay_once(self) -> int:
+        """
+        Claim, publish and acknowledge one batch of due outbox events.
+
+        RETURN:
+        - Number of events claimed (0 when nothing was due).
+        """
+        events = await self.__store.claim_outbox(SNS_PUBLISH_BATCH_MAX_ENTRIES, self.__lease_seconds)
+        if not events:
+            return 0
+
+        dead = [event for event in events if event["attempts"] > self.__max_attempts]
+        for event in dead:
+            logger.error(
+                "Dropping outbox event after max delivery attempts",
+                extra={"event_id": event["event_id"], "type": event.get("type"), "payload": event.get("payload")},
+            )
+        self.dead_lettered += len(dead)
+
+        live = [event for event in events if event["attempts"] <= self.__max_attempts]
+        undelivered: set[str] = set()
+        if live:
+            undelivered = set(await self.__notifications.publish_batch([(e["event_id"], e["payload"]) for e in live]))
+        delivered = [event["event_id"] for event in live if event["event_id"] not in undelivered]
+
+        await self.__store.ack_outbox(delivered + [event["event_id"] for event in dead])
+        self.relayed += len(delivered)
+        self.redelivery_pending += len(undelivered)
+        return len(events)
+
+    async def stats(self) -> dict[str, int]:
+        """Return relay counters and the current outbox size."""
+        return {
+            "outbox_size": await self.__store.outbox_size(),
+            "relayed": self.relayed,
+            "redelivery_pending": self.redelivery_pending,
+            "dead_lettered": self.dead_lettered,
+        }
+
+
+outbox_relay = OutboxRelay(order_store, notification_service)
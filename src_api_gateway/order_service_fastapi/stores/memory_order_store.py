@@ -0,0 +1,147 @@
+import bisect
+import itertools
+import time
+from typing import Any
+
+from stores.order_store import Order, OrderStore, OutboxEvent, order_sort_key
+
+
+def _demo_orders() -> dict[str, dict[str, Order]]:
+    """Sample orders used for local development."""
+    return {
+        "programmingwithalex3@gmail.com": {
+            "order-001": {
+                "order_id": "order-001",
+                "items": ["apple", "banana"],
+                "status": "created",
+                "total": 12.5,
+                "timestamp": int(time.time()) - 3600,
+            },
+            "order-002": {
+                "order_id": "order-002",
+                "items": ["notebook", "pen"],
+                "status": "shipped",
+                "total": 23.0,
+                "timestamp": int(time.time()) - 1800,
+            },
+        }
+    }
+
+
+class InMemoryOrderStore(OrderStore):
+    """
+    Per-process order store: user_id -> {order_id -> order_data}, plus a per-user (timestamp, order_id) index.
+
+    Each uvicorn worker gets its own copy, so only use with a single worker.
+    """
+
+    def __init__(self, seed_demo_data: bool = False) -> None:
+        self.orders: dict[str, dict[str, Order]] = _demo_orders() if seed_demo_data else {}
+        # * user_id -> sorted [(timestamp, order_id), ...] - time-ordered index used for listing/pagination
+        self.index: dict[str, list[tuple[int, str]]] = {
+            user_id: sorted(order_sort_key(order) for order in orders.values()) for user_id, orders in self.orders.items()
+        }
+        # * user_id -> collection version, bumped on every write to the user's orders (list ETags)
+        self.versions: dict[str, int] = {}
+        # * outbox: event_id -> event (insertion ordered) and event_id -> monotonic time the event is next due
+        self.outbox: dict[str, OutboxEvent] = {}
+        self.outbox_due: dict[str, float] = {}
+
+    async def create_order(self, user_id: str, order: Order, outbox: list[OutboxEvent] | None = None) -> Order:
+        """Persist a new order for a user, together with any outbox events."""
+        self.orders.setdefault(user_id, {})[order["order_id"]] = order
+        bisect.insort(self.index.setdefault(user_id, []), order_sort_key(order))
+        self.versions[user_id] = self.versions.get(user_id, 0) + 1
+        if outbox:
+            await self._append_outbox(outbox)
+        return order
+
+    async def list_orders(
+        self,
+        user_id: str,
+        limit: int | None = None,
+        after: tuple[int, str] | None = None,
+        status: str | None = None,
+        since: int | None = None,
+        until: int | None = None,
+    ) -> list[Order]:
+        """List a user's orders ordered by (timestamp, order_id), oldest first, with filters applied."""
+        index = self.index.get(user_id, [])
+        orders = self.orders.get(user_id, {})
+
+        start = 0
+        if after is not None:
+            start = bisect.bisect_right(index, after)
+        if since is not None:
+            start = max(start, bisect.bisect_left(index, (since, "")))
+
+        result: list[Order] = []
+        for timestamp, order_id in itertools.islice(index, start, None):
+            if until is not None and timestamp > until:
+                break
+            order = orders[order_id]
+            if status is not None and order["status"] != status:
+                continue
+            result.append(order)
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+    async def get_order(self, user_id: str, order_id: str) -> Order | None:
+        """Retrieve a single order."""
+        return self.orders.get(user_id, {}).get(order_id)
+
+    async def update_order(self, user_id: str, order_id: str, fields: dict[str, Any]) -> Order | None:
+        """Merge `fields` into an existing order."""
+        if order_existing := self.orders.get(user_id, {}).get(order_id):
+            order_final = {**order_existing, **fields}
+            self.orders[user_id][order_id] = order_final
+            if order_sort_key(order_final) != order_sort_key(order_existing):
+                self.index[user_id].remove(order_sort_key(order_existing))
+                bisect.insort(self.index[user_id], order_sort_key(order_final))
+            self.versions[user_id] = self.versions.get(user_id, 0) + 1
+            return order_final
+        return None
+
+    async def delete_order(self, user_id: str, order_id: str) -> bool:
+        """Delete an order."""
+        order = self.orders.get(user_id, {}).pop(order_id, None)
+        if order is None:
+            return False
+        self.index[user_id].remove(order_sort_key(order))
+        self.versions[user_id] = self.versions.get(user_id, 0) + 1
+        return True
+
+    async def collection_version(self, user_id: str) -> int:
+        """Version of a user's orders, bumped by every write."""
+        return self.versions.get(user_id, 0)
+
+    async def _append_outbox(self, events: list[OutboxEvent]) -> None:
+        """Enqueue outbox events, due immediately."""
+        now = time.monotonic()
+        for event in events:
+            self.outbox[event["event_id"]] = {**event, "attempts": 0}
+            self.outbox_due[event["event_id"]] = now
+
+    async def claim_outbox(self, limit: int, lease_seconds: float) -> list[OutboxEvent]:
+        """Claim up to `limit` due outbox events, hiding them for `lease_seconds`."""
+        now = time.monotonic()
+        claimed: list[OutboxEvent] = []
+        for event_id, event in self.outbox.items():
+            if len(claimed) >= limit:
+                break
+            if self.outbox_due[event_id] <= now:
+                event["attempts"] += 1
+                self.outbox_due[event_id] = now + lease_seconds
+                claimed.append(dict(event))
+        return claimed
+
+    async def ack_outbox(self, event_ids: list[str]) -> None:
+        """Remove delivered (or dead-lettered) events from the outbox."""
+        for event_id in event_ids:
+            self.outbox.pop(event_id, None)
+            self.outbox_due.pop(event_id, None)
+
+    async def outbox_size(self) -> int:
+        """Number of events still in the outbox."""
+        return len(self.outbox)
@@ -0,0 +1,226 @@
+from abc import ABC, abstractmethod
+from typing import Any, NamedTuple
+
+from core.config import Settings
+
+# * stored order shape: {"order_id": str, "items": list[str], "status": str, "total": float, "timestamp": int}
+Order = dict[str, Any]
+
+# * outbox event shape: {"event_id": str, "type": str, "payload": str (JSON), "attempts": int (set when claimed)}
+OutboxEvent = dict[str, Any]
+
+
+def order_sort_key(order: Order) -> tuple[int, str]:
+    """Position of an order in a user's time-ordered listing; also what pagination cursors encode."""
+    return (order["timestamp"], order["order_id"])
+
+
+class OrderWrite(NamedTuple):
+    """One write in an `OrderStore.apply_batch` call."""
+
+    op: str  # "create" | "update" | "delete"
+    order_id: str
+    fields: dict[str, Any] | None = None  # full order for create, changed fields for update, None for delete
+
+
+class OrderStore(ABC):
+    """
+    Storage backend for orders, keyed by user_id then order_id.
+
+    Also holds the transactional outbox: events passed alongside an order write are stored in the same
+    write, and `outbox_relay` later claims, publishes and acknowledges them (at-least-once delivery).
+    """
+
+    @abstractmethod
+    async def create_order(self, user_id: str, order: Order, outbox: list[OutboxEvent] | None = None) -> Order:
+        """
+        Persist a new order for a user, together with any outbox events.
+
+        INPUT:
+        - user_id: ID of the user owning the order.
+        - order: complete order dict, including `order_id` and `timestamp`.
+        - outbox: events to enqueue atomically with the order write.
+
+        RETURN:
+        - The stored order.
+        """
+
+    @abstractmethod
+    async def list_orders(
+        self,
+        user_id: str,
+        limit: int | None = None,
+        after: tuple[int, str] | None = None,
+        status: str | None = None,
+        since: int | None = None,
+        until: int | None = None,
+    ) -> list[Order]:
+        """
+        List a user's orders ordered by (timestamp, order_id), oldest first, with filters applied in the store.
+
+        INPUT:
+        - user_id: ID of the user whose orders are to be listed.
+        - limit: maximum number of orders to return (None for all).
+        - after: (timestamp, order_id) position to resume after, exclusive - decoded pagination cursor.
+        - status: only return orders with this status.
+        - since: only return orders with timestamp >= since (epoch seconds).
+        - until: only return orders with timestamp <= until (epoch seconds).
+
+        RETURN:
+        - List of stored orders.
+        """
+
+    @abstractmethod
+    async def get_order(self, user_id: str, order_id: str) -> Order | None:
+        """
+        Retrieve a single order.
+
+        INPUT:
+        - user_id: ID of the user owning the order.
+        - order_id: ID of the order to retrieve.
+
+        RETURN:
+        - The stored order, or None if not found.
+        """
+
+    @abstractmethod
+    async def update_order(self, user_id: str, order_id: str, fields: dict[str, Any]) -> Order | None:
+        """
+        Merge `fields` into an existing order.
+
+        INPUT:
+        - user_id: ID of the user owning the order.
+        - order_id: ID of the order to update.
+        - fields: order fields to overwrite.
+
+        RETURN:
+        - The updated order, or None if not found.
+        """
+
+    @abstractmethod
+    async def delete_order(self, user_id: str, order_id: str) -> bool:
+        """
+        Delete an order.
+
+        INPUT:
+        - user_id: ID of the user owning the order.
+        - order_id: ID of the order to delete.
+
+        RETURN:
+        - True if the order existed and was deleted, False otherwise.
+        """
+
+    @abstractmethod
+    async def collection_version(self, user_id: str) -> int:
+        """
+        Version of a user's orders, incremented by every write to them (in that same write).
+
+        Read it before listing: a listing read after version N is at least as new as N, so a list ETag
+        derived from N never labels stale orders.
+
+        INPUT:
+        - user_id: ID of the user owning the orders.
+
+        RETURN:
+        - The current version, 0 for a user whose orders were never written.
+        """
+
+    async def get_orders(self, user_id: str, order_ids: list[str]) -> list[Order | None]:
+        """
+        Retrieve several orders at once. Backends override this to use a single round trip.
+
+        INPUT:
+        - user_id: ID of the user owning the orders.
+        - order_ids: IDs of the orders to retrieve.
+
+        RETURN:
+        - Orders in `order_ids` order, None where an order does not exist.
+        """
+        return [await self.get_order(user_id, order_id) for order_id in order_ids]
+
+    async def apply_batch(
+        self, user_id: str, writes: list[OrderWrite], outbox: list[OutboxEvent] | None = None
+    ) -> list[Order | None]:
+        """
+        Apply several writes in order, plus any outbox events. Backends override this to use a single round trip.
+
+        INPUT:
+        - user_id: ID of the user owning the orders.
+        - writes: creates / updates / deletes, applied sequentially.
+        - outbox: events to enqueue together with the writes.
+
+        RETURN:
+        - Per write: the created or updated order, the deleted order for deletes, or None if the order did not exist.
+        """
+        results: list[Order | None] = []
+        for write in writes:
+            if write.op == "create":
+                results.append(await self.create_order(user_id, write.fields or {}))
+            elif write.op == "update":
+                results.append(await self.update_order(user_id, write.order_id, write.fields or {}))
+            else:
+                existing = await self.get_order(user_id, write.order_id)
+                results.append(existing if existing and await self.delete_order(user_id, write.order_id) else None)
+        if outbox:
+            await self._append_outbox(outbox)
+        return results
+
+    @abstractmethod
+    async def _append_outbox(self, events: list[OutboxEvent]) -> None:
+        """
+        Enqueue outbox events on their own, due immediately (used by the default `apply_batch`).
+
+        INPUT:
+        - events: events to enqueue.
+        """
+
+    @abstractmethod
+    async def claim_outbox(self, limit: int, lease_seconds: float) -> list[OutboxEvent]:
+        """
+        Claim up to `limit` due outbox events for delivery.
+
+        Claimed events stay in the outbox but are hidden for `lease_seconds`; if they are not acknowledged
+        in time (relay crashed, SNS failed) they become due again. Each claim increments `attempts`.
+
+        INPUT:
+        - limit: maximum number of events to claim.
+        - lease_seconds: how long claimed events are hidden from other claims.
+
+        RETURN:
+        - Claimed events, oldest first.
+        """
+
+    @abstractmethod
+    async def ack_outbox(self, event_ids: list[str]) -> None:
+        """
+        Remove delivered (or dead-lettered) events from the outbox.
+
+        INPUT:
+        - event_ids: IDs of the events to remove.
+        """
+
+    @abstractmethod
+    async def outbox_size(self) -> int:
+        """Number of events still in the outbox (due or leased)."""
+
+    async def close(self) -> None:
+        """Release backend resources (connection pools). Called from `core.lifespan` on shutdown."""
+
+
+def create_order_store(settings: Settings) -> OrderStore:
+    """
+    Build the order store selected by `settings.order_store_backend`.
+
+    - `memory`: per-process dict, only consistent with a single uvicorn worker.
+    - `redis`: shared Redis hashes, safe for multiple workers and multiple ECS tasks.
+    """
+    backend = settings.order_store_backend.lower()
+    if backend == "memory":
+        from stores.memory_order_store import InMemoryOrderStore
+
+        return InMemoryOrderStore(seed_demo_data=True)
+    if backend == "redis":
+        from stores.redis_order_store import RedisOrderStore
+
+        return RedisOrderStore.from_settings(settings)
+    raise ValueError(f"Unknown ORDER_STORE_BACKEND: {settings.order_store_backend!r} (expected 'memory' or 'redis')")
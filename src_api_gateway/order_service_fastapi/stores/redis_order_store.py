@@ -0,0 +1,302 @@
+import json
+import logging
+import time
+from typing import Any
+
+import redis.asyncio as redis
+from core.config import Settings
+from redis.exceptions import WatchError
+from stores.order_store import Order, OrderStore, OrderWrite, OutboxEvent
+
+logger = logging.getLogger(__name__)  # pulling logging config from the main app.py file
+
+# * atomically pick due outbox events, push their due time out by the lease and bump their attempt counter
+# * KEYS: outbox zset, outbox events hash, outbox attempts hash - ARGV: now, limit, lease expiry
+_CLAIM_OUTBOX_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+local claimed = {}
+for _, id in ipairs(ids) do
+    redis.call('ZADD', KEYS[1], ARGV[3], id)
+    local attempts = redis.call('HINCRBY', KEYS[3], id, 1)
+    table.insert(claimed, id)
+    table.insert(claimed, redis.call('HGET', KEYS[2], id) or '')
+    table.insert(claimed, attempts)
+end
+return claimed
+"""
+
+
+class RedisOrderStore(OrderStore):
+    """
+    Redis-backed order store shared by every worker and ECS task.
+
+    Layout per user:
+    - `{prefix}:{user_id}`        hash     order_id -> order JSON
+    - `{prefix}:{user_id}:by_ts`  zset     order_id scored by timestamp (time-ordered index)
+    - `{prefix}:{user_id}:version` string  counter incremented by every write to the user's orders (list ETags)
+
+    Outbox (shared by all users):
+    - `{prefix}:outbox`           zset     event_id scored by the epoch time it is next due
+    - `{prefix}:outbox:events`    hash     event_id -> event JSON
+    - `{prefix}:outbox:attempts`  hash     event_id -> delivery attempts
+
+    Writes touching several keys go through a MULTI/EXEC pipeline so the hash, index and outbox never diverge
+    (this needs a non-cluster Redis, as the keys do not share a hash slot).
+    """
+
+    LIST_BATCH_SIZE = 100  # index IDs fetched per round trip when a status filter is applied
+
+    def __init__(self, client: redis.Redis, key_prefix: str = "orders") -> None:
+        self.__redis = client
+        self.__key_prefix = key_prefix
+        self.__claim_outbox = self.__redis.register_script(_CLAIM_OUTBOX_SCRIPT)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "RedisOrderStore":
+        """Create a store with its own connection pool from application settings."""
+        client = redis.Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            db=settings.redis_db,
+            ssl=settings.redis_ssl,  # must be enabled if connecting to Redis in AWS ElastiCache
+            decode_responses=True,  # orders are stored as JSON strings
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_timeout,
+            max_connections=settings.redis_max_connections,
+        )
+        logger.info("RedisOrderStore connecting to %s:%s", settings.redis_host, settings.redis_port)
+        return cls(client, key_prefix=settings.order_store_key_prefix)
+
+    def _orders_key(self, user_id: str) -> str:
+        """Hash holding a user's orders."""
+        return f"{self.__key_prefix}:{user_id}"
+
+    def _index_key(self, user_id: str) -> str:
+        """Sorted set indexing a user's orders by timestamp."""
+        return f"{self.__key_prefix}:{user_id}:by_ts"
+
+    def _version_key(self, user_id: str) -> str:
+        """Counter bumped by every write to a user's orders."""
+        return f"{self.__key_prefix}:{user_id}:version"
+
+    def _outbox_keys(self) -> tuple[str, str, str]:
+        """Outbox due-time zset, event hash and attempts hash."""
+        return (
+            f"{self.__key_prefix}:outbox",
+            f"{self.__key_prefix}:outbox:events",
+            f"{self.__key_prefix}:outbox:attempts",
+        )
+
+    def _queue_outbox(self, pipe: redis.client.Pipeline, events: list[OutboxEvent] | None) -> None:
+        """Add outbox writes to an open MULTI pipeline, due immediately."""
+        if not events:
+            return
+        due_key, events_key, _ = self._outbox_keys()
+        now = time.time()
+        pipe.hset(events_key, mapping={event["event_id"]: json.dumps(event) for event in events})
+        pipe.zadd(due_key, {event["event_id"]: now for event in events})
+
+    async def create_order(self, user_id: str, order: Order, outbox: list[OutboxEvent] | None = None) -> Order:
+        """Persist a new order for a user (hash, index and outbox writes in one transaction)."""
+        async with self.__redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._orders_key(user_id), order["order_id"], json.dumps(order))
+            pipe.zadd(self._index_key(user_id), {order["order_id"]: order["timestamp"]})
+            pipe.incr(self._version_key(user_id))
+            self._queue_outbox(pipe, outbox)
+            await pipe.execute()
+        return order
+
+    async def list_orders(
+        self,
+        user_id: str,
+        limit: int | None = None,
+        after: tuple[int, str] | None = None,
+        status: str | None = None,
+        since: int | None = None,
+        until: int | None = None,
+    ) -> list[Order]:
+        """
+        List a user's orders ordered by (timestamp, order_id), oldest first, with filters applied.
+
+        The time range and cursor are resolved against the sorted-set index with ZRANGEBYSCORE (members sharing
+        a score are ordered by order_id, matching the cursor order), then only the selected order IDs are read
+        from the hash. A status filter may need extra index pages, fetched `LIST_BATCH_SIZE` IDs at a time.
+        """
+        index_key = self._index_key(user_id)
+        lower: int | str = since if since is not None else "-inf"
+        upper: int | str = until if until is not None else "+inf"
+        result: list[Order] = []
+
+        if after is not None:
+            after_timestamp, after_order_id = after
+            if until is not None and after_timestamp > until:
+                return result
+            if since is None or after_timestamp >= since:
+                # * remaining orders in the same second as the cursor, then strictly later seconds
+                same_second: list[str] = await self.__redis.zrangebyscore(  # type: ignore
+                    index_key, after_timestamp, after_timestamp
+                )
+                tail = [order_id for order_id in same_second if order_id > after_order_id]
+                if await self._collect(user_id, tail, result, limit, status):
+                    return result
+                lower = f"({after_timestamp}"
+
+        batch_size = limit if (limit is not None and status is None) else max(limit or 0, self.LIST_BATCH_SIZE)
+        offset = 0
+        while True:
+            order_ids: list[str] = await self.__redis.zrangebyscore(  # type: ignore
+                index_key, lower, upper, start=offset, num=batch_size
+            )
+            if await self._collect(user_id, order_ids, result, limit, status) or len(order_ids) < batch_size:
+                return result
+            offset += batch_size
+
+    async def _collect(
+        self, user_id: str, order_ids: list[str], result: list[Order], limit: int | None, status: str | None
+    ) -> bool:
+        """Load `order_ids` from the hash, append those matching `status` to `result`; return True once `limit` is hit."""
+        if not order_ids:
+            return False
+        for raw in await self.__redis.hmget(self._orders_key(user_id), order_ids):
+            if raw is None:
+                continue
+            order = json.loads(raw)
+            if status is not None and order.get("status") != status:
+                continue
+            result.append(order)
+            if limit is not None and len(result) >= limit:
+                return True
+        return False
+
+    async def get_order(self, user_id: str, order_id: str) -> Order | None:
+        """Retrieve a single order."""
+        raw = await self.__redis.hget(self._orders_key(user_id), order_id)
+        return json.loads(raw) if raw is not None else None
+
+    async def update_order(self, user_id: str, order_id: str, fields: dict[str, Any]) -> Order | None:
+        """Merge `fields` into an existing order, retrying if another writer touches the hash concurrently."""
+        key = self._orders_key(user_id)
+        async with self.__redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    raw = await pipe.hget(key, order_id)
+                    if raw is None:
+                        await pipe.unwatch()
+                        return None
+                    order_final = {**json.loads(raw), **fields}
+                    pipe.multi()
+                    pipe.hset(key, order_id, json.dumps(order_final))
+                    pipe.incr(self._version_key(user_id))
+                    await pipe.execute()
+                    return order_final
+                except WatchError:
+                    continue
+
+    async def delete_order(self, user_id: str, order_id: str) -> bool:
+        """Delete an order from the hash and the timestamp index."""
+        async with self.__redis.pipeline(transaction=True) as pipe:
+            pipe.hdel(self._orders_key(user_id), order_id)
+            pipe.zrem(self._index_key(user_id), order_id)
+            pipe.incr(self._version_key(user_id))  # also bumped when nothing was deleted - only costs a revalidation
+            deleted, _, _ = await pipe.execute()
+        return bool(deleted)
+
+    async def collection_version(self, user_id: str) -> int:
+        """Version of a user's orders, bumped by every write."""
+        return int(await self.__redis.get(self._version_key(user_id)) or 0)
+
+    async def get_orders(self, user_id: str, order_ids: list[str]) -> list[Order | None]:
+        """Retrieve several orders with a single HMGET."""
+        raw_orders = await self.__redis.hmget(self._orders_key(user_id), order_ids)
+        return [json.loads(raw) if raw is not None else None for raw in raw_orders]
+
+    async def apply_batch(
+        self, user_id: str, writes: list[OrderWrite], outbox: list[OutboxEvent] | None = None
+    ) -> list[Order | None]:
+        """
+        Apply several writes and outbox events with one read (HMGET of touched orders) and one MULTI/EXEC.
+
+        The user's hash is WATCHed between the read and the write, so the batch is retried
+        if another writer modifies the user's orders concurrently.
+        """
+        key, index_key = self._orders_key(user_id), self._index_key(user_id)
+        touched_ids = list(dict.fromkeys(w.order_id for w in writes if w.op != "create"))
+        async with self.__redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    current: dict[str, Order | None] = {}
+                    if touched_ids:
+                        raw_orders = await pipe.hmget(key, touched_ids)
+                        current = {oid: json.loads(raw) if raw else None for oid, raw in zip(touched_ids, raw_orders)}
+
+                    changed: set[str] = set()
+                    results: list[Order | None] = []
+                    for write in writes:  # resolve sequentially so later writes see earlier ones
+                        if write.op == "create":
+                            current[write.order_id] = dict(write.fields or {})
+                            changed.add(write.order_id)
+                            results.append(current[write.order_id])
+                        elif (existing := current.get(write.order_id)) is None:
+                            results.append(None)
+                        elif write.op == "update":
+                            current[write.order_id] = {**existing, **(write.fields or {})}
+                            changed.add(write.order_id)
+                            results.append(current[write.order_id])
+                        else:
+                            current[write.order_id] = None
+                            changed.add(write.order_id)
+                            results.append(existing)
+
+                    upserts: dict[str, Order] = {oid: order for oid in changed if (order := current[oid]) is not None}
+                    deletes = [oid for oid in changed if current[oid] is None]
+                    pipe.multi()
+                    if upserts:
+                        pipe.hset(key, mapping={oid: json.dumps(order) for oid, order in upserts.items()})
+                        pipe.zadd(index_key, {oid: order["timestamp"] for oid, order in upserts.items()})
+                    if deletes:
+                        pipe.hdel(key, *deletes)
+                        pipe.zrem(index_key, *deletes)
+                    if changed:
+                        pipe.incr(self._version_key(user_id))
+                    self._queue_outbox(pipe, outbox)
+                    await pipe.execute()
+                    return results
+                except WatchError:
+                    continue
+
+    async def _append_outbox(self, events: list[OutboxEvent]) -> None:
+        """Enqueue outbox events (event hash and due-time zset) in one transaction."""
+        async with self.__redis.pipeline(transaction=True) as pipe:
+            self._queue_outbox(pipe, events)
+            await pipe.execute()
+
+    async def claim_outbox(self, limit: int, lease_seconds: float) -> list[OutboxEvent]:
+        """Claim up to `limit` due outbox events with one Lua call, hiding them for `lease_seconds`."""
+        now = time.time()
+        flat = await self.__claim_outbox(keys=list(self._outbox_keys()), args=[now, limit, now + lease_seconds])
+        claimed: list[OutboxEvent] = []
+        for event_id, raw, attempts in zip(flat[0::3], flat[1::3], flat[2::3]):  # flat (event_id, event JSON, attempts)
+            event = json.loads(raw) if raw else {"event_id": event_id, "type": "missing", "payload": ""}
+            claimed.append({**event, "attempts": int(attempts)})
+        return claimed
+
+    async def ack_outbox(self, event_ids: list[str]) -> None:
+        """Remove delivered (or dead-lettered) events from the outbox in one transaction."""
+        if not event_ids:
+            return
+        due_key, events_key, attempts_key = self._outbox_keys()
+        async with self.__redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(due_key, *event_ids)
+            pipe.hdel(events_key, *event_ids)
+            pipe.hdel(attempts_key, *event_ids)
+            await pipe.execute()
+
+    async def outbox_size(self) -> int:
+        """Number of events still in the outbox."""
+        return await self.__redis.zcard(self._outbox_keys()[0])
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self.__redis.aclose()
@@ -0,0 +1,35 @@
+import os
+from typing import AsyncGenerator
+
+import fakeredis
+import pytest
+
+# * settings are read when the app modules are imported - required ones get test values, flags come from a local file
+os.environ.setdefault("AUTH_SERVICE_URL", "http://auth:8000")
+os.environ.setdefault("AWS_ORDER_CREATED_SNS_TOPIC_ARN", "arn:aws:sns:us-east-1:000000000000:order-created")
+os.environ.setdefault("AWS_APP_CONFIG_FEATURE_FLAG_KEY_API_GATEWAY_AUTHORIZER_AUTH_SERVICE", "auth_service")
+os.environ.setdefault("AWS_APP_CONFIG_FEATURE_FLAG_KEY_API_GATEWAY_AUTHORIZER_LAMBDA_AUTHORIZER", "lambda_authorizer")
+os.environ.setdefault("AWS_APP_CONFIG_PROVIDER", "file")
+os.environ.setdefault("ORDER_STORE_BACKEND", "memory")
+
+from stores.redis_order_store import RedisOrderStore  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    """Run `pytest.mark.anyio` tests on asyncio only."""
+    return "asyncio"
+
+
+@pytest.fixture
+def redis_server() -> fakeredis.FakeServer:
+    """In-process fake redis server (Lua scripting included), fresh per test."""
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+async def redis_store(redis_server: fakeredis.FakeServer) -> AsyncGenerator[RedisOrderStore, None]:
+    """RedisOrderStore on the fake redis server, keys prefixed with `test-orders`."""
+    client = fakeredis.FakeAsyncRedis(server=redis_server, decode_responses=True)
+    yield RedisOrderStore(client, key_prefix="test-orders")
+    await client.aclose()
@@ -0,0 +1,69 @@
+import json
+from typing import AsyncGenerator
+
+import httpx
+import pytest
+from clients.auth_client import AuthClient
+from core.config import get_settings
+from pytest import MonkeyPatch
+
+pytestmark = pytest.mark.anyio
+
+BATCH_MAX_SIZE = 3
+
+
+@pytest.fixture
+def batches() -> list[list[str]]:
+    """Session IDs of every `/verify/batch` request sent to the fake auth_service."""
+    return []
+
+
+@pytest.fixture
+async def client(monkeypatch: MonkeyPatch, batches: list[list[str]]) -> AsyncGenerator[AuthClient, None]:
+    """AuthClient talking to a fake auth_service that knows every session ID starting with `ok`."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path != "/verify/batch":
+            return httpx.Response(404)
+        session_ids = json.loads(request.content)["session_ids"]
+        if "boom" in session_ids:
+            return httpx.Response(500)
+        batches.append(session_ids)
+        sessions = {sid: ({"email": f"{sid}@x"} if sid.startswith("ok") else None) for sid in session_ids}
+        return httpx.Response(200, json={"sessions": sessions})
+
+    monkeypatch.setattr(get_settings(), "auth_client_verify_batch_max_size", BATCH_MAX_SIZE)
+    upstream = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://auth")
+    auth = AuthClient()
+
+    async def get_client() -> httpx.AsyncClient:
+        return upstream
+
+    monkeypatch.setattr(auth, "_get_client", get_client)
+    yield auth
+    await upstream.aclose()
+
+
+async def test_verify_sessions_sends_chunks_of_at_most_the_batch_size(client: AuthClient, batches: list[list[str]]) -> None:
+    """IDs are de-duplicated and split into chunks of the configured batch size; every answer is merged back."""
+    session_ids = [f"ok-{i}" for i in range(BATCH_MAX_SIZE * 2 + 1)] + ["bad", "ok-0", ""]
+
+    results = await client.verify_sessions(session_ids)
+
+    assert sorted(len(batch) for batch in batches) == [2, BATCH_MAX_SIZE, BATCH_MAX_SIZE]
+    assert sorted(sum(batches, [])) == sorted(set(session_ids) - {""})
+    assert len(results) == BATCH_MAX_SIZE * 2 + 2
+    assert results["ok-0"] == "ok-0@x"
+    assert results["bad"] is None
+
+
+async def test_verify_sessions_without_ids_skips_auth_service(client: AuthClient, batches: list[list[str]]) -> None:
+    """Nothing to verify means no upstream call."""
+    assert await client.verify_sessions(["", ""]) == {}
+    assert batches == []
+
+
+async def test_verify_sessions_raises_on_auth_service_errors(client: AuthClient) -> None:
+    """A failed chunk raises instead of reporting its sessions as invalid."""
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.verify_sessions(["ok-1", "boom"])
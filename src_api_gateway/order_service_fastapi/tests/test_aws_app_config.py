@@ -0,0 +1,119 @@
+import asyncio
+import io
+import json
+from typing import Any, Callable
+
+import pytest
+from aws_app_config import aws_app_config
+from aws_app_config.aws_app_config import RETRY_INTERVAL_SECONDS, AWSAppConfig
+from pytest import MonkeyPatch
+
+pytestmark = pytest.mark.anyio
+
+ECS_ENABLED = {"api_gateway_authorizer_ecs_auth_service": {"enabled": True}}
+ECS_DISABLED = {"api_gateway_authorizer_ecs_auth_service": {"enabled": False}}
+REAL_SLEEP = asyncio.sleep  # the poller's sleep is replaced in tests
+
+
+def configuration(token: str, interval: int, flags: dict | None = None) -> dict[str, Any]:
+    """get_latest_configuration response - an empty body means the configuration did not change."""
+    body = json.dumps(flags).encode() if flags is not None else b""
+    return {"NextPollConfigurationToken": token, "NextPollIntervalInSeconds": interval, "Configuration": io.BytesIO(body)}
+
+
+class StubAppConfigData:
+    """boto3 `appconfigdata` client stand-in answering get_latest_configuration from a script of responses."""
+
+    def __init__(self) -> None:
+        self.sessions = 0
+        self.tokens: list[str] = []
+        self.responses: list[dict[str, Any] | Exception] = []
+
+    def start_configuration_session(self, **kwargs: Any) -> dict[str, str]:
+        self.sessions += 1
+        return {"InitialConfigurationToken": f"initial-{self.sessions}"}
+
+    def get_latest_configuration(self, ConfigurationToken: str) -> dict[str, Any]:
+        self.tokens.append(ConfigurationToken)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def appconfigdata(monkeypatch: MonkeyPatch) -> StubAppConfigData:
+    """Stub client handed to AWSAppConfig."""
+    client = StubAppConfigData()
+    monkeypatch.setattr(aws_app_config.boto3, "client", lambda *args, **kwargs: client)
+    return client
+
+
+@pytest.fixture
+def sleeps(monkeypatch: MonkeyPatch, appconfigdata: StubAppConfigData) -> list[float]:
+    """Delays the poller waited for; polls run back to back until the scripted responses run out."""
+    delays: list[float] = []
+
+    async def record_sleep(delay: float) -> None:
+        delays.append(delay)
+        await REAL_SLEEP(0 if appconfigdata.responses else 3600)
+
+    monkeypatch.setattr(aws_app_config.asyncio, "sleep", record_sleep)
+    return delays
+
+
+async def run_poller(app_config: AWSAppConfig, until: Callable[[], bool]) -> None:
+    """Start the poller, wait until `until()` holds, then stop it."""
+    await app_config.start()
+    async with asyncio.timeout(2):
+        while not until():
+            await REAL_SLEEP(0.001)
+    await app_config.stop()
+
+
+async def test_poller_carries_the_next_token_and_honours_the_poll_interval(
+    appconfigdata: StubAppConfigData, sleeps: list[float]
+) -> None:
+    """Each poll sends the previous NextPollConfigurationToken and waits max(ttl, NextPollIntervalInSeconds)."""
+    appconfigdata.responses = [
+        configuration("token-1", 30, ECS_ENABLED),
+        configuration("token-2", 45),  # unchanged
+        configuration("token-3", 5, ECS_DISABLED),
+    ]
+    app_config = AWSAppConfig("app", "env", "profile", ttl=15)
+
+    await run_poller(app_config, until=lambda: not appconfigdata.responses and len(sleeps) == 3)
+
+    assert appconfigdata.tokens == ["initial-1", "token-1", "token-2"]
+    assert appconfigdata.sessions == 1
+    assert sleeps == [30, 45, 15]
+    assert app_config.get_flags() == {"api_gateway_authorizer_ecs_auth_service": False}
+    assert app_config.refreshes == 3
+
+
+async def test_failed_poll_keeps_serving_the_last_snapshot(appconfigdata: StubAppConfigData, sleeps: list[float]) -> None:
+    """A failing poll keeps the last good flags, retries sooner and starts a new configuration session."""
+    appconfigdata.responses = [
+        configuration("token-1", 30, ECS_ENABLED),
+        ConnectionError("AppConfig unavailable"),
+        configuration("token-2", 30),
+    ]
+    app_config = AWSAppConfig("app", "env", "profile", ttl=15)
+
+    await run_poller(app_config, until=lambda: not appconfigdata.responses and len(sleeps) == 3)
+
+    assert sleeps == [30, RETRY_INTERVAL_SECONDS, 30]
+    assert appconfigdata.tokens == ["initial-1", "token-1", "initial-2"]
+    assert app_config.get_flags() == {"api_gateway_authorizer_ecs_auth_service": True}
+    assert (app_config.refreshes, app_config.refresh_errors) == (2, 1)
+
+
+async def test_failed_initial_load_is_retried_by_the_poller(appconfigdata: StubAppConfigData, sleeps: list[float]) -> None:
+    """start() does not raise when AppConfig is down; the poller retries after RETRY_INTERVAL_SECONDS."""
+    appconfigdata.responses = [ConnectionError("AppConfig unavailable"), configuration("token-1", 30, ECS_ENABLED)]
+    app_config = AWSAppConfig("app", "env", "profile", ttl=15)
+
+    await run_poller(app_config, until=lambda: not appconfigdata.responses and len(sleeps) == 2)
+
+    assert sleeps[0] == RETRY_INTERVAL_SECONDS
+    assert app_config.get_flags() == {"api_gateway_authorizer_ecs_auth_service": True}
@@ -0,0 +1,63 @@
+from typing import AsyncGenerator
+
+import pytest
+from stores.memory_order_store import InMemoryOrderStore
+from stores.order_store import OrderStore, OrderWrite
+from stores.redis_order_store import RedisOrderStore
+
+pytestmark = pytest.mark.anyio
+
+USER = "u@x"
+
+
+def make_order(order_id: str, timestamp: int = 1) -> dict:
+    """Stored order."""
+    return {"order_id": order_id, "items": ["apple"], "status": "created", "total": 1.0, "timestamp": timestamp}
+
+
+@pytest.fixture(params=["memory", "redis"])
+async def store(request: pytest.FixtureRequest, redis_store: RedisOrderStore) -> AsyncGenerator[OrderStore, None]:
+    """Both store implementations, empty."""
+    yield InMemoryOrderStore() if request.param == "memory" else redis_store
+
+
+async def test_every_write_bumps_the_collection_version(store: OrderStore) -> None:
+    """Creates, updates and deletes each move the user's version forward, so list ETags change with every write."""
+    versions = [await store.collection_version(USER)]
+
+    await store.create_order(USER, make_order("order-1"))
+    versions.append(await store.collection_version(USER))
+    await store.update_order(USER, "order-1", {"status": "shipped"})
+    versions.append(await store.collection_version(USER))
+    await store.update_order(USER, "order-1", {"timestamp": 5})  # moves in the listing index
+    versions.append(await store.collection_version(USER))
+    await store.delete_order(USER, "order-1")
+    versions.append(await store.collection_version(USER))
+
+    assert versions[0] == 0
+    assert versions == sorted(set(versions))  # strictly increasing
+
+
+async def test_batch_writes_bump_the_collection_version(store: OrderStore) -> None:
+    """apply_batch moves the version forward like the single writes it replaces."""
+    await store.create_order(USER, make_order("order-1"))
+    before = await store.collection_version(USER)
+
+    await store.apply_batch(
+        USER,
+        [
+            OrderWrite("create", "order-2", make_order("order-2", timestamp=2)),
+            OrderWrite("update", "order-1", {"status": "shipped"}),
+            OrderWrite("delete", "order-2"),
+        ],
+    )
+
+    assert await store.collection_version(USER) > before
+
+
+async def test_collection_versions_are_per_user(store: OrderStore) -> None:
+    """Writes to one user's orders leave other users' list ETags valid."""
+    await store.create_order("other@x", make_order("order-1"))
+
+    assert await store.collection_version(USER) == 0
+    assert await store.collection_version("other@x") > 0
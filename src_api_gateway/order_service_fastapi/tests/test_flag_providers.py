@@ -0,0 +1,152 @@
+import asyncio
+import io
+import json
+import os
+from pathlib import Path
+
+import pytest
+from aws_app_config import flag_providers
+from aws_app_config.flag_providers import AgentFlagProvider, FileFlagProvider, create_flag_provider
+from core.config import get_settings
+from pytest import MonkeyPatch
+
+pytestmark = pytest.mark.anyio
+
+KEY = "api_gateway_authorizer_ecs_auth_service"
+
+
+def document(enabled: bool) -> bytes:
+    """AppConfig feature-flag document for KEY."""
+    return json.dumps({KEY: {"enabled": enabled}}).encode()
+
+
+def write_flags(path: Path, content: bytes, mtime_ns: int) -> None:
+    """Write the flags file with an explicit mtime, so a change is visible whatever the filesystem's resolution."""
+    path.write_bytes(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+async def test_file_provider_reloads_when_the_file_changes(tmp_path: Path) -> None:
+    """The file is parsed on start and again only once its mtime (or size) changes."""
+    path = tmp_path / "feature_flags.json"
+    write_flags(path, document(True), mtime_ns=1_000_000_000)
+    provider = FileFlagProvider(str(path), poll_interval=3600)
+    await provider.start()
+    try:
+        assert provider.get_flags() == {KEY: True}
+
+        provider._refresh()  # unchanged - nothing re-parsed
+        assert provider.get_flags() == {KEY: True}
+
+        write_flags(path, document(False), mtime_ns=2_000_000_000)
+        assert provider.get_flags() == {KEY: True}  # the poller, not the request path, picks it up
+        provider._refresh()
+        assert provider.get_flags() == {KEY: False}
+        assert (provider.refreshes, provider.refresh_errors) == (3, 0)
+    finally:
+        await provider.stop()
+
+
+async def test_file_provider_poller_picks_up_changes(tmp_path: Path) -> None:
+    """Once started, the background task re-reads the file every poll_interval seconds."""
+    path = tmp_path / "feature_flags.json"
+    write_flags(path, document(True), mtime_ns=1_000_000_000)
+    provider = FileFlagProvider(str(path), poll_interval=0.01)
+    await provider.start()
+    try:
+        write_flags(path, document(False), mtime_ns=2_000_000_000)
+        async with asyncio.timeout(2):
+            while provider.get_flags() != {KEY: False}:
+                await asyncio.sleep(0.01)
+    finally:
+        await provider.stop()
+
+
+@pytest.mark.parametrize("content", [b"{not json", b'{"api_gateway_authorizer_ecs_auth_service": true}', b"[]"])
+def test_file_provider_keeps_the_last_good_flags_on_a_malformed_file(tmp_path: Path, content: bytes) -> None:
+    """A broken edit is logged and counted; the previous snapshot keeps being served until the file is fixed."""
+    path = tmp_path / "feature_flags.json"
+    write_flags(path, document(True), mtime_ns=1_000_000_000)
+    provider = FileFlagProvider(str(path), poll_interval=3600)
+    provider._refresh()
+
+    write_flags(path, content, mtime_ns=2_000_000_000)
+    provider._refresh()
+    assert provider.get_flags() == {KEY: True}
+    assert provider.refresh_errors == 1
+
+    path.unlink()
+    provider._refresh()
+    assert provider.get_flags() == {KEY: True}
+    assert provider.refresh_errors == 2
+
+
+def test_file_provider_without_poller_rereads_after_the_interval(tmp_path: Path) -> None:
+    """Used without start(), get_flags() re-reads the file once poll_interval has passed."""
+    path = tmp_path / "feature_flags.json"
+    write_flags(path, document(True), mtime_ns=1_000_000_000)
+    provider = FileFlagProvider(str(path), poll_interval=0)
+
+    assert provider.get_flags() == {KEY: True}
+    write_flags(path, document(False), mtime_ns=2_000_000_000)
+    assert provider.get_flags() == {KEY: False}
+
+
+class StubAgent:
+    """urlopen stand-in for the AppConfig agent; `body` is served, or raised when it is an exception."""
+
+    def __init__(self) -> None:
+        self.urls: list[str] = []
+        self.body: bytes | Exception = document(True)
+
+    def urlopen(self, url: str, timeout: float) -> io.BytesIO:
+        self.urls.append(url)
+        if isinstance(self.body, Exception):
+            raise self.body
+        return io.BytesIO(self.body)
+
+
+@pytest.fixture
+def agent(monkeypatch: MonkeyPatch) -> StubAgent:
+    """Stub agent answering the provider's loopback calls."""
+    agent = StubAgent()
+    monkeypatch.setattr(flag_providers.urllib.request, "urlopen", agent.urlopen)
+    return agent
+
+
+def test_agent_provider_reads_the_profile_from_the_agent(agent: StubAgent) -> None:
+    """The provider reads the configured profile from the agent and swaps the snapshot when it changes."""
+    provider = AgentFlagProvider("http://localhost:2772/", "app", "env", "profile", poll_interval=3600)
+
+    provider._refresh()
+    assert provider.get_flags() == {KEY: True}
+    assert agent.urls == ["http://localhost:2772/applications/app/environments/env/configurations/profile"]
+
+    agent.body = document(False)
+    provider._refresh()
+    assert provider.get_flags() == {KEY: False}
+
+
+@pytest.mark.parametrize("body", [ConnectionRefusedError("agent not running"), b"{not json"])
+def test_agent_provider_keeps_the_last_good_flags(agent: StubAgent, body: bytes | Exception) -> None:
+    """An unreachable agent or a malformed document leaves the previous snapshot in place."""
+    provider = AgentFlagProvider("http://localhost:2772", "app", "env", "profile", poll_interval=3600)
+    provider._refresh()
+
+    agent.body = body
+    provider._refresh()
+
+    assert provider.get_flags() == {KEY: True}
+    assert provider.refresh_errors == 1
+
+
+def test_create_flag_provider_selects_the_configured_provider(monkeypatch: MonkeyPatch) -> None:
+    """AWS_APP_CONFIG_PROVIDER picks the file or agent provider; unknown names are rejected."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "aws_app_config_provider", "FILE")
+    assert isinstance(create_flag_provider(settings), FileFlagProvider)
+    monkeypatch.setattr(settings, "aws_app_config_provider", "agent")
+    assert isinstance(create_flag_provider(settings), AgentFlagProvider)
+    monkeypatch.setattr(settings, "aws_app_config_provider", "consul")
+    with pytest.raises(ValueError):
+        create_flag_provider(settings)
@@ -0,0 +1,26 @@
+import pytest
+from core.http_cache import etag_matches, strong_etag
+
+ETAG = strong_etag("u@x", 3, None)
+
+
+def test_strong_etag_depends_on_every_part() -> None:
+    """Equal parts give the same quoted ETag; any different part (or type) gives another one."""
+    assert ETAG == strong_etag("u@x", 3, None)
+    assert ETAG.startswith('"') and ETAG.endswith('"') and len(ETAG) == 34
+    assert len({ETAG, strong_etag("u@x", 4, None), strong_etag("v@x", 3, None), strong_etag("u@x", "3", None)}) == 4
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    [ETAG, f"W/{ETAG}", f'"other", {ETAG}', f' "other" ,W/{ETAG} ', "*", " * "],
+)
+def test_etag_matches_current_tags(if_none_match: str) -> None:
+    """Listed, weak (`W/`) and wildcard tags match, whatever the spacing."""
+    assert etag_matches(if_none_match, ETAG)
+
+
+@pytest.mark.parametrize("if_none_match", [None, "", '"other"', ETAG.strip('"'), f"{ETAG[:-2]}x\"", '"*", "other"'])
+def test_etag_matches_rejects_other_tags(if_none_match: str | None) -> None:
+    """Missing headers, other or unquoted tags, and a quoted `*` are not a match."""
+    assert not etag_matches(if_none_match, ETAG)
@@ -0,0 +1,44 @@
+import time
+
+import dependencies
+import pytest
+from core import session_tokens
+from fastapi import Request
+from pytest import MonkeyPatch
+
+SECRET = "internal-secret"
+
+
+def request_with(header: bytes) -> Request:
+    """Request carrying `header` as raw X-Internal-Auth bytes (decoded as latin-1, like any header)."""
+    return Request({"type": "http", "headers": [(session_tokens.INTERNAL_AUTH_HEADER.lower().encode(), header)]})
+
+
+@pytest.fixture(autouse=True)
+def internal_auth_secrets(monkeypatch: MonkeyPatch) -> None:
+    """Trust X-Internal-Auth headers signed with SECRET."""
+    monkeypatch.setattr(dependencies, "internal_auth_secrets", [SECRET])
+
+
+def test_signed_identity_is_trusted() -> None:
+    """A fresh header signed with a configured secret yields the user's email."""
+    header = session_tokens.sign_internal_identity(SECRET, "u@x")
+
+    assert dependencies.verify_internal_identity(request_with(header.encode())) == "u@x"
+
+
+def test_stale_or_foreign_identities_are_rejected() -> None:
+    """Headers older than internal_auth_max_age or signed with another secret are ignored."""
+    stale = session_tokens.sign_internal_identity(SECRET, "u@x", issued_at=int(time.time()) - 3600)
+    foreign = session_tokens.sign_internal_identity("other-secret", "u@x")
+
+    assert dependencies.verify_internal_identity(request_with(stale.encode())) is None
+    assert dependencies.verify_internal_identity(request_with(foreign.encode())) is None
+
+
+def test_non_ascii_identities_are_rejected_instead_of_raising() -> None:
+    """Non-ASCII digits (`²`) or signatures are malformed headers, not a 500."""
+    signing_input = session_tokens.sign_internal_identity(SECRET, "u@x").rpartition(".")[0]
+
+    assert dependencies.verify_internal_identity(request_with("a.²².x".encode("latin-1"))) is None
+    assert dependencies.verify_internal_identity(request_with(f"{signing_input}.sïg".encode("latin-1"))) is None
@@ -0,0 +1,168 @@
+import asyncio
+import json
+from typing import Any, AsyncGenerator, Callable, Iterator
+
+import pytest
+from core.config import get_settings
+from pytest import MonkeyPatch
+from schemas.order import OrderResponse
+from services import notifications
+from services.notifications import NotificationService
+
+pytestmark = pytest.mark.anyio
+
+USER = "u@x"
+Response = dict[str, Any]
+
+
+class StubSNS:
+    """boto3 SNS client stand-in recording every publish_batch call; `respond` decides each call's outcome."""
+
+    def __init__(self) -> None:
+        self.calls: list[list[dict[str, str]]] = []
+        self.respond: Callable[[list[dict[str, str]]], Response] = lambda entries: {
+            "Successful": [{"Id": entry["Id"]} for entry in entries]
+        }
+
+    def publish_batch(self, TopicArn: str, PublishBatchRequestEntries: list[dict[str, str]]) -> Response:
+        assert TopicArn == get_settings().aws_order_created_sns_topic_arn
+        self.calls.append(PublishBatchRequestEntries)
+        return self.respond(PublishBatchRequestEntries)
+
+
+@pytest.fixture
+def sns(monkeypatch: MonkeyPatch) -> StubSNS:
+    """SNS client handed to NotificationService, with fast flushes and retries."""
+    sns = StubSNS()
+    monkeypatch.setattr(notifications.boto3, "client", lambda *args, **kwargs: sns)
+    settings = get_settings()
+    monkeypatch.setattr(settings, "sns_publish_flush_interval", 0.05)
+    monkeypatch.setattr(settings, "sns_publish_retry_backoff", 0.01)
+    monkeypatch.setattr(settings, "sns_publish_max_retries", 2)
+    return sns
+
+
+@pytest.fixture
+async def service(sns: StubSNS) -> AsyncGenerator[NotificationService, None]:
+    """NotificationService with its flusher running, stopped after the test."""
+    service = NotificationService()
+    await service.start()
+    yield service
+    await service.stop()
+
+
+def order(i: int) -> OrderResponse:
+    """Created order `order-<i>`."""
+    return OrderResponse(order_id=f"order-{i}", items=["apple"], total=1.0)
+
+
+async def wait_for_calls(sns: StubSNS, count: int, timeout: float = 2) -> None:
+    """Wait until SNS received `count` publish_batch calls."""
+    async with asyncio.timeout(timeout):
+        while len(sns.calls) < count:
+            await asyncio.sleep(0.005)
+
+
+async def test_full_batch_is_flushed_without_waiting_for_the_interval(sns: StubSNS, service: NotificationService) -> None:
+    """10 queued events (the publish_batch limit) go out at once; the rest wait for the next flush."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    service.publish_orders_created([order(i) for i in range(12)], USER)
+
+    await wait_for_calls(sns, 1)
+    assert loop.time() - started < get_settings().sns_publish_flush_interval
+    assert [json.loads(entry["Message"])["order_id"] for entry in sns.calls[0]] == [f"order-{i}" for i in range(10)]
+
+    await wait_for_calls(sns, 2)
+    assert len(sns.calls[1]) == 2
+
+
+async def test_partial_batch_is_flushed_after_the_interval(sns: StubSNS, service: NotificationService) -> None:
+    """Fewer than 10 events are sent together once the flush interval after the first one has passed."""
+    service.publish_order_created(order(1), USER)
+    await asyncio.sleep(0.01)
+    service.publish_order_created(order(2), USER)
+    assert sns.calls == []
+
+    await wait_for_calls(sns, 1)
+    assert [entry["Id"] for entry in sns.calls[0]] == ["0", "1"]
+    assert json.loads(sns.calls[0][0]["Message"]) == {"order_id": "order-1", "user_id": USER, "items": ["apple"], "total": 1.0}
+
+
+async def test_only_failed_entries_are_retried_with_backoff(sns: StubSNS, monkeypatch: MonkeyPatch) -> None:
+    """Throttled entries are re-sent after exponential backoff; sender faults and successes are not."""
+    responses: Iterator[Response] = iter(
+        [
+            {
+                "Successful": [{"Id": "0"}],
+                "Failed": [
+                    {"Id": "1", "Code": "Throttled", "SenderFault": False},
+                    {"Id": "2", "Code": "Bad", "SenderFault": True},
+                ],
+            },
+            {"Failed": [{"Id": "1", "Code": "Throttled", "SenderFault": False}]},
+            {"Successful": [{"Id": "1"}]},
+        ]
+    )
+    sns.respond = lambda entries: next(responses)
+    delays: list[float] = []
+    sleep = asyncio.sleep
+
+    async def record_sleep(delay: float) -> None:
+        delays.append(delay)
+        await sleep(0)
+
+    monkeypatch.setattr(notifications.asyncio, "sleep", record_sleep)
+    service = NotificationService()
+
+    undelivered = await service.publish_batch([(f"event-{i}", "{}") for i in range(3)])
+
+    assert undelivered == ["event-2"]
+    assert [[entry["Id"] for entry in call] for call in sns.calls] == [["0", "1", "2"], ["1"], ["1"]]
+    assert delays == [0.01, 0.02]
+    assert (service.published, service.failed, service.retries) == (2, 1, 2)
+
+
+async def test_entries_are_given_up_after_max_retries(sns: StubSNS) -> None:
+    """When SNS keeps failing, every entry is reported undelivered after sns_publish_max_retries retries."""
+
+    def unavailable(entries: list[dict[str, str]]) -> Response:
+        raise ConnectionError("SNS unavailable")
+
+    sns.respond = unavailable
+    service = NotificationService()
+
+    assert await service.publish_batch([("event-0", "{}"), ("event-1", "{}")]) == ["event-0", "event-1"]
+    assert len(sns.calls) == 3
+    assert (service.published, service.failed, service.retries) == (0, 2, 4)
+
+
+async def test_stop_drains_the_queue(sns: StubSNS) -> None:
+    """Events still queued at shutdown are published before stop() returns."""
+    service = NotificationService()
+    await service.start()
+    service.publish_orders_created([order(i) for i in range(3)], USER)
+
+    await service.stop()
+
+    assert sum(len(call) for call in sns.calls) == 3
+    assert service.stats()["queue_depth"] == 0
+
+
+async def test_stats_report_queue_depth_drops_and_flush_latency(sns: StubSNS, monkeypatch: MonkeyPatch) -> None:
+    """Queue depth, dropped events and flush latency are exposed for /metrics."""
+    monkeypatch.setattr(get_settings(), "sns_publish_queue_max_size", 2)
+    service = NotificationService()
+    service.publish_orders_created([order(i) for i in range(3)], USER)
+
+    stats = service.stats()
+    assert (stats["queue_depth"], stats["enqueued"], stats["dropped"], stats["flushes"]) == (2, 2, 1, 0)
+    assert stats["flush_latency_ms_avg"] == 0.0
+
+    await service.start()
+    await service.stop()
+
+    stats = service.stats()
+    assert (stats["queue_depth"], stats["published"], stats["flushes"]) == (0, 2, 1)
+    assert 0 < stats["flush_latency_ms_last"] <= stats["flush_latency_ms_max"]
+    assert stats["flush_latency_ms_avg"] == stats["flush_latency_ms_last"]
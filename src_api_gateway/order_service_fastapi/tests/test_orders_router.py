@@ -0,0 +1,80 @@
+from typing import AsyncGenerator
+
+import httpx
+import pytest
+from dependencies import get_current_user
+from fastapi import FastAPI
+from pytest import MonkeyPatch
+from routers.orders import router as orders_router
+from services import orders as orders_service
+from stores.redis_order_store import RedisOrderStore
+
+pytestmark = pytest.mark.anyio
+
+USER = "u@x"
+
+
+@pytest.fixture
+async def client(monkeypatch: MonkeyPatch, redis_store: RedisOrderStore) -> AsyncGenerator[httpx.AsyncClient, None]:
+    """Orders router on the fake redis store, with the caller authenticated as USER."""
+    monkeypatch.setattr(orders_service, "order_store", redis_store)
+    app = FastAPI()
+    app.include_router(orders_router, prefix="/orders")
+    app.dependency_overrides[get_current_user] = lambda: USER
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://orders") as client:
+        yield client
+
+
+async def test_batch_applies_operations_with_single_order_status_codes(
+    client: httpx.AsyncClient, redis_store: RedisOrderStore
+) -> None:
+    """POST /orders/batch answers each operation as the single-order endpoint would and records one event per create."""
+    created = (await client.post("/orders/", json={"items": ["apple"], "total": 1.0})).json()
+    outbox_before = await redis_store.outbox_size()
+
+    res = await client.post(
+        "/orders/batch",
+        json={
+            "operations": [
+                {"op": "create", "order": {"items": ["pear"], "total": 2.0}},
+                {"op": "update", "order_id": created["order_id"], "order": {"items": ["plum"], "total": 3.0}},
+                {"op": "delete", "order_id": created["order_id"]},
+                {"op": "delete", "order_id": "missing"},
+            ]
+        },
+    )
+
+    assert res.status_code == 200
+    results = res.json()["results"]
+    assert [result["status_code"] for result in results] == [201, 200, 204, 404]
+    assert results[0]["order"]["items"] == ["pear"]
+    assert results[1]["order"]["items"] == ["plum"]
+    assert results[3]["error"] == "Order not found"
+    assert await redis_store.get_order(USER, created["order_id"]) is None
+    assert await redis_store.outbox_size() == outbox_before + 1
+
+
+@pytest.mark.parametrize(
+    "operations",
+    [
+        [],
+        [{"op": "update", "order": {"items": [], "total": 1.0}}],  # no order_id
+        [{"op": "create"}],  # no order
+        [{"op": "delete", "order_id": "x"}] * 101,
+    ],
+)
+async def test_batch_rejects_invalid_operations(client: httpx.AsyncClient, operations: list[dict]) -> None:
+    """Empty, oversized or incomplete batches are rejected before touching the store."""
+    assert (await client.post("/orders/batch", json={"operations": operations})).status_code == 422
+
+
+async def test_batch_get_returns_found_orders_and_missing_ids(client: httpx.AsyncClient) -> None:
+    """POST /orders/batch-get returns the user's orders in request order plus the IDs that do not exist."""
+    first = (await client.post("/orders/", json={"items": ["apple"], "total": 1.0})).json()
+    second = (await client.post("/orders/", json={"items": ["pear"], "total": 2.0})).json()
+
+    res = await client.post("/orders/batch-get", json={"order_ids": [second["order_id"], "missing", first["order_id"]]})
+
+    assert res.status_code == 200
+    assert [order["order_id"] for order in res.json()["orders"]] == [second["order_id"], first["order_id"]]
+    assert res.json()["missing"] == ["missing"]
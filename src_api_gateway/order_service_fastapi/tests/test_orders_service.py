@@ -0,0 +1,39 @@
+import pytest
+from pytest import MonkeyPatch
+from services import orders as orders_service
+from stores.memory_order_store import InMemoryOrderStore
+
+pytestmark = pytest.mark.anyio
+
+USER = "u@x"
+
+
+@pytest.fixture
+def store(monkeypatch: MonkeyPatch) -> InMemoryOrderStore:
+    """Empty in-memory store used by services.orders for the test."""
+    store = InMemoryOrderStore()
+    monkeypatch.setattr(orders_service, "order_store", store)
+    return store
+
+
+async def test_list_orders_returns_cursor_until_the_last_page(store: InMemoryOrderStore) -> None:
+    """next_cursor resumes after the last order of the page and is None on the last page."""
+    for i in range(5):
+        order_id = f"order-{i}"
+        await store.create_order(USER, {"order_id": order_id, "items": [], "status": "created", "total": 1.0, "timestamp": i})
+
+    seen: list[str] = []
+    cursor = None
+    for _ in range(3):
+        page = await orders_service.list_orders(USER, limit=2, cursor=cursor)
+        seen += [order.order_id for order in page.orders]
+        cursor = page.next_cursor
+    assert seen == [f"order-{i}" for i in range(5)]
+    assert cursor is None
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bnVsbA==", "WzFd"])  # garbage, `null`, `[1]`
+async def test_list_orders_rejects_malformed_cursors(store: InMemoryOrderStore, cursor: str) -> None:
+    """A cursor that does not decode to (timestamp, order_id) raises ValueError (400 in the router)."""
+    with pytest.raises(ValueError):
+        await orders_service.list_orders(USER, cursor=cursor)
@@ -0,0 +1,102 @@
+from typing import AsyncGenerator
+
+import pytest
+from core.config import get_settings
+from pytest import MonkeyPatch
+from services.outbox_relay import OutboxRelay
+from stores.memory_order_store import InMemoryOrderStore
+from stores.order_store import OrderStore, OrderWrite, OutboxEvent
+from stores.redis_order_store import RedisOrderStore
+
+pytestmark = pytest.mark.anyio
+
+USER = "u@x"
+
+
+def make_event(event_id: str) -> OutboxEvent:
+    """Order-created outbox event."""
+    return {"event_id": event_id, "type": "order_created", "payload": f'{{"id": "{event_id}"}}'}
+
+
+@pytest.fixture(params=["memory", "redis"])
+async def store(request: pytest.FixtureRequest, redis_store: RedisOrderStore) -> AsyncGenerator[OrderStore, None]:
+    """Both outbox implementations, each holding events event-1 and event-2 written with an order."""
+    outbox_store: OrderStore = InMemoryOrderStore() if request.param == "memory" else redis_store
+    order = {"order_id": "order-1", "items": [], "status": "created", "total": 1.0, "timestamp": 1}
+    await outbox_store.create_order(USER, order, outbox=[make_event("event-1"), make_event("event-2")])
+    yield outbox_store
+
+
+async def test_claim_hides_events_for_the_lease(store: OrderStore) -> None:
+    """Claimed events come back with their attempt count and are not claimed again while leased."""
+    claimed = await store.claim_outbox(limit=1, lease_seconds=60)
+    assert claimed == [{**make_event("event-1"), "attempts": 1}]
+
+    assert [event["event_id"] for event in await store.claim_outbox(limit=10, lease_seconds=60)] == ["event-2"]
+    assert await store.claim_outbox(limit=10, lease_seconds=60) == []
+    assert await store.outbox_size() == 2  # leased, not removed
+
+
+async def test_unacknowledged_events_are_redelivered_after_the_lease(store: OrderStore) -> None:
+    """An event whose lease expired without an ack is claimed again, with its attempt count incremented."""
+    await store.claim_outbox(limit=10, lease_seconds=0)  # lease expires immediately
+
+    redelivered = await store.claim_outbox(limit=10, lease_seconds=60)
+    assert [(event["event_id"], event["attempts"]) for event in redelivered] == [("event-1", 2), ("event-2", 2)]
+
+
+async def test_ack_removes_events(store: OrderStore) -> None:
+    """Acknowledged events leave the outbox for good; acking unknown IDs is a no-op."""
+    await store.claim_outbox(limit=10, lease_seconds=0)
+    await store.ack_outbox(["event-1", "unknown"])
+    await store.ack_outbox([])
+
+    assert await store.outbox_size() == 1
+    assert [event["event_id"] for event in await store.claim_outbox(limit=10, lease_seconds=60)] == ["event-2"]
+
+
+async def test_batch_writes_enqueue_their_events(store: OrderStore) -> None:
+    """apply_batch (the Redis override and the default through _append_outbox) stores the batch's events."""
+    await store.apply_batch(USER, [OrderWrite("delete", "order-1")], outbox=[make_event("event-3")])
+    assert await store.outbox_size() == 3
+
+
+class FakeNotifications:
+    """Records publish_batch calls and rejects the event IDs in `failing`."""
+
+    def __init__(self, failing: set[str] | None = None) -> None:
+        self.failing = failing or set()
+        self.published: list[str] = []
+
+    async def publish_batch(self, entries: list[tuple[str, str]]) -> list[str]:
+        """Publish (event_id, message) entries, returning the IDs SNS did not accept."""
+        self.published += [event_id for event_id, _ in entries]
+        return [event_id for event_id, _ in entries if event_id in self.failing]
+
+
+async def test_relay_acks_delivered_events_and_retries_failed_ones(store: OrderStore, monkeypatch: MonkeyPatch) -> None:
+    """Events SNS rejected stay in the outbox and are published again once their lease expires."""
+    monkeypatch.setattr(get_settings(), "outbox_relay_lease_seconds", 0)
+    notifications = FakeNotifications(failing={"event-2"})
+    relay = OutboxRelay(store, notifications)  # type: ignore
+
+    assert await relay.relay_once() == 2
+    assert await store.outbox_size() == 1
+    notifications.failing.clear()
+    assert await relay.relay_once() == 1
+    assert await relay.relay_once() == 0
+
+    assert notifications.published == ["event-1", "event-2", "event-2"]
+    assert await relay.stats() == {"outbox_size": 0, "relayed": 2, "redelivery_pending": 1, "dead_lettered": 0}
+
+
+async def test_relay_dead_letters_events_after_max_attempts(store: OrderStore, monkeypatch: MonkeyPatch) -> None:
+    """An event claimed more than `outbox_max_attempts` times is dropped without being published again."""
+    monkeypatch.setattr(get_settings(), "outbox_relay_lease_seconds", 0)
+    monkeypatch.setattr(get_settings(), "outbox_max_attempts", 2)
+    notifications = FakeNotifications(failing={"event-1", "event-2"})
+    relay = OutboxRelay(store, notifications)  # type: ignore
+
+    assert [await relay.relay_once() for _ in range(4)] == [2, 2, 2, 0]
+    assert notifications.published == ["event-1", "event-2"] * 2
+    assert (await relay.stats())["dead_lettered"] == 2
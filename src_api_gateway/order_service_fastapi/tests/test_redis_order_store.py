@@ -0,0 +1,189 @@
+import json
+from collections import UserDict
+from typing import Any
+
+import fakeredis
+import pytest
+from stores.order_store import Order, OrderWrite
+from stores.redis_order_store import RedisOrderStore
+
+pytestmark = pytest.mark.anyio
+
+USER = "u@x"
+
+
+def make_order(order_id: str, timestamp: int, status: str = "created") -> Order:
+    """Stored order with the given ID, timestamp and status."""
+    return {"order_id": order_id, "items": ["apple"], "status": status, "total": 1.5, "timestamp": timestamp}
+
+
+async def test_create_writes_hash_and_index_in_one_transaction(
+    redis_store: RedisOrderStore, redis_server: fakeredis.FakeServer
+) -> None:
+    """create_order stores the order JSON in the user's hash and indexes it by timestamp."""
+    order = make_order("order-1", 100)
+    assert await redis_store.create_order(USER, order) == order
+
+    raw = fakeredis.FakeRedis(server=redis_server, decode_responses=True)
+    assert json.loads(raw.hget(f"test-orders:{USER}", "order-1")) == order  # type: ignore
+    assert raw.zrange(f"test-orders:{USER}:by_ts", 0, -1, withscores=True) == [("order-1", 100.0)]
+    assert await redis_store.get_order(USER, "order-1") == order
+    assert await redis_store.get_order("other@x", "order-1") is None
+
+
+async def test_update_merges_fields_and_misses_unknown_orders(redis_store: RedisOrderStore) -> None:
+    """update_order merges the given fields into the stored order; unknown orders return None."""
+    await redis_store.create_order(USER, make_order("order-1", 100))
+
+    updated = await redis_store.update_order(USER, "order-1", {"items": ["pear"], "total": 3.0})
+    assert updated == {**make_order("order-1", 100), "items": ["pear"], "total": 3.0}
+    assert await redis_store.get_order(USER, "order-1") == updated
+    assert await redis_store.update_order(USER, "order-2", {"total": 1.0}) is None
+
+
+async def test_update_retries_when_the_watched_hash_changes(
+    redis_store: RedisOrderStore, redis_server: fakeredis.FakeServer
+) -> None:
+    """A concurrent write between the WATCHed read and EXEC aborts the transaction; the retry keeps both writes."""
+    await redis_store.create_order(USER, make_order("order-1", 100))
+    await redis_store.create_order(USER, make_order("order-2", 200))
+    other_writer = fakeredis.FakeRedis(server=redis_server, decode_responses=True)
+
+    class ConcurrentWrite(UserDict):
+        """Fields that update order-2 from another client the first time the update merges them."""
+
+        merges = 0
+
+        def keys(self) -> Any:
+            """Called by the `{**order, **fields}` merge."""
+            ConcurrentWrite.merges += 1
+            if ConcurrentWrite.merges == 1:
+                other_writer.hset(f"test-orders:{USER}", "order-2", json.dumps(make_order("order-2", 200, "shipped")))
+            return super().keys()
+
+    updated = await redis_store.update_order(USER, "order-1", ConcurrentWrite(status="shipped"))  # type: ignore
+    assert ConcurrentWrite.merges == 2  # the first EXEC failed on the WATCH, the second went through
+    assert updated is not None and updated["status"] == "shipped"
+    assert (await redis_store.get_order(USER, "order-2"))["status"] == "shipped"  # type: ignore
+
+
+async def test_delete_removes_hash_entry_and_index(redis_store: RedisOrderStore, redis_server: fakeredis.FakeServer) -> None:
+    """delete_order removes the order from the hash and the index, and reports whether it existed."""
+    await redis_store.create_order(USER, make_order("order-1", 100))
+
+    assert await redis_store.delete_order(USER, "order-1") is True
+    assert await redis_store.delete_order(USER, "order-1") is False
+    assert await redis_store.get_order(USER, "order-1") is None
+    assert fakeredis.FakeRedis(server=redis_server).zcard(f"test-orders:{USER}:by_ts") == 0
+
+
+async def seed(store: RedisOrderStore) -> list[Order]:
+    """Six orders, two sharing a timestamp, created out of order - returned in listing order."""
+    orders = [
+        make_order("order-b", 200, "shipped"),
+        make_order("order-a", 100),
+        make_order("order-d", 300),
+        make_order("order-c", 200),
+        make_order("order-f", 500, "shipped"),
+        make_order("order-e", 400),
+    ]
+    for order in orders:
+        await store.create_order(USER, order)
+    return sorted(orders, key=lambda order: (order["timestamp"], order["order_id"]))
+
+
+async def test_list_orders_pages_by_timestamp_then_order_id(redis_store: RedisOrderStore) -> None:
+    """Pages resume strictly after the (timestamp, order_id) cursor, also inside a second shared by several orders."""
+    expected = await seed(redis_store)
+
+    assert await redis_store.list_orders(USER) == expected
+    pages: list[list[Order]] = []
+    after = None
+    while page := await redis_store.list_orders(USER, limit=2, after=after):
+        pages.append(page)
+        after = (page[-1]["timestamp"], page[-1]["order_id"])
+    assert [[order["order_id"] for order in page] for page in pages] == [
+        ["order-a", "order-b"],
+        ["order-c", "order-d"],
+        ["order-e", "order-f"],
+    ]
+    assert await redis_store.list_orders(USER, after=(200, "order-b")) == expected[2:]
+
+
+@pytest.mark.parametrize(
+    "filters, expected_ids",
+    [
+        ({"status": "shipped"}, ["order-b", "order-f"]),
+        ({"since": 200, "until": 400}, ["order-b", "order-c", "order-d", "order-e"]),
+        ({"since": 250}, ["order-d", "order-e", "order-f"]),
+        ({"until": 200, "after": (200, "order-b")}, ["order-c"]),
+        ({"since": 400, "after": (100, "order-a")}, ["order-e", "order-f"]),
+        ({"until": 150, "after": (200, "order-b")}, []),
+        ({"status": "created", "since": 200, "limit": 2}, ["order-c", "order-d"]),
+    ],
+)
+async def test_list_orders_filters_in_the_store(
+    redis_store: RedisOrderStore, filters: dict[str, Any], expected_ids: list[str]
+) -> None:
+    """status / since / until filters combine with the cursor and the limit."""
+    await seed(redis_store)
+    assert [order["order_id"] for order in await redis_store.list_orders(USER, **filters)] == expected_ids
+
+
+async def test_list_orders_status_filter_reads_further_index_pages(redis_store: RedisOrderStore) -> None:
+    """With a status filter, index pages are read until the limit is met or the index ends."""
+    await seed(redis_store)
+    redis_store.LIST_BATCH_SIZE = 1  # type: ignore
+
+    assert [order["order_id"] for order in await redis_store.list_orders(USER, status="shipped", limit=2)] == [
+        "order-b",
+        "order-f",
+    ]
+    assert await redis_store.list_orders(USER, status="cancelled") == []
+
+
+async def test_get_orders_reads_several_orders_in_request_order(redis_store: RedisOrderStore) -> None:
+    """get_orders returns the orders in the requested order, None for unknown IDs."""
+    await seed(redis_store)
+    found = await redis_store.get_orders(USER, ["order-c", "missing", "order-a"])
+    assert [order["order_id"] if order else None for order in found] == ["order-c", None, "order-a"]
+
+
+async def test_apply_batch_resolves_writes_in_order_and_commits_once(
+    redis_store: RedisOrderStore, redis_server: fakeredis.FakeServer
+) -> None:
+    """Later writes see earlier ones, missing orders yield None, and hash, index and outbox change together."""
+    await seed(redis_store)
+    writes = [
+        OrderWrite("create", "order-g", make_order("order-g", 600)),
+        OrderWrite("update", "order-g", {"status": "shipped"}),
+        OrderWrite("update", "order-a", {"total": 9.0}),
+        OrderWrite("delete", "order-b"),
+        OrderWrite("delete", "order-b"),
+        OrderWrite("update", "missing", {"total": 1.0}),
+    ]
+    event = {"event_id": "event-1", "type": "order_created", "payload": "{}"}
+
+    results = await redis_store.apply_batch(USER, writes, outbox=[event])
+
+    assert results == [
+        make_order("order-g", 600),
+        make_order("order-g", 600, "shipped"),
+        {**make_order("order-a", 100), "total": 9.0},
+        make_order("order-b", 200, "shipped"),
+        None,
+        None,
+    ]
+    listed = [order["order_id"] for order in await redis_store.list_orders(USER)]
+    assert listed == ["order-a", "order-c", "order-d", "order-e", "order-f", "order-g"]
+    assert (await redis_store.get_order(USER, "order-g"))["status"] == "shipped"  # type: ignore
+    assert await redis_store.outbox_size() == 1
+    assert fakeredis.FakeRedis(server=redis_server).zscore(f"test-orders:{USER}:by_ts", "order-b") is None
+
+
+async def test_apply_batch_without_changes_writes_nothing(redis_store: RedisOrderStore) -> None:
+    """A batch of misses returns None per write and leaves the orders untouched."""
+    await seed(redis_store)
+    before = await redis_store.list_orders(USER)
+    assert await redis_store.apply_batch(USER, [OrderWrite("delete", "missing")]) == [None]
+    assert await redis_store.list_orders(USER) == before
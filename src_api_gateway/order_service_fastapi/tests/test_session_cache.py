@@ -0,0 +1,150 @@
+import time
+import types
+from typing import AsyncGenerator
+
+import dependencies
+import httpx
+import pytest
+from core import ttl_cache
+from core.ttl_cache import TTLCache, is_missing
+from fastapi import FastAPI
+from pytest import MonkeyPatch
+from routers.sessions import router as sessions_router
+
+pytestmark = pytest.mark.anyio
+
+USER = "u@x"
+
+
+class Clock:
+    """Monotonic clock for TTLCache that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = time.monotonic()
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: MonkeyPatch) -> Clock:
+    """Replace the clock TTLCache reads (not the event loop's)."""
+    clock = Clock()
+    monkeypatch.setattr(ttl_cache, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+@pytest.fixture
+def auth_calls(monkeypatch: MonkeyPatch) -> list[str]:
+    """Session IDs sent to auth_service `/verify`; sessions starting with `ok` are valid, `down` fails in transport."""
+    calls: list[str] = []
+
+    async def fetch_session_user(session_id: str) -> str | None:
+        calls.append(session_id)
+        if session_id.startswith("down"):
+            raise httpx.ConnectError("auth_service unreachable")
+        return USER if session_id.startswith("ok") else None
+
+    monkeypatch.setattr(dependencies, "session_cache", TTLCache(dependencies.settings.session_cache_max_size))
+    monkeypatch.setattr(dependencies.auth_client, "fetch_session_user", fetch_session_user)
+    return calls
+
+
+def test_ttl_cache_expires_entries_and_tells_cached_none_from_a_miss(clock: Clock) -> None:
+    """`None` can be cached (negative caching) and every entry expires after its own TTL."""
+    cache: TTLCache[str, str | None] = TTLCache(10)
+    cache.set("rejected", None, ttl=5)
+    cache.set("valid", USER, ttl=30)
+    cache.set("skipped", USER, ttl=0)
+
+    assert cache.lookup("rejected") is None
+    assert is_missing(cache.lookup("skipped"))
+
+    clock.now += 10
+    assert is_missing(cache.lookup("rejected"))
+    assert cache.get("valid") == USER
+    clock.now += 30
+    assert cache.get("valid", "default") == "default"
+    assert cache.stats()["size"] == 0
+
+
+def test_ttl_cache_evicts_least_recently_used_entries() -> None:
+    """Past max_size, the entry read least recently is dropped first."""
+    cache: TTLCache[str, str] = TTLCache(2)
+    cache.set("a", "1", ttl=60)
+    cache.set("b", "2", ttl=60)
+    cache.get("a")
+    cache.set("c", "3", ttl=60)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("1", "3")
+    assert cache.stats()["evictions"] == 1
+
+
+async def test_valid_sessions_are_cached_longer_than_rejected_ones(auth_calls: list[str], clock: Clock) -> None:
+    """Valid sessions are reused for session_cache_ttl, rejected ones only for session_cache_negative_ttl."""
+    settings = dependencies.settings
+    assert settings.session_cache_negative_ttl < settings.session_cache_ttl
+
+    for _ in range(2):
+        assert await dependencies.verify_session_cached("ok-1") == USER
+        assert await dependencies.verify_session_cached("bad-1") is None
+    assert auth_calls == ["ok-1", "bad-1"]
+
+    clock.now += settings.session_cache_negative_ttl + 0.1
+    await dependencies.verify_session_cached("ok-1")
+    await dependencies.verify_session_cached("bad-1")
+    assert auth_calls == ["ok-1", "bad-1", "bad-1"]
+
+    clock.now += settings.session_cache_ttl
+    await dependencies.verify_session_cached("ok-1")
+    assert auth_calls[-1] == "ok-1"
+
+
+async def test_session_cache_evicts_at_max_size(auth_calls: list[str], monkeypatch: MonkeyPatch) -> None:
+    """The session cache holds at most session_cache_max_size sessions, dropping the least recently used."""
+    monkeypatch.setattr(dependencies, "session_cache", TTLCache(2))
+
+    for session_id in ("ok-1", "ok-2", "ok-1", "ok-3", "ok-1", "ok-2"):
+        await dependencies.verify_session_cached(session_id)
+
+    assert auth_calls == ["ok-1", "ok-2", "ok-3", "ok-2"]
+
+
+async def test_transport_errors_are_not_cached(auth_calls: list[str]) -> None:
+    """An unreachable auth_service rejects the request but the next one asks again."""
+    assert await dependencies.verify_session_cached("down-1") is None
+    assert await dependencies.verify_session_cached("down-1") is None
+    assert await dependencies.verify_session_cached(None) is None
+
+    assert auth_calls == ["down-1", "down-1"]
+
+
+@pytest.fixture
+async def client(auth_calls: list[str]) -> AsyncGenerator[httpx.AsyncClient, None]:
+    """Sessions router alone."""
+    app = FastAPI()
+    app.include_router(sessions_router, prefix="/sessions")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://orders") as client:
+        yield client
+
+
+async def test_logout_drops_the_session_from_the_cache(
+    client: httpx.AsyncClient, auth_calls: list[str], monkeypatch: MonkeyPatch
+) -> None:
+    """/sessions/logout invalidates this worker's cached session before forwarding the logout to auth_service."""
+    logged_out: list[str | None] = []
+
+    async def logout(session_id: str | None) -> bool:
+        logged_out.append(session_id)
+        return session_id is not None
+
+    monkeypatch.setattr(dependencies.auth_client, "logout", logout)
+    await dependencies.verify_session_cached("ok-1")
+
+    response = await client.post("/sessions/logout", headers={"Cookie": "session_id=ok-1"})
+
+    assert response.status_code == 200
+    assert logged_out == ["ok-1"]
+    assert is_missing(dependencies.session_cache.lookup("ok-1"))
+    assert (await client.post("/sessions/logout")).status_code == 400
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+from core.single_flight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+class Upstream:
+    """Fake upstream call that blocks until released and counts how often it ran."""
+
+    def __init__(self, result: str = "u@x", error: Exception | None = None) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.result = result
+        self.error = error
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def test_concurrent_callers_share_one_upstream_call() -> None:
+    """N callers for the same key while a call is in flight make exactly one upstream call and get its result."""
+    flight: SingleFlight[str, str] = SingleFlight()
+    upstream = Upstream()
+
+    callers = [asyncio.create_task(flight.do("session", upstream)) for _ in range(10)]
+    await asyncio.sleep(0)
+    assert flight.stats() == {"calls": 1, "coalesced": 9, "in_flight": 1}
+    upstream.release.set()
+
+    assert await asyncio.gather(*callers) == ["u@x"] * 10
+    assert upstream.calls == 1
+
+
+async def test_different_keys_are_not_coalesced() -> None:
+    """Each key gets its own upstream call."""
+    flight: SingleFlight[str, str] = SingleFlight()
+    upstream = Upstream()
+    upstream.release.set()
+
+    await asyncio.gather(flight.do("a", upstream), flight.do("b", upstream))
+
+    assert upstream.calls == 2
+
+
+async def test_leader_exception_reaches_every_follower() -> None:
+    """A failed call raises the same exception in the leader and in every caller that joined it."""
+    flight: SingleFlight[str, str] = SingleFlight()
+    upstream = Upstream(error=ConnectionError("auth_service unreachable"))
+
+    callers = [asyncio.create_task(flight.do("session", upstream)) for _ in range(3)]
+    await asyncio.sleep(0)
+    upstream.release.set()
+
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(result is upstream.error for result in results)
+    assert upstream.calls == 1
+
+
+async def test_cancelled_follower_does_not_cancel_the_leader() -> None:
+    """Cancelling a caller that joined the call leaves the leader (and other followers) running."""
+    flight: SingleFlight[str, str] = SingleFlight()
+    upstream = Upstream()
+
+    leader = asyncio.create_task(flight.do("session", upstream))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("session", upstream))
+    other = asyncio.create_task(flight.do("session", upstream))
+    await asyncio.sleep(0)
+
+    follower.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+    upstream.release.set()
+
+    assert await leader == "u@x"
+    assert await other == "u@x"
+
+
+async def test_cancelled_leader_cancels_its_followers() -> None:
+    """Followers of a cancelled leader are cancelled instead of waiting forever."""
+    flight: SingleFlight[str, str] = SingleFlight()
+    upstream = Upstream()
+
+    leader = asyncio.create_task(flight.do("session", upstream))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("session", upstream))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.parametrize("error", [None, ConnectionError("auth_service unreachable")])
+async def test_key_is_released_after_the_call(error: Exception | None) -> None:
+    """Once a call succeeds or fails, the next caller for the key makes a fresh upstream call."""
+    flight: SingleFlight[str, str] = SingleFlight()
+    upstream = Upstream(error=error)
+    upstream.release.set()
+
+    for _ in range(2):
+        try:
+            await flight.do("session", upstream)
+        except ConnectionError:
+            pass
+        assert flight.stats()["in_flight"] == 0
+
+    assert upstream.calls == 2
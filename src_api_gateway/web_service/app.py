@@ -1,18 +1,30 @@
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import date
 from functools import wraps
 from typing import Any, Callable
 
+import assets
+import redis
 import requests
+import session_tokens
+import upstream_session
 from aws_app_config import aws_app_config_client_sandbox_alex
 from dotenv import load_dotenv
-from flask import Flask, Response, make_response, redirect, render_template, request, session, url_for
+from flask import Flask, Response, abort, g, make_response, redirect, render_template, request, send_file, session, url_for
 from flask_dance.contrib.google import google, make_google_blueprint
 from werkzeug.wrappers import Response as WerkzeugResponse
 
 load_dotenv()
 
-app = Flask(__name__)
+app = Flask(__name__, static_folder=None)  # static/ is served by `static` below (fingerprinted, precompressed)
+
+# * static assets built by `python assets.py build` and templates compiled (from the bytecode cache) before the first request
+static_assets = assets.StaticAssets()
+app.jinja_env.bytecode_cache = assets.create_bytecode_cache()
+assets.warm_templates(app.jinja_env)
 
 # * AWS AppConfigClient instance - for feature flags
 aws_app_config_client = aws_app_config_client_sandbox_alex.AWSAppConfigClientSandboxAlex()
@@ -34,21 +46,123 @@ app.register_blueprint(google_bp, url_prefix="/login")
 AUTH_SERVICE_URL = os.environ["AUTH_SERVICE_URL_REST_API"]
 AWS_REST_API_URL = os.environ["ORDER_SERVICE_URL_REST_API"]
 app.config["SECRET_KEY"] = os.environ["SECRET_KEY"]
+
+# * pooled keep-alive HTTP session shared by every auth_service / order service call (see upstream_session.py)
+upstream = upstream_session.create_upstream_session()
+UPSTREAM_TIMEOUT = upstream_session.UPSTREAM_TIMEOUT
+
+# * signed session tokens are verified locally (revocations read from the auth_service redis) when configured
+token_codec = session_tokens.SessionTokenCodec.from_env()
+token_revocations = session_tokens.RevocationFilter(
+    refresh_interval=float(os.getenv("SESSION_TOKEN_REVOCATION_REFRESH_SECONDS", "5")),
+    max_token_ttl=int(os.getenv("SESSION_EXPIRE_TIME_SECONDS", "3600")),
+)
+revocation_store = (
+    redis.Redis(
+        host=os.environ["REDIS_HOST"],
+        port=int(os.getenv("REDIS_PORT", "6379")),
+        decode_responses=False,
+        socket_timeout=2,
+        ssl=(os.getenv("REDIS_SSL", "false") == "true"),
+    )
+    if token_codec is not None and os.getenv("REDIS_HOST")
+    else None
+)
+
+# * verified sessions cache - session_id -> (user, monotonic expiry); a logout through another web_service task is
+# * picked up after at most VERIFIED_SESSION_CACHE_TTL seconds
+VERIFIED_SESSION_CACHE_TTL = float(os.getenv("VERIFIED_SESSION_CACHE_TTL", "10"))
+VERIFIED_SESSION_CACHE_MAX_SIZE = int(os.getenv("VERIFIED_SESSION_CACHE_MAX_SIZE", "10000"))
+verified_sessions: "OrderedDict[str, tuple[Any, float]]" = OrderedDict()
+verified_sessions_lock = threading.Lock()
+
+# * forward the verified user to order_service as a signed X-Internal-Auth header (same secrets there) when set
+INTERNAL_AUTH_SECRETS = [secret.strip() for secret in os.getenv("INTERNAL_AUTH_SECRETS", "").split(",") if secret.strip()]
+
+# * order_service responses by (session, url, query) -> (ETag, JSON body), revalidated on every use with If-None-Match -
+# * an unchanged order list costs a bodiless 304 instead of the payload
+ORDER_RESPONSE_CACHE_MAX_SIZE = int(os.getenv("ORDER_RESPONSE_CACHE_MAX_SIZE", "2000"))
+order_responses: "OrderedDict[tuple[str, str, tuple[tuple[str, str], ...]], tuple[str, Any]]" = OrderedDict()
+order_responses_lock = threading.Lock()
+
+# * session cookie lifetime - an absolute cap; auth_service slides the session's own (idle) expiry on use
+SESSION_COOKIE_MAX_AGE = int(os.getenv("SESSION_MAX_LIFETIME_SECONDS", "86400"))
+
+# * `TOKEN`: lambda authorizer reads `Authorization: Bearer <session_id>`; `REQUEST`: it reads the session cookie
+LAMBDA_AUTHORIZER_MODE = os.getenv("LAMBDA_AUTHORIZER_MODE", "TOKEN").upper()
 os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"
 
 
+def __cached_session_user(session_id: str) -> Any | None:
+    """Return the cached user of a verified session if present and not expired."""
+    with verified_sessions_lock:
+        entry = verified_sessions.get(session_id)
+        if entry is None or entry[1] <= time.monotonic():
+            verified_sessions.pop(session_id, None)
+            return None
+        verified_sessions.move_to_end(session_id)
+        return entry[0]
+
+
+def __cache_session_user(session_id: str, user: Any) -> None:
+    """Cache a verified session's user for VERIFIED_SESSION_CACHE_TTL seconds, evicting the least recently used."""
+    with verified_sessions_lock:
+        verified_sessions[session_id] = (user, time.monotonic() + VERIFIED_SESSION_CACHE_TTL)
+        verified_sessions.move_to_end(session_id)
+        while len(verified_sessions) > VERIFIED_SESSION_CACHE_MAX_SIZE:
+            verified_sessions.popitem(last=False)
+
+
+def __verify_session_locally(session_id: str) -> tuple[bool, dict[str, str] | None]:
+    """Verify a signed session token without auth_service: (handled, user) - not handled if it needs a remote check."""
+    if token_codec is None or revocation_store is None or not session_tokens.is_signed_token(session_id):
+        return False, None
+    claims = token_codec.verify(session_id)
+    try:
+        if claims is None or session_tokens.is_revoked(claims, token_revocations, revocation_store):
+            return True, None
+    except redis.RedisError:
+        return False, None  # let auth_service decide
+    return True, session_tokens.user_from_claims(claims)
+
+
+def get_session_user() -> Any | None:
+    """
+    User of the request's session cookie (as returned by auth_service /verify), None if there is no valid session.
+
+    Verified at most once per request (kept on `flask.g`) and served from the verified sessions cache for
+    VERIFIED_SESSION_CACHE_TTL seconds; raises requests.RequestException if auth_service can't be reached.
+    """
+    if "session_user" in g:
+        return g.session_user
+
+    session_id = request.cookies.get("session_id", "")
+    user = None
+    if session_id:
+        handled, user = __verify_session_locally(session_id)
+        if not handled:
+            user = __cached_session_user(session_id)
+        if not handled and user is None:
+            response = upstream.post(f"{AUTH_SERVICE_URL}/verify", json={"session_id": session_id}, timeout=UPSTREAM_TIMEOUT)
+            if response.status_code == 200:
+                try:
+                    user = response.json().get("user") or {}
+                except ValueError:
+                    user = {}
+                __cache_session_user(session_id, user)
+
+    g.session_user = user
+    return user
+
+
 def login_required(f: Callable) -> Callable:
     """Decorator to enforce login by validating the session ID with the auth service."""
 
     @wraps(f)
     def decorated_function(*args: Any, **kwargs: Any) -> Any:
         """decorated function to check session ID."""
-        session_id = request.cookies.get("session_id", "")
-        if not session_id:
-            return redirect(url_for("login"))
         try:
-            response = requests.post(f"{AUTH_SERVICE_URL}/verify", json={"session_id": session_id}, timeout=3)
-            if response.status_code != 200:
+            if get_session_user() is None:
                 return redirect(url_for("login"))
         except requests.exceptions.Timeout:
             return "Server timeout. Please try again.", 504
@@ -63,31 +177,99 @@ def check_already_logged_in(f: Callable) -> Callable:
     @wraps(f)
     def wrapper(*args: Any, **kwargs: Any) -> WerkzeugResponse | tuple[str, int]:
         """Check if user is already logged in and redirect to dashboard if so."""
-        session_id = request.cookies.get("session_id", "")
-        if session_id:
-            try:
-                response = requests.post(f"{AUTH_SERVICE_URL}/verify", json={"session_id": session_id}, timeout=3)
-                if response.status_code == 200:
-                    return redirect(url_for("dashboard"))
-            except requests.exceptions.Timeout:
-                return "Server timeout. Please try again.", 504
-            except requests.RequestException:
-                pass
+        try:
+            if get_session_user() is not None:
+                return redirect(url_for("dashboard"))
+        except requests.exceptions.Timeout:
+            return "Server timeout. Please try again.", 504
+        except requests.RequestException:
+            pass
         return f(*args, **kwargs)
 
     return wrapper
 
 
+def __internal_auth_header() -> dict[str, str]:
+    """Signed X-Internal-Auth header carrying the already verified user, so order_service can skip its own /verify."""
+    user = g.get("session_user")
+    if not INTERNAL_AUTH_SECRETS or not isinstance(user, dict) or not user.get("email"):
+        return {}
+    return {
+        session_tokens.INTERNAL_AUTH_HEADER: session_tokens.sign_internal_identity(INTERNAL_AUTH_SECRETS[0], user["email"])
+    }
+
+
 def __set_and_get_auth_headers() -> dict[str, str]:
     """Return headers needed for order service requests based on session type."""
     session_id = request.cookies.get("session_id", "")
     if aws_app_config_client.get_config_api_gateway_authorizer_ecs_auth_service():
-        return {"Content-Type": "application/json", "Cookie": f"session_id={session_id}"}
+        return {"Content-Type": "application/json", "Cookie": f"session_id={session_id}", **__internal_auth_header()}
 
     if aws_app_config_client.get_config_api_gateway_authorizer_lambda_authorizer():
+        if LAMBDA_AUTHORIZER_MODE == "REQUEST":
+            return {"Content-Type": "application/json", "Cookie": f"session_id={session_id}"}
         return {"Content-Type": "application/json", "Authorization": f"Bearer {session_id}"}
 
-    return {}
+    return __internal_auth_header()
+
+
+def __get_order_service_json(url: str, params: dict[str, str] | None = None) -> tuple[int, Any]:
+    """
+    GET an order_service resource as (status code, JSON body), body None unless 200.
+
+    The last 200 body and its ETag are kept per session; the next GET sends If-None-Match and a 304 reuses the body.
+    """
+    session_id = request.cookies.get("session_id", "")
+    key = (session_id, url, tuple(sorted((params or {}).items())))
+    with order_responses_lock:
+        cached = order_responses.get(key)
+    headers = __set_and_get_auth_headers()
+    if cached is not None:
+        headers = {**headers, "If-None-Match": cached[0]}
+
+    resp = upstream.get(url, params=params, cookies={"session_id": session_id}, headers=headers, timeout=UPSTREAM_TIMEOUT)
+
+    if resp.status_code == 304 and cached is not None:
+        with order_responses_lock:
+            if key in order_responses:
+                order_responses.move_to_end(key)
+        return 200, cached[1]
+    if resp.status_code != 200:
+        with order_responses_lock:
+            order_responses.pop(key, None)
+        return resp.status_code, None
+
+    body = resp.json()
+    with order_responses_lock:
+        if etag := resp.headers.get("ETag"):
+            order_responses[key] = (etag, body)
+            order_responses.move_to_end(key)
+            while len(order_responses) > ORDER_RESPONSE_CACHE_MAX_SIZE:
+                order_responses.popitem(last=False)
+        else:
+            order_responses.pop(key, None)
+    return 200, body
+
+
+@app.url_defaults
+def fingerprint_static_urls(endpoint: str, values: dict[str, Any]) -> None:
+    """url_for("static", filename=...) points at the fingerprinted copy of the file once assets are built."""
+    if endpoint == "static" and "filename" in values:
+        values["filename"] = static_assets.url_filename(values["filename"])
+
+
+@app.route("/static/<path:filename>", endpoint="static")
+def static(filename: str) -> Response:
+    """Serve a static asset - the precompressed variant the client accepts, fingerprinted ones as immutable."""
+    asset = static_assets.resolve(filename, request.headers.get("Accept-Encoding", ""))
+    if asset is None:
+        abort(404)
+    response = send_file(asset.path, mimetype=asset.mimetype, conditional=True, etag=True)
+    response.headers["Cache-Control"] = asset.cache_control
+    response.headers["Vary"] = "Accept-Encoding"
+    if asset.content_encoding:
+        response.headers["Content-Encoding"] = asset.content_encoding
+    return response
 
 
 @app.route("/google-logged-in")
@@ -101,16 +283,24 @@ def google_logged_in() -> Response | WerkzeugResponse | str | tuple[str, int]:
     user_info = resp.json()
 
     try:
-        auth_response = requests.post(
+        auth_response = upstream.post(
             f"{AUTH_SERVICE_URL}/store_google_user_info",
             json={"email": user_info.get("email"), "name": user_info.get("name")},
-            timeout=3,
+            timeout=UPSTREAM_TIMEOUT,
         )
         if auth_response.status_code != 200:
             return f"Failed to create session: {auth_response.text}", 500
         session_id = auth_response.json()["session_id"]
         response = make_response(render_template("google_logged_in.html", user=user_info, current_year=date.today().year))
-        response.set_cookie("session_id", session_id, httponly=True, secure=False, domain=request.host, path="/", max_age=3600)
+        response.set_cookie(
+            "session_id",
+            session_id,
+            httponly=True,
+            secure=False,
+            domain=request.host,
+            path="/",
+            max_age=SESSION_COOKIE_MAX_AGE,
+        )
         return response
     except requests.exceptions.Timeout:
         return "Server timeout. Please try again.", 504
@@ -120,18 +310,13 @@ def google_logged_in() -> Response | WerkzeugResponse | str | tuple[str, int]:
 @check_already_logged_in
 def index() -> Response | str | tuple[str, int]:
     """Landing page that checks for a valid session and shows user info if logged in."""
-    session_id = request.cookies.get("session_id", "")
-    if session_id:
-        try:
-            response = requests.post(f"{AUTH_SERVICE_URL}/verify", json={"session_id": session_id}, timeout=3)
-            if response.status_code == 200:
-                user = response.json().get("user")
-                return render_template("index.html", user=user, current_year=date.today().year)
-        except requests.exceptions.Timeout:
-            return "Server timeout. Please try again.", 504
-        except requests.RequestException:
-            pass
-    return render_template("index.html", user=None, current_year=date.today().year)
+    try:
+        user = get_session_user()  # already verified by check_already_logged_in for this request
+    except requests.exceptions.Timeout:
+        return "Server timeout. Please try again.", 504
+    except requests.RequestException:
+        user = None
+    return render_template("index.html", user=user, current_year=date.today().year)
 
 
 @app.route("/login", methods=["GET", "POST"])
@@ -142,13 +327,21 @@ def login() -> Response | WerkzeugResponse | str | tuple[str, int]:
         username = request.form["username"]
         password = request.form["password"]
         try:
-            response = requests.post(f"{AUTH_SERVICE_URL}/login", json={"username": username, "password": password}, timeout=3)
+            response = upstream.post(
+                f"{AUTH_SERVICE_URL}/login", json={"username": username, "password": password}, timeout=UPSTREAM_TIMEOUT
+            )
             if response.status_code == 200:
                 session_id = response.json().get("session_id")
                 if session_id:
                     resp = redirect(url_for("dashboard"))
                     resp.set_cookie(
-                        "session_id", session_id, httponly=True, secure=False, domain=request.host, path="/", max_age=3600
+                        "session_id",
+                        session_id,
+                        httponly=True,
+                        secure=False,
+                        domain=request.host,
+                        path="/",
+                        max_age=SESSION_COOKIE_MAX_AGE,
                     )
                     return resp
                 error = "Session ID missing from response."
@@ -187,25 +380,24 @@ def settings() -> str:
 def my_orders() -> Response | str | tuple[str, int]:
     """Retrieve and display the user's orders."""
     try:
-        headers = __set_and_get_auth_headers()
-        print(f"headers: {headers}")
-        resp = requests.get(
+        status_code, page = __get_order_service_json(
             f"{AWS_REST_API_URL}/orders",
-            cookies={"session_id": request.cookies.get("session_id", "")},
-            headers=__set_and_get_auth_headers(),
-            timeout=3,
+            params={k: v for k in ("cursor", "status") if (v := request.args.get(k))},
         )
     except requests.exceptions.Timeout:
         return "Server timeout. Please try again.", 504
 
-    if resp.status_code != 200:
-        return f"Failed to fetch orders. Status code: {resp.status_code}", resp.status_code
-
-    print(f"resp.status_code: {resp.status_code}")
-    print(f"resp.json(): {resp.json()}")
+    if status_code != 200:
+        return f"Failed to fetch orders. Status code: {status_code}", status_code
 
-    orders = resp.json() or []
-    return render_template("my_orders.html", orders=orders, current_year=date.today().year)
+    page = page or {}
+    return render_template(
+        "my_orders.html",
+        orders=page.get("orders", []),
+        next_cursor=page.get("next_cursor"),
+        status=request.args.get("status"),
+        current_year=date.today().year,
+    )
 
 
 @app.route("/my-orders/<order_id>")
@@ -213,19 +405,14 @@ def my_orders() -> Response | str | tuple[str, int]:
 def get_order_detail(order_id: str) -> Response | str | tuple[str, int]:
     """Get details of a specific order."""
     try:
-        resp = requests.get(
-            f"{AWS_REST_API_URL}/orders/{order_id}",
-            cookies={"session_id": request.cookies.get("session_id", "")},
-            headers=__set_and_get_auth_headers(),
-            timeout=3,
-        )
+        status_code, order = __get_order_service_json(f"{AWS_REST_API_URL}/orders/{order_id}")
     except requests.exceptions.Timeout:
         return "Server timeout. Please try again.", 504
 
-    if resp.status_code == 404:
+    if status_code == 404:
         return f"Order {order_id} not found.", 404
-    order = resp.json()
-    print(f"resp.json(): {resp.json()}")
+    if status_code != 200:
+        return f"Failed to load order (status {status_code}).", status_code
     return render_template("order_detail.html", order=order, current_year=date.today().year)
 
 
@@ -238,12 +425,12 @@ def place_order() -> Response | WerkzeugResponse | str | tuple[str, int] | tuple
         total = request.form.get("total", 0)
         data = {"items": [i.strip() for i in items.split(",") if i.strip()], "total": float(total)}
         try:
-            response = requests.post(
+            response = upstream.post(
                 f"{AWS_REST_API_URL}/orders",
                 json=data,
                 cookies={"session_id": request.cookies.get("session_id", "")},
                 headers=__set_and_get_auth_headers(),
-                timeout=3,
+                timeout=UPSTREAM_TIMEOUT,
             )
             if response.status_code == 201:
                 return redirect(url_for("my_orders"), code=303)  # 303 to prevent resubmission on refresh
@@ -262,7 +449,7 @@ def edit_order(order_id: str) -> Response | WerkzeugResponse | str | tuple[str,
     api_url = f"{AWS_REST_API_URL}/orders/{order_id}"
     headers = __set_and_get_auth_headers()
     errors: dict[str, str] = {}
-    order = {}
+    order: dict[str, Any] = {}
 
     if request.method == "POST":
         items_str = request.form.get("items", "").strip()
@@ -286,12 +473,12 @@ def edit_order(order_id: str) -> Response | WerkzeugResponse | str | tuple[str,
         if not errors:
             payload = {"items": items, "total": total, "status": status}
             try:
-                resp = requests.put(
+                resp = upstream.put(
                     api_url,
                     json=payload,
                     cookies={"session_id": request.cookies.get("session_id", "")},
                     headers=headers,
-                    timeout=3,
+                    timeout=UPSTREAM_TIMEOUT,
                 )
                 if resp.status_code == 200:
                     return redirect(url_for("get_order_detail", order_id=order_id))
@@ -300,15 +487,12 @@ def edit_order(order_id: str) -> Response | WerkzeugResponse | str | tuple[str,
                 return "Server timeout. Please try again.", 504
     else:
         try:
-            resp = requests.get(
-                api_url, cookies={"session_id": request.cookies.get("session_id", "")}, headers=headers, timeout=3
-            )
+            status_code, order = __get_order_service_json(api_url)
         except requests.exceptions.Timeout:
             return "Server timeout. Please try again.", 504
 
-        if resp.status_code != 200:
-            return f"Failed to load order (status {resp.status_code}).", resp.status_code
-        order = resp.json()
+        if status_code != 200:
+            return f"Failed to load order (status {status_code}).", status_code
 
     print(f"order: {order}")
 
@@ -322,11 +506,11 @@ def delete_order(order_id: str) -> Response | str | tuple[str, int] | WerkzeugRe
     api_url = f"{AWS_REST_API_URL}/orders/{order_id}"
 
     try:
-        response = requests.delete(
+        response = upstream.delete(
             api_url,
             cookies={"session_id": request.cookies.get("session_id", "")},
             headers=__set_and_get_auth_headers(),
-            timeout=3,
+            timeout=UPSTREAM_TIMEOUT,
         )
         if response.status_code == 204:
             return redirect(url_for("my_orders"), code=303)  # 303 to prevent resubmission on refresh
@@ -337,12 +521,33 @@ def delete_order(order_id: str) -> Response | str | tuple[str, int] | WerkzeugRe
         return f"Error: {str(e)}"
 
 
+def __logout_upstream(session_id: str) -> None:
+    """
+    Delete the session in auth_service - through order_service /sessions/logout, which also drops it from order_service's
+    verified session cache - or directly when that fails (order_service unreachable or erroring, API Gateway rejecting the
+    call, auth_service not reached from there).
+    """
+    try:
+        response = upstream.post(
+            f"{AWS_REST_API_URL}/sessions/logout", cookies={"session_id": session_id}, timeout=UPSTREAM_TIMEOUT
+        )
+        if response.status_code == 200:
+            return
+    except requests.exceptions.Timeout:
+        raise
+    except requests.RequestException:
+        pass
+    upstream.post(f"{AUTH_SERVICE_URL}/logout", json={"session_id": session_id}, timeout=UPSTREAM_TIMEOUT)
+
+
 @app.route("/logout", methods=["GET", "POST"])
 def logout() -> Response | WerkzeugResponse | str | tuple[str, int]:
     """Logout the user by clearing session and redirecting through Google logout."""
     if session_id := request.cookies.get("session_id", ""):
+        with verified_sessions_lock:
+            verified_sessions.pop(session_id, None)
         try:
-            requests.post(f"{AUTH_SERVICE_URL}/logout", json={"session_id": session_id}, timeout=3)
+            __logout_upstream(session_id)
             google.token = None
             session.clear()
             logout_url = (
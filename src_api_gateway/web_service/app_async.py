@@ -0,0 +1,613 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
+from urllib.parse import urlencode
+
+import assets
+import httpx
+import redis.asyncio as redis
+import session_tokens
+import upstream_session
+from authlib.integrations.starlette_client import OAuth, OAuthError
+from aws_app_config import aws_app_config_client_sandbox_alex
+from dotenv import load_dotenv
+from fastapi import FastAPI, Request
+from fastapi.responses import FileResponse, HTMLResponse, PlainTextResponse, RedirectResponse, Response
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.routing import Route
+
+# * async variant of app.py - same routes, templates and responses, built on FastAPI and an httpx.AsyncClient, so one
+# * worker keeps many pages in flight while they wait on auth_service / order_service. run with:
+# *     uvicorn app_async:app --host 0.0.0.0 --port 5001 --workers 4
+# * a page's independent upstream calls (session /verify and the order read) are issued concurrently, see
+# * `verified_and`. every worker process gets its own connection pool (created in lifespan, after the fork)
+
+load_dotenv()
+
+T = TypeVar("T")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# * AWS AppConfigClient instance - for feature flags
+aws_app_config_client = aws_app_config_client_sandbox_alex.AWSAppConfigClientSandboxAlex()
+
+# * Configuration variables - same environment as app.py
+AUTH_SERVICE_URL = os.environ["AUTH_SERVICE_URL_REST_API"]
+AWS_REST_API_URL = os.environ["ORDER_SERVICE_URL_REST_API"]
+SECRET_KEY = os.environ["SECRET_KEY"]
+
+# * signed session tokens are verified locally (revocations read from the auth_service redis) when configured
+token_codec = session_tokens.SessionTokenCodec.from_env()
+token_revocations = session_tokens.RevocationFilter(
+    refresh_interval=float(os.getenv("SESSION_TOKEN_REVOCATION_REFRESH_SECONDS", "5")),
+    max_token_ttl=int(os.getenv("SESSION_EXPIRE_TIME_SECONDS", "3600")),
+)
+revocation_store = (
+    redis.Redis(
+        host=os.environ["REDIS_HOST"],
+        port=int(os.getenv("REDIS_PORT", "6379")),
+        decode_responses=False,
+        socket_timeout=2,
+        ssl=(os.getenv("REDIS_SSL", "false") == "true"),
+    )
+    if token_codec is not None and os.getenv("REDIS_HOST")
+    else None
+)
+
+# * verified sessions cache - session_id -> (user, monotonic expiry). one event loop per worker, so no lock
+VERIFIED_SESSION_CACHE_TTL = float(os.getenv("VERIFIED_SESSION_CACHE_TTL", "10"))
+VERIFIED_SESSION_CACHE_MAX_SIZE = int(os.getenv("VERIFIED_SESSION_CACHE_MAX_SIZE", "10000"))
+verified_sessions: "OrderedDict[str, tuple[Any, float]]" = OrderedDict()
+
+# * forward the verified user to order_service as a signed X-Internal-Auth header (same secrets there) when set
+INTERNAL_AUTH_SECRETS = [secret.strip() for secret in os.getenv("INTERNAL_AUTH_SECRETS", "").split(",") if secret.strip()]
+
+# * order_service responses by (session, url, query) -> (ETag, JSON body), revalidated on every use with If-None-Match
+ORDER_RESPONSE_CACHE_MAX_SIZE = int(os.getenv("ORDER_RESPONSE_CACHE_MAX_SIZE", "2000"))
+order_responses: "OrderedDict[tuple[str, str, tuple[tuple[str, str], ...]], tuple[str, Any]]" = OrderedDict()
+
+# * session cookie lifetime - an absolute cap; auth_service slides the session's own (idle) expiry on use
+SESSION_COOKIE_MAX_AGE = int(os.getenv("SESSION_MAX_LIFETIME_SECONDS", "86400"))
+
+# * `TOKEN`: lambda authorizer reads `Authorization: Bearer <session_id>`; `REQUEST`: it reads the session cookie
+LAMBDA_AUTHORIZER_MODE = os.getenv("LAMBDA_AUTHORIZER_MODE", "TOKEN").upper()
+
+# * Google OAuth - same scopes as the flask-dance blueprint in app.py, token kept in the signed `session` cookie
+oauth = OAuth()
+oauth.register(
+    name="google",
+    client_id=os.environ["GOOGLE_OAUTH_CLIENT_ID"],
+    client_secret=os.environ["GOOGLE_OAUTH_CLIENT_SECRET"],
+    server_metadata_url="https://accounts.google.com/.well-known/openid-configuration",
+    api_base_url="https://www.googleapis.com/",
+    client_kwargs={
+        "scope": " ".join(
+            [
+                "https://www.googleapis.com/auth/userinfo.email",
+                "https://www.googleapis.com/auth/userinfo.profile",
+                "openid",
+            ]
+        )
+    },
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Open the worker's upstream connection pool on startup and close it (and redis) on shutdown."""
+    app.state.upstream = upstream_session.create_async_upstream_client()
+    yield
+    await app.state.upstream.aclose()
+    if revocation_store is not None:
+        await revocation_store.aclose()
+
+
+app = FastAPI(lifespan=lifespan, docs_url=None, redoc_url=None, openapi_url=None)
+app.add_middleware(SessionMiddleware, secret_key=SECRET_KEY)
+
+
+def get_upstream() -> httpx.AsyncClient:
+    """The worker's pooled client for auth_service and order_service, opened by lifespan."""
+    return app.state.upstream
+
+
+# * static assets built by `python assets.py build` and templates compiled (from the bytecode cache) before the first request
+static_assets = assets.StaticAssets()
+templates = Environment(
+    loader=FileSystemLoader(os.path.join(BASE_DIR, "templates")),
+    autoescape=select_autoescape(),
+    bytecode_cache=assets.create_bytecode_cache(),
+)
+
+
+class LoginRequired(Exception):
+    """Raised for a request without a valid session - answered with a redirect to /login, as login_required in app.py."""
+
+
+def url_for(endpoint: str, **values: Any) -> str:
+    """Flask-style url_for for the shared templates: route parameters fill the path, the others become the query string."""
+    if endpoint == "static":
+        return app.url_path_for("static", filename=static_assets.url_filename(values["filename"]))
+    route = next(r for r in app.routes if isinstance(r, Route) and r.name == endpoint)
+    path = app.url_path_for(endpoint, **{name: values.pop(name) for name in route.param_convertors})
+    query = urlencode({name: value for name, value in values.items() if value is not None})
+    return f"{path}?{query}" if query else str(path)
+
+
+templates.globals["url_for"] = url_for
+assets.warm_templates(templates)
+
+
+def render_template(template: str, status_code: int = 200, **context: Any) -> HTMLResponse:
+    """Render one of the templates shared with app.py."""
+    return HTMLResponse(templates.get_template(template).render(**context), status_code=status_code)
+
+
+def redirect(url: str, code: int = 302) -> RedirectResponse:
+    """Redirect with flask's default status (302), not starlette's 307."""
+    return RedirectResponse(url, status_code=code)
+
+
+def set_session_cookie(response: Response, request: Request, session_id: str) -> None:
+    """Set the session cookie the same way as app.py."""
+    response.set_cookie(
+        "session_id",
+        session_id,
+        httponly=True,
+        secure=False,
+        domain=request.url.hostname,
+        path="/",
+        max_age=SESSION_COOKIE_MAX_AGE,
+    )
+
+
+@app.exception_handler(LoginRequired)
+async def login_required(request: Request, exc: LoginRequired) -> Response:
+    """Send requests without a valid session to the login page."""
+    return redirect(url_for("login"))
+
+
+@app.exception_handler(httpx.TimeoutException)
+async def upstream_timeout(request: Request, exc: httpx.TimeoutException) -> Response:
+    """Upstream call timed out."""
+    return PlainTextResponse("Server timeout. Please try again.", status_code=504)
+
+
+def _cached_session_user(session_id: str) -> Any | None:
+    """Return the cached user of a verified session if present and not expired."""
+    entry = verified_sessions.get(session_id)
+    if entry is None or entry[1] <= time.monotonic():
+        verified_sessions.pop(session_id, None)
+        return None
+    verified_sessions.move_to_end(session_id)
+    return entry[0]
+
+
+def _cache_session_user(session_id: str, user: Any) -> None:
+    """Cache a verified session's user for VERIFIED_SESSION_CACHE_TTL seconds, evicting the least recently used."""
+    verified_sessions[session_id] = (user, time.monotonic() + VERIFIED_SESSION_CACHE_TTL)
+    verified_sessions.move_to_end(session_id)
+    while len(verified_sessions) > VERIFIED_SESSION_CACHE_MAX_SIZE:
+        verified_sessions.popitem(last=False)
+
+
+async def _is_revoked(claims: session_tokens.Claims) -> bool:
+    """Async session_tokens.is_revoked - bloom filter check, confirmed against redis on a hit."""
+    if token_revocations.needs_refresh():
+        token_revocations.refreshed_at = time.monotonic()  # one refresh at a time
+        windows = token_revocations.windows()
+        bitmaps = await revocation_store.mget([session_tokens.bloom_key(w) for w in windows])  # type: ignore
+        token_revocations.load(windows, bitmaps)
+    if not token_revocations.might_be_revoked(claims):
+        return False
+    return bool(await revocation_store.exists(f"{session_tokens.REVOKED_KEY_PREFIX}{claims['jti']}"))  # type: ignore
+
+
+async def _verify_session_locally(session_id: str) -> tuple[bool, dict[str, str] | None]:
+    """Verify a signed session token without calling auth_service: (handled, user), not handled if auth_service must decide."""
+    if token_codec is None or revocation_store is None or not session_tokens.is_signed_token(session_id):
+        return False, None
+    claims = token_codec.verify(session_id)
+    try:
+        if claims is None or await _is_revoked(claims):
+            return True, None
+    except redis.RedisError:
+        return False, None  # let auth_service decide
+    return True, session_tokens.user_from_claims(claims)
+
+
+async def _verify_session(session_id: str) -> Any | None:
+    """User of a session ID - verified locally, from the verified sessions cache or by auth_service /verify."""
+    if not session_id:
+        return None
+    handled, user = await _verify_session_locally(session_id)
+    if handled:
+        return user
+    user = _cached_session_user(session_id)
+    if user is None:
+        response = await get_upstream().post(f"{AUTH_SERVICE_URL}/verify", json={"session_id": session_id})
+        if response.status_code == 200:
+            try:
+                user = response.json().get("user") or {}
+            except ValueError:
+                user = {}
+            _cache_session_user(session_id, user)
+    return user
+
+
+async def get_session_user(request: Request) -> Any | None:
+    """
+    User of the request's session cookie (as returned by auth_service /verify), None if there is no valid session.
+
+    Verified at most once per request, also when awaited concurrently; raises httpx.HTTPError if auth_service can't be reached.
+    """
+    if not hasattr(request.state, "session_user"):
+        request.state.session_user = asyncio.ensure_future(_verify_session(request.cookies.get("session_id", "")))
+    return await request.state.session_user
+
+
+async def require_user(request: Request) -> Any:
+    """User of the request's session, raises LoginRequired if there is none."""
+    user = await get_session_user(request)
+    if user is None:
+        raise LoginRequired()
+    return user
+
+
+def _order_calls_need_user() -> bool:
+    """True if order_service calls carry the verified user (X-Internal-Auth), so they can only start after /verify."""
+    return bool(INTERNAL_AUTH_SECRETS) and not aws_app_config_client.get_config_api_gateway_authorizer_lambda_authorizer()
+
+
+async def verified_and(request: Request, call: Callable[[], Awaitable[T]]) -> T:
+    """
+    Run an order_service read for a logged-in user, raising LoginRequired if the session is invalid.
+
+    order_service authenticates the request itself, so the read is issued concurrently with the session check - a page
+    costs max(verify, read) instead of their sum. Reads that forward the verified user wait for it; writes never use this.
+    """
+    if _order_calls_need_user():
+        await require_user(request)
+        return await call()
+    user, result = await asyncio.gather(get_session_user(request), call())
+    if user is None:
+        raise LoginRequired()
+    return result
+
+
+async def _internal_auth_header(request: Request) -> dict[str, str]:
+    """Signed X-Internal-Auth header carrying the verified user, so order_service can skip its own /verify."""
+    if not INTERNAL_AUTH_SECRETS:
+        return {}
+    user = await get_session_user(request)
+    if not isinstance(user, dict) or not user.get("email"):
+        return {}
+    return {
+        session_tokens.INTERNAL_AUTH_HEADER: session_tokens.sign_internal_identity(INTERNAL_AUTH_SECRETS[0], user["email"])
+    }
+
+
+async def order_service_headers(request: Request) -> dict[str, str]:
+    """Return headers needed for order service requests based on session type - always with the session cookie, as app.py."""
+    session_id = request.cookies.get("session_id", "")
+    cookie = {"Cookie": f"session_id={session_id}"}
+    if aws_app_config_client.get_config_api_gateway_authorizer_ecs_auth_service():
+        return {"Content-Type": "application/json", **cookie, **await _internal_auth_header(request)}
+
+    if aws_app_config_client.get_config_api_gateway_authorizer_lambda_authorizer():
+        if LAMBDA_AUTHORIZER_MODE == "REQUEST":
+            return {"Content-Type": "application/json", **cookie}
+        return {"Content-Type": "application/json", **cookie, "Authorization": f"Bearer {session_id}"}
+
+    return {**cookie, **await _internal_auth_header(request)}
+
+
+async def get_order_service_json(request: Request, url: str, params: dict[str, str] | None = None) -> tuple[int, Any]:
+    """
+    GET an order_service resource as (status code, JSON body), body None unless 200.
+
+    The last 200 body and its ETag are kept per session; the next GET sends If-None-Match and a 304 reuses the body.
+    """
+    key = (request.cookies.get("session_id", ""), url, tuple(sorted((params or {}).items())))
+    cached = order_responses.get(key)
+    headers = await order_service_headers(request)
+    if cached is not None:
+        headers["If-None-Match"] = cached[0]
+
+    resp = await get_upstream().get(url, params=params, headers=headers)
+
+    if resp.status_code == 304 and cached is not None:
+        if key in order_responses:
+            order_responses.move_to_end(key)
+        return 200, cached[1]
+    if resp.status_code != 200:
+        order_responses.pop(key, None)
+        return resp.status_code, None
+
+    body = resp.json()
+    if etag := resp.headers.get("ETag"):
+        order_responses[key] = (etag, body)
+        order_responses.move_to_end(key)
+        while len(order_responses) > ORDER_RESPONSE_CACHE_MAX_SIZE:
+            order_responses.popitem(last=False)
+    else:
+        order_responses.pop(key, None)
+    return 200, body
+
+
+@app.get("/static/{filename:path}", name="static")
+async def static(request: Request, filename: str) -> Response:
+    """Serve a static asset - the precompressed variant the client accepts, fingerprinted ones as immutable."""
+    asset = static_assets.resolve(filename, request.headers.get("accept-encoding", ""))
+    if asset is None:
+        return PlainTextResponse("Not Found", status_code=404)
+    headers = {"Cache-Control": asset.cache_control, "Vary": "Accept-Encoding"}
+    if asset.content_encoding:
+        headers["Content-Encoding"] = asset.content_encoding
+    return FileResponse(asset.path, media_type=asset.mimetype, headers=headers)
+
+
+@app.get("/login/google", name="google.login")
+async def google_login(request: Request) -> Response:
+    """Start the Google OAuth flow (flask-dance's `google.login`)."""
+    return await oauth.google.authorize_redirect(request, str(request.url_for("google.authorized")))
+
+
+@app.get("/login/google/authorized", name="google.authorized")
+async def google_authorized(request: Request) -> Response:
+    """Google OAuth callback - keep the access token in the session and continue to /google-logged-in."""
+    try:
+        token = await oauth.google.authorize_access_token(request)
+    except OAuthError as e:
+        return PlainTextResponse(f"Failed to authorize with Google: {e.description}", status_code=500)
+    request.session["google_oauth_token"] = {"access_token": token["access_token"], "token_type": token["token_type"]}
+    return redirect(url_for("google_logged_in"))
+
+
+@app.get("/google-logged-in")
+async def google_logged_in(request: Request) -> Response:
+    """Handle login callback from Google and create a session via the auth service."""
+    token = request.session.get("google_oauth_token")
+    if not token:
+        return redirect(url_for("google.login"))
+    resp = await oauth.google.get("oauth2/v2/userinfo", token=token)
+    if resp.status_code != 200:
+        return PlainTextResponse(f"Failed to fetch user info: {resp.text}", status_code=500)
+    user_info = resp.json()
+
+    auth_response = await get_upstream().post(
+        f"{AUTH_SERVICE_URL}/store_google_user_info",
+        json={"email": user_info.get("email"), "name": user_info.get("name")},
+    )
+    if auth_response.status_code != 200:
+        return PlainTextResponse(f"Failed to create session: {auth_response.text}", status_code=500)
+    response = render_template("google_logged_in.html", user=user_info, current_year=date.today().year)
+    set_session_cookie(response, request, auth_response.json()["session_id"])
+    return response
+
+
+@app.get("/")
+async def index(request: Request) -> Response:
+    """Landing page that checks for a valid session and shows user info if logged in."""
+    try:
+        user = await get_session_user(request)
+    except httpx.TimeoutException:
+        raise
+    except httpx.HTTPError:
+        user = None
+    if user is not None:
+        return redirect(url_for("dashboard"))
+    return render_template("index.html", user=user, current_year=date.today().year)
+
+
+@app.api_route("/login", methods=["GET", "POST"])
+async def login(request: Request) -> Response:
+    """Login form that authenticates user via the auth service and sets a session cookie."""
+    error: str | None = None
+    if request.method == "POST":
+        form = await request.form()
+        try:
+            response = await get_upstream().post(
+                f"{AUTH_SERVICE_URL}/login", json={"username": form.get("username"), "password": form.get("password")}
+            )
+            if response.status_code == 200:
+                session_id = response.json().get("session_id")
+                if session_id:
+                    resp = redirect(url_for("dashboard"))
+                    set_session_cookie(resp, request, session_id)
+                    return resp
+                error = "Session ID missing from response."
+            else:
+                error = "Invalid credentials."
+        except httpx.TimeoutException:
+            raise
+        except httpx.HTTPError:
+            error = "Auth service unavailable."
+    return render_template("login.html", error=error, current_year=date.today().year)
+
+
+@app.get("/dashboard")
+async def dashboard(request: Request) -> Response:
+    """User dashboard view."""
+    await require_user(request)
+    return render_template("dashboard.html", current_year=date.today().year)
+
+
+@app.get("/profile")
+async def profile(request: Request) -> Response:
+    """User profile page."""
+    await require_user(request)
+    return render_template("profile.html", current_year=date.today().year)
+
+
+@app.get("/settings")
+async def settings(request: Request) -> Response:
+    """User settings page."""
+    await require_user(request)
+    return render_template("settings.html", current_year=date.today().year)
+
+
+@app.get("/my-orders")
+async def my_orders(request: Request) -> Response:
+    """Retrieve and display the user's orders - the order read runs concurrently with the session check."""
+    params = {k: v for k in ("cursor", "status") if (v := request.query_params.get(k))}
+    status_code, page = await verified_and(
+        request, lambda: get_order_service_json(request, f"{AWS_REST_API_URL}/orders", params=params)
+    )
+    if status_code != 200:
+        return PlainTextResponse(f"Failed to fetch orders. Status code: {status_code}", status_code=status_code)
+
+    page = page or {}
+    return render_template(
+        "my_orders.html",
+        orders=page.get("orders", []),
+        next_cursor=page.get("next_cursor"),
+        status=request.query_params.get("status"),
+        current_year=date.today().year,
+    )
+
+
+@app.get("/my-orders/{order_id}")
+async def get_order_detail(request: Request, order_id: str) -> Response:
+    """Get details of a specific order - the order read runs concurrently with the session check."""
+    status_code, order = await verified_and(
+        request, lambda: get_order_service_json(request, f"{AWS_REST_API_URL}/orders/{order_id}")
+    )
+    if status_code == 404:
+        return PlainTextResponse(f"Order {order_id} not found.", status_code=404)
+    if status_code != 200:
+        return PlainTextResponse(f"Failed to load order (status {status_code}).", status_code=status_code)
+    return render_template("order_detail.html", order=order, current_year=date.today().year)
+
+
+@app.api_route("/place-order", methods=["GET", "POST"])
+async def place_order(request: Request) -> Response:
+    """Form to place a new order."""
+    await require_user(request)
+    if request.method == "POST":
+        form = await request.form()
+        items = str(form.get("items", ""))
+        try:
+            total = float(form.get("total", 0))  # type: ignore
+            data = {"items": [i.strip() for i in items.split(",") if i.strip()], "total": total}
+            response = await get_upstream().post(
+                f"{AWS_REST_API_URL}/orders", json=data, headers=await order_service_headers(request)
+            )
+            if response.status_code == 201:
+                return redirect(url_for("my_orders"), code=303)  # 303 to prevent resubmission on refresh
+            return PlainTextResponse(
+                f"Failed to create order. Status code: {response.status_code}", status_code=response.status_code
+            )
+        except httpx.TimeoutException:
+            raise
+        except Exception as e:
+            return PlainTextResponse(f"Error: {str(e)}")
+    return render_template("place_order.html", current_year=date.today().year)
+
+
+@app.api_route("/my-orders/{order_id}/edit", methods=["GET", "POST"])
+async def edit_order(request: Request, order_id: str) -> Response:
+    """Edit an existing order."""
+    api_url = f"{AWS_REST_API_URL}/orders/{order_id}"
+    errors: dict[str, str] = {}
+    order: Any = {}
+
+    if request.method == "POST":
+        await require_user(request)
+        form = await request.form()
+        items_str = str(form.get("items", "")).strip()
+        total_str = str(form.get("total", "")).strip()
+        status = str(form.get("status", "")).strip()
+
+        items = [i.strip() for i in items_str.split(",") if i.strip()]
+        if not items:
+            errors["items"] = "Enter at least one item."
+
+        total = 0.0
+        try:
+            total = float(total_str)
+            if total < 0:
+                errors["total"] = "Total must be ≥ 0."
+        except ValueError:
+            errors["total"] = "Total must be a valid number."
+
+        if status not in ["created", "shipped", "canceled"]:
+            errors["status"] = "Select a valid status."
+
+        if not errors:
+            payload = {"items": items, "total": total, "status": status}
+            resp = await get_upstream().put(api_url, json=payload, headers=await order_service_headers(request))
+            if resp.status_code == 200:
+                return redirect(url_for("get_order_detail", order_id=order_id))
+            errors["form"] = f"Update failed (status {resp.status_code})."
+    else:
+        status_code, order = await verified_and(request, lambda: get_order_service_json(request, api_url))
+        if status_code != 200:
+            return PlainTextResponse(f"Failed to load order (status {status_code}).", status_code=status_code)
+
+    return render_template("edit_order.html", order=order, errors=errors, current_year=date.today().year)
+
+
+@app.post("/orders/{order_id}/delete")
+async def delete_order(request: Request, order_id: str) -> Response:
+    """Delete an order by ID."""
+    await require_user(request)
+    try:
+        response = await get_upstream().delete(
+            f"{AWS_REST_API_URL}/orders/{order_id}", headers=await order_service_headers(request)
+        )
+        if response.status_code == 204:
+            return redirect(url_for("my_orders"), code=303)  # 303 to prevent resubmission on refresh
+        return PlainTextResponse(
+            f"Failed to delete order. Status code: {response.status_code}", status_code=response.status_code
+        )
+    except httpx.TimeoutException:
+        raise
+    except Exception as e:
+        return PlainTextResponse(f"Error: {str(e)}")
+
+
+async def _logout_upstream(session_id: str) -> None:
+    """
+    Delete the session in auth_service - through order_service /sessions/logout, which also drops it from order_service's
+    verified session cache - or directly when that fails (order_service unreachable or erroring, API Gateway rejecting the
+    call, auth_service not reached from there).
+    """
+    try:
+        response = await get_upstream().post(
+            f"{AWS_REST_API_URL}/sessions/logout", headers={"Cookie": f"session_id={session_id}"}
+        )
+        if response.status_code == 200:
+            return
+    except httpx.TimeoutException:
+        raise
+    except httpx.HTTPError:
+        pass
+    await get_upstream().post(f"{AUTH_SERVICE_URL}/logout", json={"session_id": session_id})
+
+
+@app.api_route("/logout", methods=["GET", "POST"])
+async def logout(request: Request) -> Response:
+    """Logout the user by clearing session and redirecting through Google logout."""
+    if session_id := request.cookies.get("session_id", ""):
+        verified_sessions.pop(session_id, None)
+        await _logout_upstream(session_id)
+        request.session.clear()
+        logout_url = (
+            "https://accounts.google.com/Logout?continue=https://appengine.google.com/_ah/logout?"
+            f"continue={request.url_for('index')}"
+        )
+        resp = redirect(logout_url)
+        resp.delete_cookie("session_id", domain=request.url.hostname, path="/")
+        return resp
+    return redirect(url_for("index"))
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT_FLASK", "5001")))
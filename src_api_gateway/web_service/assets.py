@@ -0,0 +1,179 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import sys
+from typing import NamedTuple
+
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache
+
+try:
+    import brotli  # optional - without it only .gz variants are built
+except ImportError:
+    brotli = None
+
+# * static assets are fingerprinted at build time (`python assets.py build`, run in the Dockerfile):
+# *     static/style.css -> static/dist/style.<content hash>.css (+ .br / .gz), listed in static/dist/manifest.json
+# * url_for("static", filename="style.css") then points at the fingerprinted file, which never changes and is served with
+# * an immutable Cache-Control - browsers stop revalidating CSS / JS on every page, a deploy changes the URL instead
+DIST_DIR = "dist"
+MANIFEST_FILE = "manifest.json"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"  # files outside dist/ - their URL does not change with their content
+
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".mjs", ".svg", ".json", ".txt", ".html", ".map"}
+ENCODING_EXTENSIONS = {"br": ".br", "gzip": ".gz"}  # preferred first
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+
+
+class StaticFile(NamedTuple):
+    """file to send for a static asset request"""
+
+    path: str
+    mimetype: str
+    content_encoding: str | None
+    cache_control: str
+
+
+def build_static(static_dir: str = STATIC_DIR) -> dict[str, str]:
+    """
+    fingerprint every file in `static_dir` into `static_dir/dist`, with brotli / gzip variants of compressible ones
+    (kept only if smaller) - returns the manifest: original filename -> fingerprinted filename (both relative to static/)
+    """
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    shutil.rmtree(dist_dir, ignore_errors=True)
+    manifest: dict[str, str] = {}
+
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != dist_dir)
+        for name in sorted(files):
+            source = os.path.join(root, name)
+            filename = os.path.relpath(source, static_dir).replace(os.sep, "/")
+            with open(source, "rb") as f:
+                content = f.read()
+
+            stem, extension = os.path.splitext(filename)
+            fingerprinted = f"{DIST_DIR}/{stem}.{hashlib.sha256(content).hexdigest()[:12]}{extension}"
+            target = os.path.join(static_dir, fingerprinted)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as f:
+                f.write(content)
+
+            if extension.lower() in COMPRESSIBLE_EXTENSIONS:
+                variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+                if brotli is not None:
+                    variants[".br"] = brotli.compress(content, quality=11)
+                for suffix, compressed in variants.items():
+                    if len(compressed) < len(content):
+                        with open(target + suffix, "wb") as f:
+                            f.write(compressed)
+            manifest[filename] = fingerprinted
+
+    with open(os.path.join(dist_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def _accepted_encodings(accept_encoding: str) -> set[str]:
+    """
+    content codings accepted by an Accept-Encoding header (q=0 excluded)
+    """
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if coding.strip():
+            accepted.add(coding.strip())
+    return accepted
+
+
+class StaticAssets:
+    """
+    resolves static asset URLs and requests for both app.py and app_async.py
+
+    - `url_filename` maps a template's filename to its fingerprinted copy (unchanged when there is no manifest, e.g. in
+      development before `python assets.py build`)
+    - `resolve` picks the file to send: the precompressed variant the client accepts, with the Cache-Control header
+    """
+
+    def __init__(self, static_dir: str = STATIC_DIR) -> None:
+        self.__static_dir = os.path.realpath(static_dir)
+        self.__manifest: dict[str, str] = {}
+        manifest_path = os.path.join(self.__static_dir, DIST_DIR, MANIFEST_FILE)
+        if os.path.isfile(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                self.__manifest = json.load(f)
+
+    def url_filename(self, filename: str) -> str:
+        """
+        filename to put in the URL of a static asset - its fingerprinted copy once built
+        """
+        return self.__manifest.get(filename, filename)
+
+    def resolve(self, filename: str, accept_encoding: str = "") -> StaticFile | None:
+        """
+        file to send for GET /static/<filename>, None if there is none (or the path leaves the static directory)
+        """
+        path = os.path.realpath(os.path.join(self.__static_dir, filename))
+        if not path.startswith(self.__static_dir + os.sep) or not os.path.isfile(path):
+            return None
+        if filename == f"{DIST_DIR}/{MANIFEST_FILE}":
+            return None
+
+        mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        fingerprinted = filename.startswith(f"{DIST_DIR}/")
+        cache_control = IMMUTABLE_CACHE_CONTROL if fingerprinted else REVALIDATE_CACHE_CONTROL
+        if fingerprinted:
+            accepted = _accepted_encodings(accept_encoding)
+            for encoding, suffix in ENCODING_EXTENSIONS.items():
+                if encoding in accepted and os.path.isfile(path + suffix):
+                    return StaticFile(path + suffix, mimetype, encoding, cache_control)
+        return StaticFile(path, mimetype, None, cache_control)
+
+
+def create_bytecode_cache() -> BytecodeCache | None:
+    """
+    jinja bytecode cache in TEMPLATE_BYTECODE_CACHE_DIR (filled by `python assets.py build` in the image), so a new
+    worker loads compiled templates instead of parsing and compiling them - None (in-memory only) when unset
+    """
+    directory = os.getenv("TEMPLATE_BYTECODE_CACHE_DIR", "")
+    if not directory:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    return FileSystemBytecodeCache(directory)
+
+
+def warm_templates(env: Environment) -> int:
+    """
+    load every template into `env` at startup (from the bytecode cache when there is one), so the first request of a
+    new worker doesn't pay for compiling them - returns the number of templates loaded
+    """
+    names = env.list_templates(filter_func=lambda name: name.endswith(".html"))
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+if __name__ == "__main__":
+    # * python assets.py build - fingerprint and precompress static/, and compile templates/ into
+    # * TEMPLATE_BYTECODE_CACHE_DIR (when set). run at image build time, see Dockerfile
+    from jinja2 import FileSystemLoader, select_autoescape
+
+    if len(sys.argv) != 2 or sys.argv[1] != "build":
+        sys.exit("usage: python assets.py build")
+    built = build_static()
+    print(f"fingerprinted {len(built)} static files{'' if brotli else ' (brotli not installed, gzip only)'}")
+    bytecode_cache = create_bytecode_cache()
+    if bytecode_cache is not None:
+        # * compiled code depends on autoescaping - .html autoescaped, as in the Flask and the app_async environments
+        env = Environment(
+            loader=FileSystemLoader(os.path.join(BASE_DIR, "templates")),
+            autoescape=select_autoescape(),
+            bytecode_cache=bytecode_cache,
+        )
+        print(f"compiled {warm_templates(env)} templates into {os.environ['TEMPLATE_BYTECODE_CACHE_DIR']}")
@@ -4,11 +4,12 @@ import time
 from typing import Dict, Optional
 
 import boto3
+from aws_app_config.flag_providers import FlagProvider
 
 logging.basicConfig(level=logging.INFO)
 
 
-class AWSAppConfigClient:
+class AWSAppConfigClient(FlagProvider):
     """AWS AppConfig client with caching."""
 
     def __init__(self, app_id: str, env_id: str, config_profile_id: str, ttl: int = 60):
@@ -1,14 +1,18 @@
 import os
-from typing import Optional
+from typing import Mapping, Optional
 
-from aws_app_config.aws_app_config_client import AWSAppConfigClient
+from aws_app_config.flag_providers import create_flag_provider
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
-class AWSAppConfigClientSandboxAlex(AWSAppConfigClient):
-    """AWS AppConfig client for the sandbox environment."""
+class AWSAppConfigClientSandboxAlex:
+    """
+    AWS AppConfig client for the sandbox environment.
+
+    Flags come from the provider selected by `AWS_APP_CONFIG_PROVIDER` (AppConfig API, AppConfig agent or local file).
+    """
 
     __AWS_APP_CONFIG_APP_ID = os.getenv("AWS_APP_CONFIG_APP_ID", "")
     __AWS_APP_CONFIG_ENV_ID = os.getenv("AWS_APP_CONFIG_ENV_ID", "")
@@ -29,13 +33,17 @@ class AWSAppConfigClientSandboxAlex(AWSAppConfigClient):
         :param config_profile_id: AWS AppConfig Configuration Profile ID.
         :param ttl: Time-to-live for cache in seconds.
         """
-        super().__init__(
+        self.__provider = create_flag_provider(
             AWSAppConfigClientSandboxAlex.__AWS_APP_CONFIG_APP_ID,
             AWSAppConfigClientSandboxAlex.__AWS_APP_CONFIG_ENV_ID,
             AWSAppConfigClientSandboxAlex.__AWS_APP_CONFIG_CONFIG_PROFILE_ID,
             AWSAppConfigClientSandboxAlex.__AWS_APP_CONFIG_CACHE_TTL,
         )
 
+    def get_flags(self) -> Mapping[str, bool]:
+        """Returns the cached feature flags from the configured provider."""
+        return self.__provider.get_flags()
+
     def get_config_value_by_key(self, key: str) -> Optional[str]:
         """
         Retrieves a specific key's value from the configuration.
@@ -0,0 +1,149 @@
+import json
+import logging
+import os
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+logging.basicConfig(level=logging.INFO)
+
+
+def parse_flags(config_data: bytes) -> Mapping[str, bool]:
+    """
+    Turn an AppConfig feature-flag document into a read-only flags snapshot.
+
+    {'api_gateway_authorizer_ecs_auth_service': {'enabled': False}, ...}
+    -> {'api_gateway_authorizer_ecs_auth_service': False, ...}
+    """
+    config_json = json.loads(config_data)
+    return MappingProxyType({k: v["enabled"] for k, v in config_json.items()})
+
+
+class FlagProvider(ABC):
+    """Source of feature flags. `get_flags()` is called on the request path and must be cheap."""
+
+    @abstractmethod
+    def get_flags(self) -> Mapping[str, bool]:
+        """Return the current flags snapshot."""
+
+
+class LocalFlagProvider(FlagProvider):
+    """
+    Flag provider backed by a local source, re-read every `poll_interval` seconds by a daemon thread.
+
+    Subclasses implement `_load()`, returning the raw document or None when it has not changed.
+    The first `get_flags()` loads the flags and starts the thread (after any worker fork); later calls only
+    return the in-memory snapshot.
+    """
+
+    def __init__(self, poll_interval: float) -> None:
+        self.poll_interval = poll_interval
+        self.flags: Mapping[str, bool] = MappingProxyType({})
+        self.__poller: threading.Thread | None = None
+        self.__lock = threading.Lock()
+
+    @abstractmethod
+    def _load(self) -> Optional[bytes]:
+        """Read the raw flags document; None if unchanged since the last read."""
+
+    def _refresh(self) -> None:
+        """Reload and swap the snapshot if the source changed. Keeps the last good flags on errors."""
+        try:
+            config_data = self._load()
+            if config_data is not None:
+                self.flags = parse_flags(config_data)
+                logging.info("Feature flags updated: %s", dict(self.flags))
+        except Exception as e:
+            logging.warning("Feature flags refresh failed, serving last known flags: %s", e)
+
+    def _run_poller(self) -> None:
+        """Re-read the source every `poll_interval` seconds."""
+        while True:
+            time.sleep(self.poll_interval)
+            self._refresh()
+
+    def get_flags(self) -> Mapping[str, bool]:
+        """Return the current snapshot, loading it and starting the poller on first use."""
+        if self.__poller is None:
+            with self.__lock:
+                if self.__poller is None:
+                    self._refresh()
+                    self.__poller = threading.Thread(target=self._run_poller, name=type(self).__name__, daemon=True)
+                    self.__poller.start()
+        return self.flags
+
+
+class FileFlagProvider(LocalFlagProvider):
+    """Flags read from a JSON file in AppConfig feature-flag format, reloaded when its mtime or size changes."""
+
+    def __init__(self, path: str, poll_interval: float = 1.0) -> None:
+        super().__init__(poll_interval)
+        self.path = path
+        self.__signature: tuple[int, int] | None = None
+
+    def _load(self) -> Optional[bytes]:
+        """Read the file if it changed since the last read."""
+        stat = os.stat(self.path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self.__signature:
+            return None
+        with open(self.path, "rb") as f:
+            config_data = f.read()
+        self.__signature = signature
+        return config_data
+
+
+class AgentFlagProvider(LocalFlagProvider):
+    """
+    Flags served by the AWS AppConfig agent (ECS sidecar) on localhost.
+
+    The agent polls AppConfig itself and caches the configuration, so each read here is a loopback call.
+    """
+
+    def __init__(
+        self,
+        agent_url: str,
+        app_id: str,
+        env_id: str,
+        config_profile_id: str,
+        poll_interval: float = 1.0,
+        timeout: float = 1.0,
+    ) -> None:
+        super().__init__(poll_interval)
+        self.url = f"{agent_url.rstrip('/')}/applications/{app_id}/environments/{env_id}/configurations/{config_profile_id}"
+        self.timeout = timeout
+        self.__last_config: bytes | None = None
+
+    def _load(self) -> Optional[bytes]:
+        """Fetch the configuration from the agent; None if identical to the previous response."""
+        with urllib.request.urlopen(self.url, timeout=self.timeout) as response:  # nosec B310 - fixed localhost URL
+            config_data = response.read()
+        if config_data == self.__last_config:
+            return None
+        self.__last_config = config_data
+        return config_data
+
+
+def create_flag_provider(app_id: str, env_id: str, config_profile_id: str, ttl: int) -> FlagProvider:
+    """
+    Build the flag provider selected by the `AWS_APP_CONFIG_PROVIDER` environment variable.
+
+    - `appconfigdata`: poll the AppConfig data API directly (default)
+    - `agent`: read from the AppConfig agent on localhost (`AWS_APP_CONFIG_AGENT_URL`)
+    - `file`: read a local JSON file (`AWS_APP_CONFIG_FLAGS_FILE`) - offline development and tests
+    """
+    provider = os.getenv("AWS_APP_CONFIG_PROVIDER", "appconfigdata").lower()
+    poll_interval = float(os.getenv("AWS_APP_CONFIG_LOCAL_POLL_INTERVAL", "1.0"))
+    if provider == "file":
+        return FileFlagProvider(os.getenv("AWS_APP_CONFIG_FLAGS_FILE", "feature_flags.json"), poll_interval)
+    if provider == "agent":
+        agent_url = os.getenv("AWS_APP_CONFIG_AGENT_URL", "http://localhost:2772")
+        return AgentFlagProvider(agent_url, app_id, env_id, config_profile_id, poll_interval)
+    if provider == "appconfigdata":
+        from aws_app_config.aws_app_config_client import AWSAppConfigClient
+
+        return AWSAppConfigClient(app_id, env_id, config_profile_id, ttl)
+    raise ValueError(f"Unknown AWS_APP_CONFIG_PROVIDER: {provider!r}")
@@ -0,0 +1,123 @@
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+# * page benchmark for web_service - compare the Flask (app.py) and the ASGI (app_async.py) frontends at a fixed
+# * upstream latency. start a fake auth_service + order_service that answers after --latency-ms:
+# *     python load_test.py upstream --port 5090 --latency-ms 50
+# * point both frontends at it (AUTH_SERVICE_URL_REST_API / ORDER_SERVICE_URL_REST_API=http://localhost:5090) and run:
+# *     gunicorn app:app -b :5001 -w 4 --threads 8        uvicorn app_async:app --port 5002 --workers 4
+# *     python load_test.py run --url http://localhost:5001 --url http://localhost:5002 --concurrency 100 --duration 20
+# * every page verifies the session and reads the orders - sequential in app.py, concurrent in app_async.py.
+# * not part of the service image - needs `pip install httpx fastapi uvicorn`
+
+
+def create_upstream_app(latency: float):  # type: ignore[no-untyped-def]
+    """
+    fake auth_service (/verify) and order_service (/orders) answering every call after `latency` seconds
+    """
+    from fastapi import FastAPI
+
+    upstream = FastAPI()
+    orders = [
+        {"order_id": f"order-{i:03}", "items": ["apple", "pear"], "total": 1.5 * i, "status": "created", "timestamp": i}
+        for i in range(20)
+    ]
+
+    @upstream.post("/verify")
+    async def verify() -> Dict:
+        await asyncio.sleep(latency)
+        return {"message": "valid session", "user": {"email": "load@test", "name": "load test"}}
+
+    @upstream.get("/orders")
+    async def list_orders() -> Dict:
+        await asyncio.sleep(latency)
+        return {"orders": orders, "next_cursor": None}
+
+    return upstream
+
+
+async def worker(client: httpx.AsyncClient, url: str, deadline: float, latencies: List[float], errors: List[int]) -> None:
+    """
+    load /my-orders back to back until `deadline`
+    """
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.get(f"{url}/my-orders")
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError:
+            errors.append(0)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(url: str, concurrency: int, duration: float) -> Dict[str, float]:
+    """
+    run `concurrency` clients against `url` for `duration` seconds and summarize pages/s and latency
+    """
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    # * a fresh session ID per run, so neither frontend serves it from its verified sessions cache
+    cookies = {"session_id": f"load-test-{time.time_ns()}"}
+    async with httpx.AsyncClient(limits=limits, timeout=30, cookies=cookies) as client:
+        await client.get(f"{url}/my-orders")  # warm up connections
+
+        latencies: List[float] = []
+        errors: List[int] = []
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(worker(client, url, deadline, latencies, errors) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2) if latencies else 0.0
+
+    return {
+        "pages_per_second": round(len(latencies) / elapsed, 1),
+        "pages": len(latencies),
+        "errors": len(errors),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="benchmark web_service pages at a fixed upstream latency")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    upstream = commands.add_parser("upstream", help="serve a fake auth_service + order_service")
+    upstream.add_argument("--port", type=int, default=5090)
+    upstream.add_argument("--latency-ms", type=float, default=50)
+
+    load = commands.add_parser("run", help="load /my-orders on one or more frontends")
+    load.add_argument("--url", action="append", required=True, help="web_service base URL, repeat to compare")
+    load.add_argument("--concurrency", type=int, default=50)
+    load.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    if args.command == "upstream":
+        import uvicorn
+
+        uvicorn.run(create_upstream_app(args.latency_ms / 1000), host="0.0.0.0", port=args.port, log_level="warning")
+        return
+
+    print(f"{'url':<32} {'pages/s':>10} {'pages':>10} {'errors':>8} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for url in args.url:
+        result = asyncio.run(run(url.rstrip("/"), args.concurrency, args.duration))
+        print(
+            f"{url:<32} {result['pages_per_second']:>10} {result['pages']:>10} {result['errors']:>8} "
+            f"{result['mean_ms']:>9} {result['p50_ms']:>9} {result['p99_ms']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
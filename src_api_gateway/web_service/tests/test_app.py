@@ -1,5 +1,8 @@
 import importlib
+import json
 import os
+import time
+from pathlib import Path
 from typing import Generator
 
 import pytest
@@ -17,6 +20,7 @@ def setup_env(monkeypatch: MonkeyPatch) -> None:
     """
     env_vars = {
         "AUTH_SERVICE_URL_REST_API": "http://auth:8000",
+        "ORDER_SERVICE_URL_REST_API": "http://orders:5003",
     }
     for key, val in env_vars.items():
         monkeypatch.setenv(key, val)
@@ -150,6 +154,7 @@ def test_logout_clears_cookie_and_redirects(
     method: str,
 ) -> None:
     """GET or POST /logout should hit auth logout, clear cookie, and redirect."""
+    requests_mock.post(f"{os.environ['ORDER_SERVICE_URL_REST_API']}/sessions/logout", status_code=404)
     requests_mock.post(f"{os.environ['AUTH_SERVICE_URL_REST_API']}/logout", status_code=200)
     client.set_cookie("session_id", "dummy")
     res = getattr(client, method)("/logout")
@@ -159,3 +164,290 @@ def test_logout_clears_cookie_and_redirects(
     assert "session_id=;" in sc
     # ends up on index
     assert res.headers["Location"].endswith("/") or res.status_code == 200
+
+
+@pytest.mark.parametrize("order_service_status, auth_logout_calls", [(200, 0), (503, 1)])
+def test_logout_goes_through_order_service_session_logout(
+    client: FlaskClient,
+    requests_mock: requests_mock.Mocker,
+    order_service_status: int,
+    auth_logout_calls: int,
+) -> None:
+    """/logout asks order_service to drop its cached session (and log out upstream), auth_service directly if that fails."""
+    sessions_mock = requests_mock.post(
+        f"{os.environ['ORDER_SERVICE_URL_REST_API']}/sessions/logout", status_code=order_service_status
+    )
+    auth_mock = requests_mock.post(f"{os.environ['AUTH_SERVICE_URL_REST_API']}/logout", status_code=200)
+    client.set_cookie("session_id", "dummy")
+
+    res = client.get("/logout")
+    assert res.status_code == 302
+    assert sessions_mock.call_count == 1
+    assert sessions_mock.last_request.headers["Cookie"] == "session_id=dummy"  # type: ignore
+    assert auth_mock.call_count == auth_logout_calls
+
+
+def test_my_orders_renders_page_and_next_link(
+    client: FlaskClient,
+    requests_mock: requests_mock.Mocker,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """GET /my-orders forwards the cursor to order service and links to the next page."""
+    import app as web_app_module  # type: ignore
+
+    monkeypatch.setattr(
+        web_app_module.aws_app_config_client, "get_config_api_gateway_authorizer_ecs_auth_service", lambda: True
+    )
+    requests_mock.post(f"{os.environ['AUTH_SERVICE_URL_REST_API']}/verify", json={"user": {"email": "u@x"}}, status_code=200)
+    orders_mock = requests_mock.get(
+        f"{os.environ['ORDER_SERVICE_URL_REST_API']}/orders",
+        json={"orders": [{"order_id": "order-001", "items": ["apple"], "total": 1.5}], "next_cursor": "abc"},
+        status_code=200,
+    )
+    client.set_cookie("session_id", "dummy")
+
+    res = client.get("/my-orders?cursor=prev")
+    assert res.status_code == 200
+    assert orders_mock.last_request.qs == {"cursor": ["prev"]}  # type: ignore
+    body = res.get_data(as_text=True)
+    assert "order-001" in body
+    assert "cursor=abc" in body
+
+
+def test_file_flag_provider_serves_snapshot_and_reloads_on_change(tmp_path: Path) -> None:
+    """The file-backed flag provider loads flags on first use and picks up file changes in the background."""
+    from aws_app_config.flag_providers import FileFlagProvider  # type: ignore
+
+    flags_file = tmp_path / "feature_flags.json"
+    flags_file.write_text(json.dumps({"api_gateway_authorizer_ecs_auth_service": {"enabled": True}}))
+    provider = FileFlagProvider(str(flags_file), poll_interval=0.01)
+    assert provider.get_flags() == {"api_gateway_authorizer_ecs_auth_service": True}
+
+    flags_file.write_text(
+        json.dumps({"api_gateway_authorizer_ecs_auth_service": {"enabled": False}, "other": {"enabled": True}})
+    )
+    deadline = time.monotonic() + 2
+    while provider.get_flags().get("other") is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert provider.get_flags() == {"api_gateway_authorizer_ecs_auth_service": False, "other": True}
+
+
+@pytest.mark.parametrize(
+    "mode, expected_header, expected_value",
+    [("TOKEN", "Authorization", "Bearer dummy"), ("REQUEST", "Cookie", "session_id=dummy")],
+)
+def test_lambda_authorizer_mode_controls_forwarded_session_header(
+    client: FlaskClient,
+    requests_mock: requests_mock.Mocker,
+    monkeypatch: MonkeyPatch,
+    mode: str,
+    expected_header: str,
+    expected_value: str,
+) -> None:
+    """With the lambda authorizer enabled, the session goes out as a bearer token (TOKEN) or as the cookie (REQUEST)."""
+    import app as web_app_module  # type: ignore
+
+    monkeypatch.setattr(web_app_module, "LAMBDA_AUTHORIZER_MODE", mode)
+    monkeypatch.setattr(
+        web_app_module.aws_app_config_client, "get_config_api_gateway_authorizer_ecs_auth_service", lambda: False
+    )
+    monkeypatch.setattr(
+        web_app_module.aws_app_config_client, "get_config_api_gateway_authorizer_lambda_authorizer", lambda: True
+    )
+    requests_mock.post(f"{os.environ['AUTH_SERVICE_URL_REST_API']}/verify", json={"user": {"email": "u@x"}}, status_code=200)
+    orders_mock = requests_mock.get(
+        f"{os.environ['ORDER_SERVICE_URL_REST_API']}/orders", json={"orders": [], "next_cursor": None}, status_code=200
+    )
+    client.set_cookie("session_id", "dummy")
+
+    res = client.get("/my-orders")
+    assert res.status_code == 200
+    assert orders_mock.last_request.headers[expected_header] == expected_value  # type: ignore
+
+
+def test_signed_session_token_is_verified_without_auth_service(
+    client: FlaskClient,
+    requests_mock: requests_mock.Mocker,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """A signed session token is checked locally; a tampered one is rejected, neither calls auth_service /verify."""
+    import app as web_app_module  # type: ignore
+    import session_tokens  # type: ignore
+
+    class EmptyRevocationStore:
+        """Redis stand-in with no revoked tokens."""
+
+        def mget(self, keys: list[str]) -> list[None]:
+            return [None] * len(keys)
+
+        def exists(self, key: str) -> int:
+            return 0
+
+    codec = session_tokens.SessionTokenCodec(["test-secret"])
+    monkeypatch.setattr(web_app_module, "token_codec", codec)
+    monkeypatch.setattr(web_app_module, "revocation_store", EmptyRevocationStore())
+    verify_mock = requests_mock.post(f"{os.environ['AUTH_SERVICE_URL_REST_API']}/verify", status_code=200)
+    token = codec.issue("u@x", "U", "manual")
+
+    client.set_cookie("session_id", token)
+    assert client.get("/dashboard").status_code == 200
+
+    client.set_cookie("session_id", token[:-4] + "AAAA")
+    res = client.get("/dashboard")
+    assert res.status_code == 302
+    assert "/login" in res.headers["Location"]
+    assert not verify_mock.called
+
+
+@pytest.mark.parametrize("cookie", ["v1.abc.\u00e9", "v1.\u00e9.x", "v1.", "v1.abc"])
+def test_malformed_signed_session_token_redirects_to_login(
+    client: FlaskClient,
+    requests_mock: requests_mock.Mocker,
+    monkeypatch: MonkeyPatch,
+    cookie: str,
+) -> None:
+    """A malformed or non-ASCII token is rejected like a bad signature (302 to /login), not a 500."""
+    import app as web_app_module  # type: ignore
+    import session_tokens  # type: ignore
+
+    monkeypatch.setattr(web_app_module, "token_codec", session_tokens.SessionTokenCodec(["test-secret"]))
+    monkeypatch.setattr(web_app_module, "revocation_store", object())  # never read for a token failing verification
+
+    client.set_cookie("session_id", cookie)
+    res = client.get("/dashboard")
+    assert res.status_code == 302
+    assert "/login" in res.headers["Location"]
+
+
+def test_upstream_session_is_pooled_and_does_not_keep_cookies(
+    client: FlaskClient,
+    requests_mock: requests_mock.Mocker,
+) -> None:
+    """Upstream calls share one pooled session that never stores a user's Set-Cookie; POSTs are not retried."""
+    import app as web_app_module  # type: ignore
+
+    verify_mock = requests_mock.post(
+        f"{os.environ['AUTH_SERVICE_URL_REST_API']}/verify",
+        json={"user": {"email": "u@x"}},
+        status_code=200,
+    )
+    client.set_cookie("session_id", "dummy")
+    assert client.get("/dashboard").status_code == 200
+    client.set_cookie("session_id", "other")
+    assert client.get("/settings").status_code == 200
+
+    assert verify_mock.call_count == 2
+    assert web_app_module.upstream.cookies.get_policy().allowed_domains() == ()  # None would allow every domain
+    adapter = web_app_module.upstream.get_adapter(os.environ["ORDER_SERVICE_URL_REST_API"])
+    assert "POST" not in adapter.max_retries.allowed_methods
+    assert "GET" in adapter.max_retries.allowed_methods
+
+
+def test_session_is_verified_once_per_request_and_cached(
+    client: FlaskClient,
+    requests_mock: requests_mock.Mocker,
+) -> None:
+    """GET / verifies the cookie once for both the decorator and the view; later pages use the verified sessions cache."""
+    verify_mock = requests_mock.post(
+        f"{os.environ['AUTH_SERVICE_URL_REST_API']}/verify",
+        json={"user": {"email": "u@x", "name": "TestUser"}},
+        status_code=200,
+    )
+    client.set_cookie("session_id", "dummy")
+
+    assert client.get("/").status_code == 302  # valid session -> dashboard
+    assert verify_mock.call_count == 1
+    assert client.get("/dashboard").status_code == 200
+    assert client.get("/settings").status_code == 200
+    assert verify_mock.call_count == 1
+
+    requests_mock.post(f"{os.environ['ORDER_SERVICE_URL_REST_API']}/sessions/logout", status_code=200)
+    client.get("/logout")
+    client.set_cookie("session_id", "dummy")
+    client.get("/dashboard")
+    assert verify_mock.call_count == 2  # logout dropped the cached session
+
+
+def test_verified_user_is_forwarded_to_order_service_as_signed_header(
+    client: FlaskClient,
+    requests_mock: requests_mock.Mocker,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """With INTERNAL_AUTH_SECRETS set, order requests carry an X-Internal-Auth header order_service can verify."""
+    import app as web_app_module  # type: ignore
+    import session_tokens  # type: ignore
+
+    monkeypatch.setattr(web_app_module, "INTERNAL_AUTH_SECRETS", ["internal-secret"])
+    monkeypatch.setattr(
+        web_app_module.aws_app_config_client, "get_config_api_gateway_authorizer_ecs_auth_service", lambda: True
+    )
+    requests_mock.post(f"{os.environ['AUTH_SERVICE_URL_REST_API']}/verify", json={"user": {"email": "u@x"}}, status_code=200)
+    orders_mock = requests_mock.get(
+        f"{os.environ['ORDER_SERVICE_URL_REST_API']}/orders", json={"orders": [], "next_cursor": None}, status_code=200
+    )
+
+    client.set_cookie("session_id", "dummy")
+    assert client.get("/my-orders").status_code == 200
+
+    header = orders_mock.last_request.headers[session_tokens.INTERNAL_AUTH_HEADER]  # type: ignore
+    assert session_tokens.verify_internal_identity(["internal-secret"], header) == "u@x"
+    assert session_tokens.verify_internal_identity(["other-secret"], header) is None
+
+
+def test_order_list_is_revalidated_with_etag(
+    client: FlaskClient,
+    requests_mock: requests_mock.Mocker,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """A tagged order list is cached per session and revalidated with If-None-Match; a 304 re-renders the cached body."""
+    import app as web_app_module  # type: ignore
+
+    monkeypatch.setattr(
+        web_app_module.aws_app_config_client, "get_config_api_gateway_authorizer_ecs_auth_service", lambda: True
+    )
+    requests_mock.post(f"{os.environ['AUTH_SERVICE_URL_REST_API']}/verify", json={"user": {"email": "u@x"}}, status_code=200)
+    orders_url = f"{os.environ['ORDER_SERVICE_URL_REST_API']}/orders"
+    requests_mock.get(
+        orders_url,
+        json={"orders": [{"order_id": "order-etag", "items": ["apple"], "total": 1.5}], "next_cursor": None},
+        headers={"ETag": '"v1"'},
+        status_code=200,
+    )
+    client.set_cookie("session_id", "etag-session")
+
+    assert "order-etag" in client.get("/my-orders").get_data(as_text=True)
+    assert "If-None-Match" not in requests_mock.last_request.headers  # type: ignore
+
+    orders_mock = requests_mock.get(orders_url, status_code=304)
+    res = client.get("/my-orders")
+    assert res.status_code == 200
+    assert "order-etag" in res.get_data(as_text=True)
+    assert orders_mock.last_request.headers["If-None-Match"] == '"v1"'  # type: ignore
+
+
+def test_static_assets_are_fingerprinted_precompressed_and_immutable(
+    client: FlaskClient,
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """Built assets are linked by content hash, served gzip-encoded when accepted and cached as immutable."""
+    import app as web_app_module  # type: ignore
+    import assets  # type: ignore
+
+    (tmp_path / "style.css").write_text("body { color: black; }\n" * 50)
+    manifest = assets.build_static(str(tmp_path))
+    monkeypatch.setattr(web_app_module, "static_assets", assets.StaticAssets(str(tmp_path)))
+
+    body = client.get("/").get_data(as_text=True)
+    assert f'href="/static/{manifest["style.css"]}"' in body
+
+    res = client.get(f"/static/{manifest['style.css']}", headers={"Accept-Encoding": "gzip, br;q=0"})
+    assert res.status_code == 200
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert res.headers["Cache-Control"] == assets.IMMUTABLE_CACHE_CONTROL
+    assert res.mimetype == "text/css"
+
+    res = client.get("/static/style.css")
+    assert "Content-Encoding" not in res.headers
+    assert res.headers["Cache-Control"] == "no-cache"
+    assert client.get("/static/../app.py").status_code == 404
@@ -0,0 +1,78 @@
+import importlib
+import json
+from typing import Generator
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from pytest import MonkeyPatch
+
+
+@pytest.fixture
+def upstream_calls() -> list[httpx.Request]:
+    """Upstream requests seen by the mocked auth_service / order_service, in order."""
+    return []
+
+
+@pytest.fixture
+def async_client(monkeypatch: MonkeyPatch, upstream_calls: list[httpx.Request]) -> Generator[TestClient, None, None]:
+    """
+    TestClient for app_async with auth_service and order_service mocked by an httpx.MockTransport.
+    `session_id=good` is a valid session, any other is rejected.
+    """
+    import upstream_session  # type: ignore
+
+    def handler(req: httpx.Request) -> httpx.Response:
+        upstream_calls.append(req)
+        if req.url.path == "/verify":
+            valid = json.loads(req.content)["session_id"] == "good"
+            return httpx.Response(200 if valid else 401, json={"user": {"email": "u@x"}})
+        if req.url.path == "/orders":
+            if req.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            orders = [{"order_id": "order-async", "items": ["apple"], "total": 1.5}]
+            return httpx.Response(200, json={"orders": orders, "next_cursor": "abc"}, headers={"ETag": '"v1"'})
+        return httpx.Response(404)
+
+    monkeypatch.setenv("SECRET_KEY", "test")
+    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "test")
+    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_SECRET", "test")
+    monkeypatch.setattr(
+        upstream_session, "create_async_upstream_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    import app_async  # type: ignore
+
+    importlib.reload(app_async)
+    monkeypatch.setattr(app_async.aws_app_config_client, "get_config_api_gateway_authorizer_ecs_auth_service", lambda: True)
+    with TestClient(app_async.app) as client:
+        yield client
+
+
+def test_async_my_orders_renders_page_and_revalidates(async_client: TestClient, upstream_calls: list[httpx.Request]) -> None:
+    """GET /my-orders renders the shared template, forwards the cursor and revalidates the cached page by ETag."""
+    async_client.cookies.set("session_id", "good")
+
+    res = async_client.get("/my-orders?cursor=prev")
+    assert res.status_code == 200
+    assert "order-async" in res.text
+    assert "cursor=abc" in res.text
+    orders_calls = [req for req in upstream_calls if req.url.path == "/orders"]
+    assert orders_calls[0].url.params["cursor"] == "prev"
+    assert orders_calls[0].headers["Cookie"] == "session_id=good"
+
+    res = async_client.get("/my-orders?cursor=prev")
+    assert "order-async" in res.text
+    assert upstream_calls[-1].headers["If-None-Match"] == '"v1"'
+
+
+def test_async_order_read_does_not_wait_for_verify(async_client: TestClient, upstream_calls: list[httpx.Request]) -> None:
+    """The order read is issued together with /verify; an invalid session still redirects to /login (302, as app.py)."""
+    async_client.cookies.set("session_id", "bad")
+
+    res = async_client.get("/my-orders", follow_redirects=False)
+    assert res.status_code == 302
+    assert res.headers["Location"] == "/login"
+    assert sorted(req.url.path for req in upstream_calls) == ["/orders", "/verify"]
+
+    res = async_client.get("/dashboard", follow_redirects=False)
+    assert res.status_code == 302
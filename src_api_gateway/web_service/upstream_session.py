@@ -0,0 +1,67 @@
+import os
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# * (connect, read) timeout for every auth_service / order service call
+UPSTREAM_TIMEOUT = (
+    float(os.getenv("UPSTREAM_CONNECT_TIMEOUT_SECONDS", "1")),
+    float(os.getenv("UPSTREAM_READ_TIMEOUT_SECONDS", "3")),
+)
+
+
+def create_upstream_session() -> requests.Session:
+    """
+    Shared, thread-safe HTTP session for the auth and order upstreams.
+
+    - keep-alive connections are pooled per host (UPSTREAM_POOL_MAXSIZE, sized for the number of request threads),
+      so a page calling /verify and /orders reuses open TCP / TLS connections instead of opening one per call
+    - failed connects are retried for every method (nothing was sent); read errors and 502/503/504 only for
+      idempotent methods, so an order is never POSTed twice. backoff: UPSTREAM_RETRY_BACKOFF_SECONDS * 2^(retry - 1)
+    - cookies are never stored on the session - it is shared by all users, each call passes its own session cookie
+    """
+    retry = Retry(
+        total=int(os.getenv("UPSTREAM_RETRIES", "2")),
+        connect=int(os.getenv("UPSTREAM_RETRIES", "2")),
+        read=int(os.getenv("UPSTREAM_READ_RETRIES", "1")),
+        status=int(os.getenv("UPSTREAM_READ_RETRIES", "1")),
+        status_forcelist=(502, 503, 504),
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,  # idempotent methods - excludes POST / PATCH
+        backoff_factor=float(os.getenv("UPSTREAM_RETRY_BACKOFF_SECONDS", "0.1")),
+        raise_on_status=False,  # hand the last 5xx response to the caller, as without retries
+    )
+    adapter = HTTPAdapter(
+        pool_connections=int(os.getenv("UPSTREAM_POOL_CONNECTIONS", "4")),  # distinct upstream hosts kept pooled
+        pool_maxsize=int(os.getenv("UPSTREAM_POOL_MAXSIZE", "20")),  # kept-alive connections per host
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))  # don't keep upstream Set-Cookie across users
+    return session
+
+
+def create_async_upstream_client() -> httpx.AsyncClient:
+    """
+    Async counterpart of create_upstream_session() for app_async.py - one pooled client per worker process.
+
+    - same timeouts; httpx pools across hosts, so the pool holds UPSTREAM_POOL_CONNECTIONS * UPSTREAM_POOL_MAXSIZE
+      connections (kept alive) - further calls wait up to the connect timeout for a free one
+    - failed connects are retried (UPSTREAM_RETRIES); httpx does not retry reads or 5xx responses
+    - cookies are never stored on the client, as above
+    """
+    pool_size = int(os.getenv("UPSTREAM_POOL_CONNECTIONS", "4")) * int(os.getenv("UPSTREAM_POOL_MAXSIZE", "20"))
+    transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        retries=int(os.getenv("UPSTREAM_RETRIES", "2")),
+    )
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(UPSTREAM_TIMEOUT[1], connect=UPSTREAM_TIMEOUT[0], pool=UPSTREAM_TIMEOUT[0]),
+        cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+    )